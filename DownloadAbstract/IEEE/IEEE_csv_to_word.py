@@ -1,37 +1,101 @@
+import os
+import sys
 import csv
+import argparse
+import itertools
 from docx import Document
 from docx.shared import Pt
+from docx.enum.style import WD_STYLE_TYPE
 from docx.enum.text import WD_PARAGRAPH_ALIGNMENT
 
-def process_csv(input_csv, output_docx):
-    entries = {}
-    duplicates = []
+# 将仓库根目录加入搜索路径，以便导入公共模块 miner
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+from miner.dedup import Deduplicator, UNIQUE, EXACT
+from miner.docx_stream import StreamingDocx
+from miner.store import DEFAULT_STORE, PaperStore
+from miner.seeds import parse_years
+from miner import metrics
+from miner.metrics import METRICS
+
+HEADING = 'IEEE上关于dysarthria论文题目与摘要汇总'
 
+def _read_csv(input_csv):
     with open(input_csv, 'r', encoding='utf-8') as f:
         reader = csv.DictReader(f)
         for row in reader:
-            key = (row['Title'].strip(), row['Abstract'].strip())
-            if key in entries:
-                duplicates.append(key[0])
-                continue
-            entries[key] = row
+            yield row['Title'].strip(), row['Abstract'].strip()
 
-    doc = Document()
+def _read_store(rows):
+    for row in rows:
+        yield (row['title'] or '').strip(), (row['abstract'] or '').strip()
+
+def _iter_unique(entries, duplicates):
+    """逐条产出不重复的 (题目, 摘要)，重复条目以 (状态, 题目, 与之重复的收录序号) 记录到 duplicates
+
+    重复判断使用规范化后的指纹与MinHash签名，不保存已收录条目的文本；收录序号从1开始，即文档中的第几篇。
+    """
+    dedup = Deduplicator()
+
+    for title, abstract in entries:
+        status, match = dedup.check(title, abstract)
+        if status != UNIQUE:
+            duplicates.append((status, title, match + 1))
+            continue
+        METRICS.incr('docx_entries')
+        yield title, abstract
+
+def _setup_normal(doc):
     style = doc.styles['Normal']
     font = style.font
     font.name = 'Times New Roman'
     font.size = Pt(12)
+    return style
+
+def _setup_styles(doc):
+    """流式输出使用的样式：原来的空段落间距改为样式的段前段后间距"""
+    normal = _setup_normal(doc)
+
+    heading = doc.styles.add_style('Summary Heading', WD_STYLE_TYPE.PARAGRAPH)
+    heading.base_style = normal
+    heading.font.bold = True
+    heading.font.size = Pt(14)
+    heading.paragraph_format.alignment = WD_PARAGRAPH_ALIGNMENT.CENTER
+    heading.paragraph_format.space_after = Pt(14)  # 相当于一个空行
+
+    title = doc.styles.add_style('Paper Title', WD_STYLE_TYPE.PARAGRAPH)
+    title.base_style = normal
+    title.font.bold = True
+    title.paragraph_format.space_after = Pt(14)  # 题目与摘要间一个空行
+
+    abstract = doc.styles.add_style('Paper Abstract', WD_STYLE_TYPE.PARAGRAPH)
+    abstract.base_style = normal
+    abstract.paragraph_format.line_spacing = 1.5
+    abstract.paragraph_format.space_after = Pt(28)  # 条目间两个空行
+
+def _write_stream(entries, output_docx):
+    """流式写入 document.xml，条目边读边写"""
+    with StreamingDocx(output_docx, _setup_styles) as doc:
+        doc.paragraph(HEADING, style='Summary Heading')
+        for title, abstract in entries:
+            doc.paragraph(title, style='Paper Title')
+            doc.paragraph(abstract, style='Paper Abstract')
+
+def _write_docx(entries, output_docx):
+    """python-docx 逐段生成（原实现），用空段落控制间距"""
+    entries = list(entries)
+    doc = Document()
+    _setup_normal(doc)
 
     # 主标题
     para = doc.add_paragraph()
     para.alignment = WD_PARAGRAPH_ALIGNMENT.CENTER
-    run = para.add_run('IEEE上关于dysarthria论文题目与摘要汇总')
+    run = para.add_run(HEADING)
     run.bold = True
     run.font.size = Pt(14)
     doc.add_paragraph()
 
     # 条目格式控制
-    for i, ((title, abstract), _) in enumerate(entries.items()):
+    for i, (title, abstract) in enumerate(entries):
         # 添加题目
         title_para = doc.add_paragraph()
         run = title_para.add_run(title)
@@ -51,14 +115,78 @@ def process_csv(input_csv, output_docx):
             doc.add_paragraph()  # 第二个换行 
             #doc.add_paragraph()  # 第三个换行
 
-    doc.save(output_docx)
+    with METRICS.span('docx.save'):
+        doc.save(output_docx)
+
+BACKENDS = {'stream': _write_stream, 'docx': _write_docx}
+
+def process_csv(input_csv, output_docx, backend='stream'):
+    _export(_read_csv(input_csv), output_docx, backend)
+
+def process_store(output_docx, backend='stream', store=None, source='ieee', years=None, venue=None,
+                  changed_only=False, order='title'):
+    """从元数据库按条件查询并导出，耗时随选中的记录数增长而不是整个库
+
+    changed_only=True 时只导出上次导出到同名文件之后新增或变化的记录，没有变化时不生成文件。
+    """
+    own = store is None
+    store = store or PaperStore()
+    export = f"docx:{os.path.basename(output_docx)}"
+    try:
+        seq = store.max_seq()
+        rows = store.select(source, years, venue, store.last_export(export) if changed_only else None, order)
+        first = next(rows, None)
+        if first is None:
+            print('没有符合条件的记录' + ('（上次导出后无变化）' if changed_only else ''))
+            return
+        _export(_read_store(itertools.chain([first], rows)), output_docx, backend)
+        store.mark_exported(export, seq)
+    finally:
+        if own:
+            store.close()
+
+def _export(entries, output_docx, backend):
+    duplicates = []
+    entries = _iter_unique(entries, duplicates)
+    with METRICS.span('docx.export', backend=backend):
+        BACKENDS[backend](entries, output_docx)
+    METRICS.incr('dedup_exact', sum(1 for status, _, _ in duplicates if status == EXACT))
+    METRICS.incr('dedup_near', sum(1 for status, _, _ in duplicates if status != EXACT))
 
     if duplicates:
         print(f'发现 {len(duplicates)} 条重复条目:')
-        for dup in duplicates:
-            print(f'- {dup}')
+        for status, title, original in duplicates:
+            kind = '完全重复' if status == EXACT else '近似重复'
+            print(f'- [{kind}] {title}（与文档中第 {original} 篇）')
     else:
         print('未发现重复条目')
 
 # 使用示例
-process_csv('IEEE_paper_metadata.csv', 'Papers_Summary.docx')
\ No newline at end of file
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="把 IEEE_paper_metadata.csv 汇总为题目与摘要的 Word 文档")
+    parser.add_argument('--backend', choices=sorted(BACKENDS), default='stream',
+                        help="stream: 流式写入（默认）；docx: python-docx 逐段生成")
+    parser.add_argument('--from-store', nargs='?', const=DEFAULT_STORE, default=None, metavar='DB',
+                        help="从元数据库（默认 papers.db）查询导出，不读CSV")
+    parser.add_argument('--years', type=parse_years, default=None, help="只导出这些年份，如 2019-2024")
+    parser.add_argument('--venue', default=None, help="只导出会议/期刊名包含该文字的记录")
+    parser.add_argument('--changed-only', action='store_true',
+                        help="只导出上次导出到 --output 之后新增或变化的记录，必须同时指定 --output")
+    parser.add_argument('--output', default=None, help="输出的Word文件，默认 Papers_Summary.docx")
+    metrics.add_arguments(parser)
+    args = parser.parse_args()
+    if args.changed_only and not args.output:
+        # 只含变化记录的文档不能覆盖完整的 Papers_Summary.docx
+        parser.error("--changed-only 需要用 --output 指定单独的文件，以免覆盖完整的题目摘要汇总 Papers_Summary.docx")
+    output = args.output or 'Papers_Summary.docx'
+    metrics.start(args)
+    if args.from_store:
+        store = PaperStore(args.from_store)
+        try:
+            process_store(output, args.backend, store, years=args.years, venue=args.venue,
+                          changed_only=args.changed_only)
+        finally:
+            store.close()
+    else:
+        process_csv('IEEE_paper_metadata.csv', output, args.backend)
+    metrics.finish(args)
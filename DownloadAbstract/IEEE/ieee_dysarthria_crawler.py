@@ -1,122 +1,338 @@
+import os
+import sys
 import csv
-import time
 import re
+import time
+import argparse
+import requests
+from requests.adapters import HTTPAdapter
 from selenium import webdriver
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.chrome.service import Service
-from webdriver_manager.chrome import ChromeDriverManager
+
+# 将仓库根目录加入搜索路径，以便导入公共模块 miner
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+from miner.manifest import Manifest, sha256_text
+from miner.store import PaperStore
+from miner import ieee, citations
+from miner.driverpool import DriverPool, chromedriver_path
+from miner.waits import WAIT_STATS, wait_until, wait_for_dom_stable
+from miner.sinks import CSVSink, keep_latest, read_column
+from miner.fetch import Fetcher, FetchError, PARSE
+from miner.seeds import parse_pages
+from miner import metrics
+from miner.metrics import METRICS
+
+METADATA_CSV = 'IEEE_paper_metadata.csv'
+PAPER_IDS_CSV = 'paper_ids.csv'
+MANIFEST_TASK = 'ieee_metadata'  # 下载清单中的任务名
+HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+}
+REQUEST_TIMEOUT = 30
+HOST_RATE = 1.0  # 每个主机每秒允许的请求数
+HOST_BURST = 2  # 每个主机允许的突发请求数
+
+def _arnumber(links):
+    m = re.search(r'arnumber=(\d+)', links or '')
+    return m.group(1) if m else None
 
 class IEEECrawler:
-    def __init__(self):
-        self.driver = self._init_browser()
-        self.wait = WebDriverWait(self.driver, 20)
+    def __init__(self, manifest=None, mode='http', base_url=ieee.BASE_URL, workers=1, recycle_after=50, headless=False,
+                 queue_size=None, query=ieee.SEARCH_QUERY, pages=range(1, 6), store=None, rate=HOST_RATE,
+                 burst=HOST_BURST):
+        """mode='http' 直接解析页面内嵌的元数据JSON，失败时回退到浏览器；mode='browser' 只用浏览器
+
+        query 为搜索关键词，pages 为要抓取的搜索结果页码；
+        workers 个浏览器并行抓取，每个浏览器处理 recycle_after 个页面后重建；
+        queue_size 为待解析ID队列的容量，解析跟不上时搜索翻页会暂停；
+        解析结果同时写入元数据库 store（默认为仓库根目录的 papers.db）；
+        每个主机每秒最多 rate 个请求（突发 burst 个），不只依赖429反馈降速。
+        """
+        self.mode = mode
+        self.base_url = base_url
+        self.query = query
+        self.pages = pages
+        self.headless = headless
+        self.pool = DriverPool(self._init_browser, workers, recycle_after, queue_size=queue_size)
+        self._driver = None
+        self.manifest = manifest or Manifest()
+        self.store = store or PaperStore()
+        # 只关闭自己创建的清单与元数据库，调用方传入的由调用方关闭
+        self._owned = [obj for obj, given in ((self.manifest, manifest), (self.store, store)) if given is None]
+        # HTTP请求与浏览器操作共用重试、熔断和自适应并发策略
+        self.fetcher = Fetcher(self._init_session(), timeout=REQUEST_TIMEOUT, rate=rate, burst=burst,
+                               concurrency=workers, max_concurrency=max(16, workers))
+
+    @property
+    def driver(self):
+        """浏览器按需启动，纯HTTP模式下不会创建"""
+        if self._driver is None:
+            self._driver = self._init_browser()
+        return self._driver
+
+    def _init_session(self):
+        """带连接池的HTTP会话"""
+        session = requests.Session()
+        session.headers.update(HEADERS)
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=16)
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        return session
     
     def _init_browser(self):
         """初始化浏览器配置"""
         options = webdriver.ChromeOptions()
+        if self.headless:
+            options.add_argument("--headless=new")
         options.add_argument("--disable-blink-features=AutomationControlled")
         options.add_experimental_option("excludeSwitches", ["enable-automation"])
-        service = Service(ChromeDriverManager().install())
+        service = Service(chromedriver_path())
         return webdriver.Chrome(service=service, options=options)
 
-    def crawl_paper_ids(self):
-        """第一步：爬取所有论文ID"""
-        base_url = "https://ieeexplore.ieee.org/search/searchresult.jsp?newsearch=true&queryText=Dysarthria&highlight=true&returnType=SEARCH&matchPubs=true&pageNumber={}&returnFacets=ALL&rowsPerPage=100"
+    def _crawl_search_page(self, driver, page):
+        """抓取一页搜索结果中的论文ID"""
+        driver.get(ieee.search_page_url(self.query, page, self.base_url))
+        
+        # 等待结果条目出现并渲染完毕
+        wait_until(driver, EC.presence_of_element_located(
+            (By.XPATH, '//xpl-results-list//div[contains(@class, "List-results-items")]')), label='search_results')
+        wait_for_dom_stable(driver, label='search_rendered')
+        results_container = driver.find_element(By.XPATH, '//xpl-results-list')
         
-        with open('paper_ids.csv', 'w', newline='') as f:
-            writer = csv.writer(f)
-            writer.writerow(['PaperID'])
-            
-            for page in range(1, 6):  # 爬取前5页
-                self.driver.get(base_url.format(page))
-                time.sleep(2)
-                
-                # 定位结果容器
-                results_container = self.wait.until(
-                    EC.presence_of_element_located((By.XPATH, '//xpl-results-list'))
-                )
-                
-                # 获取所有论文条目
-                items = results_container.find_elements(By.XPATH, './/div[contains(@class, "List-results-items")]')
-                for item in items:
-                    paper_id = item.get_attribute('id')
-                    if paper_id.isdigit():
-                        writer.writerow([paper_id])
+        # 获取所有论文条目
+        items = results_container.find_elements(By.XPATH, './/div[contains(@class, "List-results-items")]')
+        return [paper_id for item in items if (paper_id := item.get_attribute('id')).isdigit()]
+
+    def _crawl_search_page_retry(self, driver, page):
+        """搜索页加载超时时按退避策略重试"""
+        return self.fetcher.call(self.base_url, lambda: self._crawl_search_page(driver, page))
+
+    def crawl_paper_ids(self):
+        """第一步：爬取所有论文ID，多个浏览器并行抓取各页，新ID逐条追加到 paper_ids.csv"""
+        seen = read_column(PAPER_IDS_CSV, 'PaperID')
+        with CSVSink(PAPER_IDS_CSV, ['PaperID']) as sink:
+            for page, paper_ids in zip(self.pages, self.pool.imap(self._crawl_search_page_retry, self.pages)):
+                for pid in paper_ids or []:
+                    if pid not in seen:
+                        seen.add(pid)
+                        sink.write([pid])
                 print(f"第 {page} 页ID抓取完成")
+        print(f"新增 {sink.count} 个论文ID")
+        print(WAIT_STATS.report())
 
-    def parse_paper_details(self, paper_id):
-        """第二步：解析论文详情"""
-        self.driver.get(f"https://ieeexplore.ieee.org/document/{paper_id}")
-        
+    def parse_paper_details(self, paper_id, driver=None):
+        """第二步：解析论文详情，HTTP模式失败时回退到浏览器"""
+        with METRICS.span('ieee.paper', paper_id=paper_id):
+            return self._parse_paper_details(paper_id, driver)
+
+    def _parse_paper_details(self, paper_id, driver=None):
+        if self.mode == 'http':
+            try:
+                return self._parse_with_http(paper_id)
+            except FetchError as e:
+                # 页面结构变化（解析错误）才改用浏览器，网络错误重试耗尽后直接记为失败
+                if e.kind != PARSE:
+                    print(f"HTTP请求论文 {paper_id} 失败: {str(e)}")
+                    return None
+                print(f"HTTP解析论文 {paper_id} 失败，改用浏览器: {str(e)}")
+        return self._parse_with_browser(paper_id, driver)
+
+    def _parse_with_http(self, paper_id):
+        """直接请求文档页面并解析内嵌的元数据JSON"""
+        url = f"{self.base_url}/document/{paper_id}"
+        with METRICS.span('ieee.http_fetch'):
+            response = self.fetcher.get(url)
+        try:
+            with METRICS.span('ieee.parse_json'):
+                return ieee.parse_document(response.text, paper_id, self.base_url)
+        except (ValueError, KeyError) as e:
+            raise FetchError(PARSE, f"元数据解析失败: {str(e)}") from e
+
+    def _parse_with_browser(self, paper_id, driver=None):
+        """通过浏览器点击 "Cite This" 对话框提取详情，超时会重新加载页面重试"""
+        driver = driver or self.driver
+        METRICS.incr('ieee_browser_fallbacks' if self.mode == 'http' else 'ieee_browser_pages')
         try:
-            # 点击Cite按钮
-            cite_btn = self.wait.until(
-                EC.element_to_be_clickable((By.XPATH, '//button[contains(., "Cite This")]'))
-            )
-            self.driver.execute_script("arguments[0].click();", cite_btn)
-            time.sleep(1)
-            
-            # 勾选复选框
-            checkbox = self.wait.until(
-                EC.presence_of_element_located((By.XPATH, '//input[@type="checkbox"]'))
-            )
-            self.driver.execute_script("arguments[0].click();", checkbox)
-            time.sleep(1)
-            
-            # 提取文本内容
-            text_div = self.wait.until(
-                EC.presence_of_element_located((By.XPATH, '//div[@class="text" and @xplmathjax]'))
-            )
-            parts = [p.strip() for p in text_div.text.split('\n') if p.strip()]
-            
-            # 解析各部分数据
-            citation = parts[0]
-            title = re.search(r'"(.+?)"', citation).group(1)
-            abstract = parts[1].replace("Abstract: ", "")
-            keywords = parts[2].replace("Keywords: ", "")
-            links = ';'.join([a.get_attribute('href') for a in text_div.find_elements(By.TAG_NAME, 'a')])
-            
-            return {
-                'Title': title,
-                'Abstract': abstract,
-                'Keywords': keywords,
-                'Links': links,
-                'Citation': citation
-            }
-            
-        except Exception as e:
+            return self.fetcher.call(self.base_url, lambda: self._read_cite_dialog(driver, paper_id))
+        except FetchError as e:
             print(f"解析论文 {paper_id} 失败: {str(e)}")
             return None
 
-    def crawl_metadata(self):
-        """执行元数据抓取"""
-        with open('paper_ids.csv') as f:
+    def _read_cite_dialog(self, driver, paper_id):
+        with METRICS.span('ieee.page_load'):
+            driver.get(f"{self.base_url}/document/{paper_id}")
+        # 点击Cite按钮
+        cite_btn = wait_until(
+            driver, EC.element_to_be_clickable((By.XPATH, '//button[contains(., "Cite This")]')), label='cite_button'
+        )
+        driver.execute_script("arguments[0].click();", cite_btn)
+        
+        # 勾选复选框
+        checkbox = wait_until(
+            driver, EC.element_to_be_clickable((By.XPATH, '//input[@type="checkbox"]')), label='cite_checkbox'
+        )
+        driver.execute_script("arguments[0].click();", checkbox)
+        
+        # 等待引用、摘要、关键词三部分文本都已填充
+        def text_ready(d):
+            div = d.find_element(By.XPATH, '//div[@class="text" and @xplmathjax]')
+            parts = [p.strip() for p in div.text.split('\n') if p.strip()]
+            return (div, parts) if len(parts) >= 3 else False
+
+        text_div, parts = wait_until(driver, text_ready, label='cite_text')
+        
+        # 解析各部分数据
+        citation = parts[0]
+        # 题目取引号内的原文，与已有CSV格式一致；缺少年份等无法完整解析的引用照样保留
+        title = citations.quoted_title(citation)
+        if title is None:
+            raise FetchError(PARSE, f"引用文本中没有题目: {citation[:80]}")
+        abstract = parts[1].replace("Abstract: ", "")
+        keywords = parts[2].replace("Keywords: ", "")
+        links = ';'.join([a.get_attribute('href') for a in text_div.find_elements(By.TAG_NAME, 'a')])
+        
+        return {
+            'Title': title,
+            'Abstract': abstract,
+            'Keywords': keywords,
+            'Links': links,
+            'Citation': citation
+        }
+
+    def _existing_ids(self):
+        """从已有的元数据文件的 Links 列中提取文档ID（清单建立之前抓取的记录）"""
+        return {paper_id for links in read_column(METADATA_CSV, 'Links') if (paper_id := _arnumber(links))}
+
+    def _replace_refetched(self):
+        """--force 重新抓取的记录追加在文件末尾，合并为每篇论文一行（原位置，新内容）"""
+        removed = keep_latest(METADATA_CSV, lambda row: _arnumber(row['Links']))
+        if removed:
+            print(f"已用重新抓取的元数据替换 {removed} 条旧记录")
+
+    def _fetch_details(self, paper_ids, total=None):
+        """工作池并行解析 paper_ids（可以是生成器），结果按输入顺序逐条追加到元数据文件"""
+        start = time.perf_counter()
+        total = f"/{total}" if total is not None else ""
+        # 逐条追加写入，表头只在新文件中写入
+        with CSVSink(METADATA_CSV, ieee.FIELDNAMES) as sink:
+            details = self.pool.imap_items(lambda driver, pid: self.parse_paper_details(pid, driver), paper_ids)
+            for idx, (pid, data) in enumerate(details, 1):
+                print(f"已处理第 {idx}{total} 篇论文")
+                with METRICS.span('ieee.write'):
+                    if data:
+                        sink.write(data)
+                        self.store.upsert('ieee', pid, data)
+                        self.manifest.mark_done(MANIFEST_TASK, pid, content_hash=sha256_text(data['Citation']))
+                    else:
+                        self.manifest.mark_failed(MANIFEST_TASK, pid, "解析失败")
+                METRICS.incr('ieee_papers' if data else 'ieee_failed')
+                if data and sink.count == 1:
+                    print(f"首条记录耗时 {time.perf_counter() - start:.2f}s")
+        print(f"写入 {sink.count} 条记录，总耗时 {time.perf_counter() - start:.2f}s")
+        print(WAIT_STATS.report())
+        print(self.fetcher.report())
+        METRICS.merge('driver', self.pool.stats)
+
+    def iter_paper_ids(self, pages=None):
+        """逐页打开搜索结果并逐个产出论文ID，某一页失败时跳过该页"""
+        for page in pages or self.pages:
+            try:
+                paper_ids = self._crawl_search_page_retry(self.driver, page)
+            except Exception as e:
+                print(f"第 {page} 页ID抓取失败: {str(e)}")
+                continue
+            print(f"第 {page} 页ID抓取完成")
+            yield from paper_ids
+
+    def crawl_pipeline(self, pages=None, ids_csv=PAPER_IDS_CSV, force=False):
+        """流水线抓取：搜索页产出的ID经有界队列直接交给解析工作池，不必等全部ID抓完
+
+        跨页重复的ID与已完成的论文在送入队列前丢弃；ids_csv 不为 None 时同时把新ID追加到该文件。
+        """
+        done = set() if force else self._existing_ids()
+        seen = set()
+        id_sink = CSVSink(ids_csv, ['PaperID']) if ids_csv else None
+        known_ids = read_column(ids_csv, 'PaperID') if ids_csv else set()
+
+        def new_ids():
+            for pid in self.iter_paper_ids(pages):
+                if pid in seen:
+                    continue
+                seen.add(pid)
+                if id_sink is not None and pid not in known_ids:
+                    id_sink.write([pid])
+                if pid in done or (not force and self.manifest.is_done(MANIFEST_TASK, pid)):
+                    continue
+                yield pid
+
+        try:
+            self._fetch_details(new_ids())
+        finally:
+            if id_sink is not None:
+                id_sink.close()
+            if force:
+                self._replace_refetched()
+        print(f"搜索结果共 {len(seen)} 个不重复ID")
+
+    def crawl_metadata(self, force=False):
+        """执行元数据抓取，清单中已完成的论文会被跳过"""
+        with open(PAPER_IDS_CSV) as f:
             reader = csv.reader(f)
             next(reader)  # 跳过标题
             paper_ids = [row[0] for row in reader]
-        
-        with open('IEEE_paper_metadata.csv', 'a', newline='', encoding='utf-8') as csvfile:
-            fieldnames = ['Title', 'Abstract', 'Keywords', 'Links', 'Citation']
-            writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-            writer.writeheader()
-            
-            for idx, pid in enumerate(paper_ids, 1):
-                print(f"正在处理第 {idx}/{len(paper_ids)} 篇论文")
-                if data := self.parse_paper_details(pid):
-                    writer.writerow(data)
+        if force:
+            pending = paper_ids
+        else:
+            existing = self._existing_ids()
+            pending = [pid for pid in self.manifest.pending(MANIFEST_TASK, paper_ids) if pid not in existing]
+        print(f"共 {len(paper_ids)} 篇论文，跳过已完成的 {len(paper_ids) - len(pending)} 篇")
+        try:
+            self._fetch_details(pending, len(pending))
+        finally:
+            if force:
+                self._replace_refetched()
     
     def close(self):
-        self.driver.quit()
+        if self._driver is not None:
+            self._driver.quit()
+        self.fetcher.close()
+        for obj in self._owned:
+            obj.close()
 
 if __name__ == "__main__":
-    crawler = IEEECrawler()
-    
-    # 第一步：抓取ID
-   # crawler.crawl_paper_ids()
+    parser = argparse.ArgumentParser(description="抓取IEEE上dysarthria相关论文的元数据")
+    parser.add_argument('--mode', choices=['http', 'browser'], default='http',
+                        help="http: 直接解析页面元数据，失败时回退浏览器；browser: 只用浏览器")
+    parser.add_argument('--workers', type=int, default=1, help="并行工作线程（浏览器）数量")
+    parser.add_argument('--recycle-after', type=int, default=50, help="每个浏览器处理多少页面后重建")
+    parser.add_argument('--headless', action='store_true', help="使用无头浏览器")
+    parser.add_argument('--query', default=ieee.SEARCH_QUERY, help="搜索关键词")
+    parser.add_argument('--pages', type=parse_pages, default=range(1, 6), help="搜索结果页码范围，如 1-5")
+    parser.add_argument('--pipeline', action='store_true', help="边抓取搜索页ID边解析详情")
+    parser.add_argument('--queue-size', type=int, default=None, help="流水线中待解析ID队列的容量")
+    parser.add_argument('--no-ids-csv', action='store_true', help="流水线模式下不写 paper_ids.csv")
+    parser.add_argument('--force', action='store_true', help="忽略下载清单和已有的元数据，重新抓取全部论文")
+    parser.add_argument('--rate', type=float, default=HOST_RATE, help="每个主机每秒请求数")
+    parser.add_argument('--burst', type=int, default=HOST_BURST, help="每个主机突发请求数")
+    metrics.add_arguments(parser)
+    args = parser.parse_args()
+    metrics.start(args)
+
+    crawler = IEEECrawler(mode=args.mode, workers=args.workers, recycle_after=args.recycle_after,
+                          headless=args.headless, queue_size=args.queue_size, query=args.query, pages=args.pages,
+                          rate=args.rate, burst=args.burst)
     
-    # 第二步：抓取元数据
-    crawler.crawl_metadata()
+    if args.pipeline:
+        crawler.crawl_pipeline(ids_csv=None if args.no_ids_csv else PAPER_IDS_CSV, force=args.force)
+    else:
+        # 第一步：抓取ID
+       # crawler.crawl_paper_ids()
+        
+        # 第二步：抓取元数据
+        crawler.crawl_metadata(force=args.force)
     
-    crawler.close()
\ No newline at end of file
+    crawler.close()
+    METRICS.merge('fetch', crawler.fetcher.stats)
+    metrics.finish(args)
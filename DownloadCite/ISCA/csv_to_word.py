@@ -1,11 +1,26 @@
+import os
+import sys
 import csv
+import argparse
+import itertools
 from docx import Document
 from docx.shared import Pt, Inches
+from docx.enum.style import WD_STYLE_TYPE
 from docx.enum.text import WD_PARAGRAPH_ALIGNMENT
 
-def csv_to_word(csv_path, word_path):
-    # 创建新文档并设置页面
-    doc = Document()
+# 将仓库根目录加入搜索路径，以便导入公共模块 miner
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+from miner.docx_stream import StreamingDocx
+from miner.store import DEFAULT_STORE, SOURCES, PaperStore
+from miner.seeds import parse_years
+from miner import metrics
+from miner.metrics import METRICS
+
+HEADING = '参考文献列表'
+ENTRY_STYLE = 'Reference Entry'
+
+def _setup_document(doc):
+    """页面与 Normal 样式设置（原实现），两种输出方式共用"""
     section = doc.sections[0]
     section.top_margin = Inches(1)
     section.bottom_margin = Inches(1)
@@ -17,34 +32,127 @@ def csv_to_word(csv_path, word_path):
     font.size = Pt(12)
     style.paragraph_format.line_spacing = 1.5
     style.paragraph_format.first_line_indent = Inches(0)  # 取消首行缩进
+    return style
+
+def _setup_styles(doc):
+    """流式输出使用的样式：段后间距放在条目样式里，不再逐段设置"""
+    normal = _setup_document(doc)
+    entry = doc.styles.add_style(ENTRY_STYLE, WD_STYLE_TYPE.PARAGRAPH)
+    entry.base_style = normal
+    entry.paragraph_format.space_after = Pt(6)
+
+def _read_citations(csv_path):
+    """逐行产出 (编号, 引用)，缺失的数据保留编号"""
+    with open(csv_path, 'r', encoding='utf-8-sig') as f:
+        reader = csv.reader(f)
+        next(reader)  # 跳过标题行
+        for idx, row in enumerate(reader, 1):
+            if len(row) < 2:
+                print(f"警告：第{idx}条数据缺失，已保留编号")
+            yield idx, row[1] if len(row)>=2 else "（数据缺失）"
+
+def _store_citations(rows):
+    """逐条产出元数据库中有引用的记录 (编号, 引用)"""
+    idx = 0
+    for row in rows:
+        if row['citation']:
+            idx += 1
+            yield idx, row['citation']
+
+def _csv_to_word_docx(entries, word_path):
+    """python-docx 逐段生成（原实现），条目多时较慢"""
+    doc = Document()
+    _setup_document(doc)
+    idx = 0
 
+    # 添加参考文献标题
+    doc.add_heading(HEADING, 0).alignment = WD_PARAGRAPH_ALIGNMENT.CENTER
+    
+    # 生成带编号的引用
+    for idx, citation in entries:
+        # 创建带格式的段落
+        p = doc.add_paragraph(style='Normal')
+        p.add_run(f"[{idx}] ").bold = True    # 加粗编号
+        p.add_run(citation)                  # 正常字体内容
+        p.paragraph_format.space_after = Pt(6)  # 段后间距
+
+    with METRICS.span('docx.save'):
+        doc.save(word_path)
+    return idx
+
+def _csv_to_word_stream(entries, word_path):
+    """流式写入 document.xml，耗时与内存不随条目数急剧增长"""
+    idx = 0
+    with StreamingDocx(word_path, _setup_styles) as doc:
+        doc.paragraph(HEADING, style='Title', align='center')
+        for idx, citation in entries:
+            doc.paragraph([(f"[{idx}] ", True), (citation, False)], style=ENTRY_STYLE)
+    return idx
+
+BACKENDS = {'stream': _csv_to_word_stream, 'docx': _csv_to_word_docx}
+
+def csv_to_word(csv_path, word_path, backend='stream'):
+    _convert(_read_citations(csv_path), word_path, backend)
+
+def store_to_word(word_path, backend='stream', store=None, source='isca', years=None, venue=None,
+                  changed_only=False, order='year'):
+    """从元数据库按条件查询引用并导出，changed_only=True 时只导出上次导出到同名文件之后变化的记录"""
+    own = store is None
+    store = store or PaperStore()
+    export = f"docx:{os.path.basename(word_path)}"
     try:
-        with open(csv_path, 'r', encoding='utf-8-sig') as f:
-            reader = csv.reader(f)
-            next(reader)  # 跳过标题行
-            
-            # 添加参考文献标题
-            doc.add_heading('参考文献列表', 0).alignment = WD_PARAGRAPH_ALIGNMENT.CENTER
-            
-            # 生成带编号的引用
-            for idx, row in enumerate(reader, 1):
-                if len(row) < 2:
-                    print(f"警告：第{idx}条数据缺失，已保留编号")
-                citation = row[1] if len(row)>=2 else "（数据缺失）"
-                
-                # 创建带格式的段落
-                p = doc.add_paragraph(style='Normal')
-                p.add_run(f"[{idx}] ").bold = True    # 加粗编号
-                p.add_run(citation)                  # 正常字体内容
-                p.paragraph_format.space_after = Pt(6)  # 段后间距
+        seq = store.max_seq()
+        rows = store.select(source, years, venue, store.last_export(export) if changed_only else None, order)
+        entries = _store_citations(rows)
+        first = next(entries, None)
+        if first is None:
+            print('没有符合条件的引用' + ('（上次导出后无变化）' if changed_only else ''))
+            return
+        if _convert(itertools.chain([first], entries), word_path, backend):
+            store.mark_exported(export, seq)
+    finally:
+        if own:
+            store.close()
 
+def _convert(entries, word_path, backend):
+    try:
+        with METRICS.span('docx.export', backend=backend):
+            idx = BACKENDS[backend](entries, word_path)
     except Exception as e:
         print(f"处理失败: {str(e)}")
-        return
+        return False
+    METRICS.incr('docx_entries', idx)
 
-    doc.save(word_path)
     print(f"成功生成包含 {idx} 条编号引用的文档：{word_path}")
+    return True
 
 # 使用示例
 if __name__ == "__main__":
-    csv_to_word('citations.csv', 'references.docx')
+    parser = argparse.ArgumentParser(description="把 citations.csv 转换为带编号的参考文献 Word 文档")
+    parser.add_argument('--backend', choices=sorted(BACKENDS), default='stream',
+                        help="stream: 流式写入（默认）；docx: python-docx 逐段生成")
+    parser.add_argument('--from-store', nargs='?', const=DEFAULT_STORE, default=None, metavar='DB',
+                        help="从元数据库（默认 papers.db）查询导出，不读CSV")
+    parser.add_argument('--source', choices=SOURCES, default='isca', help="从元数据库导出时的数据源")
+    parser.add_argument('--years', type=parse_years, default=None, help="只导出这些年份，如 2019-2024")
+    parser.add_argument('--venue', default=None, help="只导出会议/期刊名包含该文字的记录")
+    parser.add_argument('--changed-only', action='store_true',
+                        help="只导出上次导出到 --output 之后新增或变化的记录，必须同时指定 --output")
+    parser.add_argument('--output', default=None, help="输出的Word文件，默认 references.docx")
+    metrics.add_arguments(parser)
+    args = parser.parse_args()
+    if args.changed_only and not args.output:
+        # 只含变化记录的文档不能覆盖完整的 references.docx
+        parser.error("--changed-only 需要用 --output 指定单独的文件，以免覆盖完整的参考文献 references.docx")
+    output = args.output or 'references.docx'
+    metrics.start(args)
+    if args.from_store:
+        store = PaperStore(args.from_store)
+        try:
+            store_to_word(output, args.backend, store, args.source, args.years, args.venue,
+                          args.changed_only)
+        finally:
+            store.close()
+    else:
+        csv_to_word('citations.csv', output, args.backend)
+    metrics.finish(args)
@@ -1,147 +1,140 @@
-import csv
-import time
+import os
+import sys
+import argparse
 from selenium import webdriver
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.chrome.service import Service
-from webdriver_manager.chrome import ChromeDriverManager
+
+# 将仓库根目录加入搜索路径，以便导入公共模块 miner
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+from miner.manifest import Manifest, sha256_text
+from miner.store import PaperStore
+from miner.driverpool import DriverPool, chromedriver_path
+from miner.waits import WAIT_STATS, wait_until, document_ready
+from miner.sinks import CSVSink, keep_latest, read_column
+from miner.fetch import Fetcher, FetchError
+from miner.seeds import ISCA_URLS, load_urls
+from miner import metrics
+from miner.metrics import METRICS
+
+OUTPUT_CSV = 'citations.csv'
+MANIFEST_TASK = 'citation'  # 下载清单中的任务名
+HOST_RATE = 1.0  # 每个主机每秒允许的请求数
+HOST_BURST = 2  # 每个主机允许的突发请求数
 
 class CitationScraper:
-    def __init__(self):
-        self.driver = self._init_browser()
-        self.wait = WebDriverWait(self.driver, 20)
-        self.results = []
+    def __init__(self, manifest=None, workers=1, recycle_after=50, headless=False, store=None, rate=HOST_RATE,
+                 burst=HOST_BURST):
+        """workers 个浏览器并行抓取，每个浏览器处理 recycle_after 个页面后重建，引用同时写入元数据库 store
+
+        每个主机每秒最多加载 rate 个页面（突发 burst 个）。
+        """
+        self.pool = DriverPool(self._init_browser, workers, recycle_after)
+        self.headless = headless
+        self.manifest = manifest or Manifest()
+        self.store = store or PaperStore()
+        # 只关闭自己创建的清单与元数据库，调用方传入的由调用方关闭
+        self._owned = [obj for obj, given in ((self.manifest, manifest), (self.store, store)) if given is None]
+        # 页面加载超时等可重试错误按退避策略重试，同一主机连续失败时暂停
+        self.fetcher = Fetcher(rate=rate, burst=burst, concurrency=workers, max_concurrency=max(workers, 1))
 
     def _init_browser(self):
         options = webdriver.ChromeOptions()
+        if self.headless:
+            options.add_argument("--headless=new")
         options.add_argument("--disable-notifications")
         options.add_argument("--disable-popup-blocking")
         options.add_experimental_option("excludeSwitches", ["enable-automation"])
         
-        service = Service(ChromeDriverManager().install())
+        service = Service(chromedriver_path())
         return webdriver.Chrome(service=service, options=options)
 
-    def _click_citation(self):
+    def _click_citation(self, driver):
+        with METRICS.span('citation.click'):
+            return self._read_citation(driver)
+
+    def _read_citation(self, driver):
+        driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
+        citation_btn = wait_until(
+            driver, EC.element_to_be_clickable((By.CSS_SELECTOR, "#show-citation i")), label='citation_button'
+        )
+        driver.execute_script("arguments[0].click();", citation_btn)
+        content = wait_until(
+            driver, EC.visibility_of_element_located((By.ID, "citation-content")), label='citation_content'
+        )
+        return content.text
+
+    def _load_citation(self, driver, url):
+        with METRICS.span('citation.page_load', url=url):
+            driver.get(url)
+            wait_until(driver, document_ready, label='page_ready')
+        return self._click_citation(driver)
+
+    def _scrape_one(self, driver, url):
+        """在工作线程中抓取单个页面的引用，超时会重新加载页面重试"""
         try:
-            self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-            citation_btn = self.wait.until(
-                EC.element_to_be_clickable((By.CSS_SELECTOR, "#show-citation i"))
-            )
-            self.driver.execute_script("arguments[0].click();", citation_btn)
-            content = self.wait.until(
-                EC.visibility_of_element_located((By.ID, "citation-content"))
-            )
-            return content.text
-        except Exception as e:
+            return self.fetcher.call(url, lambda: self._load_citation(driver, url))
+        except FetchError as e:
             print(f"抓取失败: {str(e)}")
             return None
 
-    def _save_to_file(self):
-        with open('citations.csv', 'w', newline='', encoding='utf-8-sig') as f:
-            writer = csv.writer(f)
-            writer.writerow(['URL', 'Citation'])
-            writer.writerows(self.results)
+    def scrape(self, urls, force=False):
+        """抓取引用并逐条追加到 citations.csv
+
+        force=True 时重新抓取全部页面，结束后每个URL只保留一行（原位置，新引用），编号不会重复。
+        """
+        # 清单中已完成或已有结果的URL不再重复抓取
+        if force:
+            pending = list(urls)
+        else:
+            done = read_column(OUTPUT_CSV, 'URL', encoding='utf-8-sig')
+            pending = [url for url in self.manifest.pending(MANIFEST_TASK, urls) if url not in done]
+        fetched = 0
+        print(f"共 {len(urls)} 个页面，跳过已完成的 {len(urls) - len(pending)} 个")
 
-    def scrape(self, urls):
+        sink = CSVSink(OUTPUT_CSV, ['URL', 'Citation'], encoding='utf-8-sig')
         try:
-            for idx, url in enumerate(urls, 1):
-                print(f"正在处理 [{idx}/{len(urls)}]: {url}")
-                self.driver.get(url)
-                time.sleep(1)
+            # 结果按输入顺序返回
+            citations = self.pool.imap(self._scrape_one, pending)
+            for idx, (url, citation) in enumerate(zip(pending, citations), 1):
+                print(f"已处理 [{idx}/{len(pending)}]: {url}")
                 
-                if citation := self._click_citation():
-                    self.results.append((url, citation))
-                
-                if idx % 10 == 0:
-                    self._save_to_file()
+                with METRICS.span('citation.write'):
+                    if citation:
+                        sink.write((url, citation))
+                        self.store.upsert('isca', url, {'URL': url, 'Citation': citation})
+                        fetched += 1
+                        self.manifest.mark_done(MANIFEST_TASK, url, content_hash=sha256_text(citation))
+                    else:
+                        self.manifest.mark_failed(MANIFEST_TASK, url, "未获取到引用")
+                METRICS.incr('citations_fetched' if citation else 'citations_failed')
         finally:
-            self._save_to_file()
-            self.driver.quit()
-            print(f"完成！成功获取 {len(self.results)}/{len(urls)} 条记录")
+            sink.close()
+            if force and (removed := keep_latest(OUTPUT_CSV, lambda row: row['URL'], encoding='utf-8-sig')):
+                print(f"已用重新抓取的引用替换 {removed} 条旧记录")
+            for obj in self._owned:
+                obj.close()
+            print(f"完成！本次成功获取 {fetched}/{len(pending)} 条记录")
+            print(WAIT_STATS.report())
+            print(self.fetcher.report())
+            METRICS.merge('fetch', self.fetcher.stats)
+            METRICS.merge('driver', self.pool.stats)
 
 if __name__ == "__main__":
-    sample_urls = [
-        "https://www.isca-archive.org/icslp_1996/menendezpidal96_icslp.html",
-        "https://www.isca-archive.org/maveba_1999/tomik99_maveba.html",
-        "https://www.isca-archive.org/icslp_2002/patel02_icslp.html",
-        "https://www.isca-archive.org/icslp_2002/will02_icslp.html",
-        "https://www.isca-archive.org/speechprosody_2002/claen02_speechprosody.html",
-        "https://www.isca-archive.org/maveba_2003/niu03_maveba.html",
-        "https://www.isca-archive.org/ssw_2004/kain04_ssw.html",
-        "https://www.isca-archive.org/interspeech_2004/mori04_interspeech.html",
-        "https://www.isca-archive.org/interspeech_2004/green04_interspeech.html",
-        "https://www.isca-archive.org/interspeech_2007/morales07_interspeech.html",
-        "https://www.isca-archive.org/maveba_2007/hernandezdiazhuici07_maveba.html",
-        "https://www.isca-archive.org/interspeech_2008/carmichael08_interspeech.html",
-        "https://www.isca-archive.org/interspeech_2009/nagaraja09_interspeech.html",
-        "https://www.isca-archive.org/interspeech_2009/sharma09_interspeech.html",
-        "https://www.isca-archive.org/interspeech_2010/kim10i_interspeech.html",
-        "https://www.isca-archive.org/interspeech_2010/hosom10_interspeech.html",
-        "https://www.isca-archive.org/speechprosody_2010/kim10_speechprosody.html",
-        "https://www.isca-archive.org/interspeech_2011/shimura11_interspeech.html",
-        "https://www.isca-archive.org/interspeech_2011/hummel11_interspeech.html",
-        "https://www.isca-archive.org/maveba_2011/skodda11_maveba.html",
-        "https://www.isca-archive.org/maveba_2011/rusz11_maveba.html",
-        "https://www.isca-archive.org/interspeech_2012/paja12_interspeech.html",
-        "https://www.isca-archive.org/interspeech_2012/kim12d_interspeech.html",
-        "https://www.isca-archive.org/spasr_2013/rudzicz13_spasr.html",
-        "https://www.isca-archive.org/interspeech_2013/kim13d_interspeech.html",
-        "https://www.isca-archive.org/interspeech_2013/martinez13b_interspeech.html",
-        "https://www.isca-archive.org/interspeech_2013/antolik13_interspeech.html",
-        "https://www.isca-archive.org/interspeech_2014/berry14_interspeech.html",
-        "https://www.isca-archive.org/interspeech_2015/wong15_interspeech.html",
-        "https://www.isca-archive.org/interspeech_2015/bigi15_interspeech.html",
-        "https://www.isca-archive.org/slpat_2016/prakash16_slpat.html",
-        "https://www.isca-archive.org/slpat_2016/aihara16_slpat.html",
-        "https://www.isca-archive.org/interspeech_2016/bhat16_interspeech.html",
-        "https://www.isca-archive.org/interspeech_2016/kim16c_interspeech.html",
-        "https://www.isca-archive.org/interspeech_2017/vachhani17_interspeech.html",
-        "https://www.isca-archive.org/interspeech_2017/gillespie17_interspeech.html",
-        "https://www.isca-archive.org/interspeech_2017/novotny17_interspeech.html",
-        "https://www.isca-archive.org/interspeech_2018/np18_interspeech.html",
-        "https://www.isca-archive.org/interspeech_2018/vasquezcorrea18_interspeech.html",
-        "https://www.isca-archive.org/interspeech_2018/kim18e_interspeech.html",
-        "https://www.isca-archive.org/interspeech_2019/shor19_interspeech.html",
-        "https://www.isca-archive.org/interspeech_2019/rueda19_interspeech.html",
-        "https://www.isca-archive.org/interspeech_2019/hu19c_interspeech.html",
-        "https://www.isca-archive.org/interspeech_2019/korzekwa19_interspeech.html",
-        "https://www.isca-archive.org/interspeech_2019/liu19j_interspeech.html",
-        "https://www.isca-archive.org/interspeech_2019/mayle19_interspeech.html",
-        "https://www.isca-archive.org/interspeech_2020/hernandez20_interspeech.html",
-        "https://www.isca-archive.org/interspeech_2020/chen20s_interspeech.html",
-        "https://www.isca-archive.org/interspeech_2020/tong20b_interspeech.html",
-        "https://www.isca-archive.org/interspeech_2020/alhinti20_interspeech.html",
-        "https://www.isca-archive.org/interspeech_2020/kodrasi20_interspeech.html",
-        "https://www.isca-archive.org/speechprosody_2020/fivela20_speechprosody.html",
-        "https://www.isca-archive.org/isaph_2021/sansegundo21_isaph.html",
-        "https://www.isca-archive.org/interspeech_2021/vasquezcorrea21_interspeech.html",
-        "https://www.isca-archive.org/interspeech_2021/wang21u_interspeech.html",
-        "https://www.isca-archive.org/interspeech_2022/turrisi22_interspeech.html",
-        "https://www.isca-archive.org/interspeech_2022/salim22_interspeech.html",
-        "https://www.isca-archive.org/interspeech_2022/zhang22o_interspeech.html",
-        "https://www.isca-archive.org/interspeech_2022/abderrazek22_interspeech.html",
-        "https://www.isca-archive.org/interspeech_2022/hernandez22_interspeech.html",
-        "https://www.isca-archive.org/interspeech_2022/tran22c_interspeech.html",
-        "https://www.isca-archive.org/ssw_2023/fong23b_ssw.html",
-        "https://www.isca-archive.org/interspeech_2023/venkatathirumalakumar23_interspeech.html",
-        "https://www.isca-archive.org/interspeech_2023/bhattacharjee23_interspeech.html",
-        "https://www.isca-archive.org/interspeech_2023/svihlik23_interspeech.html",
-        "https://www.isca-archive.org/interspeech_2023/illner23_interspeech.html",
-        "https://www.isca-archive.org/interspeech_2023/rathod23_interspeech.html",
-        "https://www.isca-archive.org/interspeech_2023/riosurrego23_interspeech.html",
-        "https://www.isca-archive.org/interspeech_2023/hermann23_interspeech.html",
-        "https://www.isca-archive.org/speechprosody_2024/fernandez24_speechprosody.html",
-        "https://www.isca-archive.org/issp_2024/munasinghe24_issp.html",
-        "https://www.isca-archive.org/interspeech_2024/lin24e_interspeech.html",
-        "https://www.isca-archive.org/interspeech_2024/gao24c_interspeech.html",
-        "https://www.isca-archive.org/interspeech_2024/samptur24_interspeech.html",
-        "https://www.isca-archive.org/interspeech_2024/zhang24l_interspeech.html",
-        "https://www.isca-archive.org/interspeech_2024/xiong24_interspeech.html",
-        "https://www.isca-archive.org/interspeech_2024/wan24b_interspeech.html",
-        "https://www.isca-archive.org/interspeech_2024/leung24_interspeech.html",
-        "https://www.isca-archive.org/interspeech_2024/zaheera24_interspeech.html"
-    ]
-    
-    scraper = CitationScraper()
-    scraper.scrape(sample_urls)
+    parser = argparse.ArgumentParser(description="抓取ISCA论文的引用信息")
+    parser.add_argument('--workers', type=int, default=1, help="并行浏览器数量")
+    parser.add_argument('--recycle-after', type=int, default=50, help="每个浏览器处理多少页面后重建")
+    parser.add_argument('--headless', action='store_true', help="使用无头浏览器")
+    parser.add_argument('--urls', default=ISCA_URLS, help="论文页面URL列表文件（每行一个）")
+    parser.add_argument('--force', action='store_true', help="忽略下载清单，重新抓取全部页面")
+    parser.add_argument('--rate', type=float, default=HOST_RATE, help="每个主机每秒加载页面数")
+    parser.add_argument('--burst', type=int, default=HOST_BURST, help="每个主机突发请求数")
+    metrics.add_arguments(parser)
+    args = parser.parse_args()
+    metrics.start(args)
+
+    scraper = CitationScraper(workers=args.workers, recycle_after=args.recycle_after, headless=args.headless,
+                              rate=args.rate, burst=args.burst)
+    scraper.scrape(load_urls(args.urls), force=args.force)
+    metrics.finish(args)
@@ -1,8 +1,23 @@
 import os
+import sys
 import time
-import requests
-from urllib.parse import urljoin
-from bs4 import BeautifulSoup
+import asyncio
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+
+# 将仓库根目录加入搜索路径，以便导入公共模块 miner
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+from miner.manifest import Manifest
+from miner.httpcache import HTTPCache, MISSING
+from miner.fetch import Fetcher
+from miner import download
+from miner.blobstore import open_store
+from miner.fulltext import FullTextIndex
+from miner.isca import parse_pdf_link
+from miner.seeds import ISCA_URLS, load_urls
+from miner import metrics
+from miner.metrics import METRICS
 
 # 配置参数
 DOWNLOAD_DIR = "paper_pdfs"
@@ -10,134 +25,180 @@ HEADERS = {
     'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
 }
 REQUEST_DELAY = 2  # 每次请求间隔秒数
+REQUEST_TIMEOUT = 30  # 单次请求超时秒数
+MANIFEST_TASK = "pdf"  # 下载清单中的任务名
+PDF_LINK_KIND = "pdf_link"  # 解析缓存中 URL→PDF链接 的类型名
+
+# 异步模式参数
+MAX_CONCURRENCY = 8  # 同时处理的论文数
+HOST_RATE = 1.0  # 每个主机每秒允许的请求数
+HOST_BURST = 2  # 每个主机允许的突发请求数
+
+# 所有请求共用的抓取器：429/5xx/超时自动退避重试，同一主机连续失败时熔断
+FETCHER = Fetcher(headers=HEADERS, timeout=REQUEST_TIMEOUT)
 
 def setup_download_dir():
     """创建下载目录"""
     os.makedirs(DOWNLOAD_DIR, exist_ok=True)
 
-def download_pdf(url):
-    """处理单个论文页面的PDF下载"""
+def find_pdf_url(url, fetcher=None, cache=None):
+    """获取论文页面并解析出PDF链接，未找到时返回None
+
+    传入 cache 时页面与解析结果都走本地缓存。
+    """
+    fetcher = fetcher or FETCHER
+    with METRICS.span('pdf.find_link', url=url):
+        if cache is not None:
+            return cache.get_parsed(url, PDF_LINK_KIND, _parse_pdf_link, fetcher, HEADERS, REQUEST_TIMEOUT)
+
+        response = fetcher.get(url)
+        return _parse_pdf_link(response.text, url)
+
+def _parse_pdf_link(html, url):
+    with METRICS.span('pdf.parse_html'):
+        return parse_pdf_link(html, url)
+
+def save_pdf(pdf_url, fetcher=None):
+    """流式下载PDF文件并保存，返回包含路径、哈希与缓存校验头的字典"""
+    with METRICS.span('pdf.download', url=pdf_url):
+        return download.save_pdf(pdf_url, DOWNLOAD_DIR, fetcher or FETCHER)
+
+def _record(manifest, url, info=None, error=None):
+    """把下载结果写入清单"""
+    METRICS.incr('pdf_downloaded' if info is not None else 'pdf_failed')
+    if manifest is None:
+        return
+    with METRICS.span('manifest.write'):
+        if info is not None:
+            manifest.mark_done(MANIFEST_TASK, url, content_hash=info['sha256'], etag=info['etag'],
+                               last_modified=info['last_modified'], path=info['path'])
+        else:
+            manifest.mark_failed(MANIFEST_TASK, url, error)
+
+def download_pdf(url, manifest=None, cache=None):
+    """处理单个论文页面的PDF下载，成功返回True"""
     try:
-        # 获取论文页面
-        response = requests.get(url, headers=HEADERS)
-        response.raise_for_status()
-        
-        # 解析PDF链接
-        soup = BeautifulSoup(response.text, 'html.parser')
-        pdf_link = soup.find('a', href=lambda href: href and href.endswith('.pdf'))
-        
-        if not pdf_link:
+        pdf_url = find_pdf_url(url, cache=cache)
+        if not pdf_url:
             print(f"未找到PDF链接: {url}")
-            return
+            _record(manifest, url, error="未找到PDF链接")
+            return False
 
-        # 构建完整PDF URL
-        pdf_url = urljoin(url, pdf_link['href'])
-        
-        # 下载PDF文件
-        pdf_response = requests.get(pdf_url, headers=HEADERS)
-        pdf_response.raise_for_status()
-        
-        # 生成文件名
-        filename = os.path.join(DOWNLOAD_DIR, pdf_url.split('/')[-1])
-        
-        # 保存文件
-        with open(filename, 'wb') as f:
-            f.write(pdf_response.content)
-            
-        print(f"成功下载: {filename}")
+        info = save_pdf(pdf_url)
+        _record(manifest, url, info)
+        print(f"成功下载: {info['path']}")
+        return True
         
     except Exception as e:
         print(f"下载失败: {url} - {str(e)}")
+        _record(manifest, url, error=str(e))
+        return False
+    finally:
+        with METRICS.span('pdf.sleep'):
+            time.sleep(REQUEST_DELAY)
+
+async def download_all_async(urls, concurrency=MAX_CONCURRENCY, rate=HOST_RATE, burst=HOST_BURST,
+                             manifest=None, cache=None):
+    """异步并发下载：信号量限制并发数，令牌桶按主机限速，取代固定的 sleep
+
+    返回成功下载的文件数。
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    # 抓取器的令牌桶按主机限速，重试同样消耗令牌，429 的 Retry-After 暂停该主机；
+    # 被限流时自适应并发会把同时进行的请求减半，恢复后逐步回升
+    fetcher = Fetcher(headers=HEADERS, timeout=REQUEST_TIMEOUT, rate=rate, burst=burst, concurrency=concurrency,
+                      max_concurrency=concurrency)
+    adapter = HTTPAdapter(pool_maxsize=concurrency)
+    fetcher.session.mount('https://', adapter)
+    fetcher.session.mount('http://', adapter)
+    loop = asyncio.get_running_loop()
+    executor = ThreadPoolExecutor(max_workers=concurrency)
+
+    async def run(idx, url):
+        async with semaphore:
+            print(f"正在处理 [{idx}/{len(urls)}]: {url}")
+            try:
+                # 解析缓存命中时无需请求页面，也就不消耗令牌
+                pdf_url = cache.lookup_parsed(url, PDF_LINK_KIND) if cache is not None else MISSING
+                if pdf_url is MISSING:
+                    pdf_url = await loop.run_in_executor(executor, lambda: find_pdf_url(url, fetcher, cache))
+                if not pdf_url:
+                    print(f"未找到PDF链接: {url}")
+                    _record(manifest, url, error="未找到PDF链接")
+                    return False
+
+                info = await loop.run_in_executor(executor, lambda: save_pdf(pdf_url, fetcher))
+                _record(manifest, url, info)
+                print(f"成功下载: {info['path']}")
+                return True
+            except Exception as e:
+                print(f"下载失败: {url} - {str(e)}")
+                _record(manifest, url, error=str(e))
+                return False
+
+    try:
+        results = await asyncio.gather(*(run(idx, url) for idx, url in enumerate(urls, 1)))
     finally:
-        time.sleep(REQUEST_DELAY)
+        executor.shutdown(wait=False)
+        print(fetcher.report())
+        METRICS.merge('fetch', fetcher.stats)
+        fetcher.close()
+    return sum(results)
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="下载ISCA论文PDF")
+    parser.add_argument('--async', dest='use_async', action='store_true', help="使用异步并发模式")
+    parser.add_argument('--concurrency', type=int, default=MAX_CONCURRENCY, help="异步模式最大并发数")
+    parser.add_argument('--rate', type=float, default=HOST_RATE, help="异步模式每个主机每秒请求数")
+    parser.add_argument('--burst', type=int, default=HOST_BURST, help="异步模式每个主机突发请求数")
+    parser.add_argument('--force', action='store_true', help="忽略下载清单，重新下载全部论文")
+    parser.add_argument('--urls', default=ISCA_URLS, help="论文页面URL列表文件（每行一个）")
+    parser.add_argument('--no-cache', action='store_true', help="不使用本地HTTP缓存")
+    parser.add_argument('--index', action='store_true', help="下载完成后提取新PDF的正文并更新全文索引（需要 pypdf）")
+    metrics.add_arguments(parser)
+    return parser.parse_args()
 
 if __name__ == "__main__":
+    args = parse_args()
+    metrics.start(args)
     setup_download_dir()
-    
-    sample_urls = [
-        "https://www.isca-archive.org/icslp_1996/menendezpidal96_icslp.html",
-        "https://www.isca-archive.org/maveba_1999/tomik99_maveba.html",
-        "https://www.isca-archive.org/icslp_2002/patel02_icslp.html",
-        "https://www.isca-archive.org/icslp_2002/will02_icslp.html",
-        "https://www.isca-archive.org/speechprosody_2002/claen02_speechprosody.html",
-        "https://www.isca-archive.org/maveba_2003/niu03_maveba.html",
-        "https://www.isca-archive.org/ssw_2004/kain04_ssw.html",
-        "https://www.isca-archive.org/interspeech_2004/mori04_interspeech.html",
-        "https://www.isca-archive.org/interspeech_2004/green04_interspeech.html",
-        "https://www.isca-archive.org/interspeech_2007/morales07_interspeech.html",
-        "https://www.isca-archive.org/maveba_2007/hernandezdiazhuici07_maveba.html",
-        "https://www.isca-archive.org/interspeech_2008/carmichael08_interspeech.html",
-        "https://www.isca-archive.org/interspeech_2009/nagaraja09_interspeech.html",
-        "https://www.isca-archive.org/interspeech_2009/sharma09_interspeech.html",
-        "https://www.isca-archive.org/interspeech_2010/kim10i_interspeech.html",
-        "https://www.isca-archive.org/interspeech_2010/hosom10_interspeech.html",
-        "https://www.isca-archive.org/speechprosody_2010/kim10_speechprosody.html",
-        "https://www.isca-archive.org/interspeech_2011/shimura11_interspeech.html",
-        "https://www.isca-archive.org/interspeech_2011/hummel11_interspeech.html",
-        "https://www.isca-archive.org/maveba_2011/skodda11_maveba.html",
-        "https://www.isca-archive.org/maveba_2011/rusz11_maveba.html",
-        "https://www.isca-archive.org/interspeech_2012/paja12_interspeech.html",
-        "https://www.isca-archive.org/interspeech_2012/kim12d_interspeech.html",
-        "https://www.isca-archive.org/spasr_2013/rudzicz13_spasr.html",
-        "https://www.isca-archive.org/interspeech_2013/kim13d_interspeech.html",
-        "https://www.isca-archive.org/interspeech_2013/martinez13b_interspeech.html",
-        "https://www.isca-archive.org/interspeech_2013/antolik13_interspeech.html",
-        "https://www.isca-archive.org/interspeech_2014/berry14_interspeech.html",
-        "https://www.isca-archive.org/interspeech_2015/wong15_interspeech.html",
-        "https://www.isca-archive.org/interspeech_2015/bigi15_interspeech.html",
-        "https://www.isca-archive.org/slpat_2016/prakash16_slpat.html",
-        "https://www.isca-archive.org/slpat_2016/aihara16_slpat.html",
-        "https://www.isca-archive.org/interspeech_2016/bhat16_interspeech.html",
-        "https://www.isca-archive.org/interspeech_2016/kim16c_interspeech.html",
-        "https://www.isca-archive.org/interspeech_2017/vachhani17_interspeech.html",
-        "https://www.isca-archive.org/interspeech_2017/gillespie17_interspeech.html",
-        "https://www.isca-archive.org/interspeech_2017/novotny17_interspeech.html",
-        "https://www.isca-archive.org/interspeech_2018/np18_interspeech.html",
-        "https://www.isca-archive.org/interspeech_2018/vasquezcorrea18_interspeech.html",
-        "https://www.isca-archive.org/interspeech_2018/kim18e_interspeech.html",
-        "https://www.isca-archive.org/interspeech_2019/shor19_interspeech.html",
-        "https://www.isca-archive.org/interspeech_2019/rueda19_interspeech.html",
-        "https://www.isca-archive.org/interspeech_2019/hu19c_interspeech.html",
-        "https://www.isca-archive.org/interspeech_2019/korzekwa19_interspeech.html",
-        "https://www.isca-archive.org/interspeech_2019/liu19j_interspeech.html",
-        "https://www.isca-archive.org/interspeech_2019/mayle19_interspeech.html",
-        "https://www.isca-archive.org/interspeech_2020/hernandez20_interspeech.html",
-        "https://www.isca-archive.org/interspeech_2020/chen20s_interspeech.html",
-        "https://www.isca-archive.org/interspeech_2020/tong20b_interspeech.html",
-        "https://www.isca-archive.org/interspeech_2020/alhinti20_interspeech.html",
-        "https://www.isca-archive.org/interspeech_2020/kodrasi20_interspeech.html",
-        "https://www.isca-archive.org/speechprosody_2020/fivela20_speechprosody.html",
-        "https://www.isca-archive.org/isaph_2021/sansegundo21_isaph.html",
-        "https://www.isca-archive.org/interspeech_2021/vasquezcorrea21_interspeech.html",
-        "https://www.isca-archive.org/interspeech_2021/wang21u_interspeech.html",
-        "https://www.isca-archive.org/interspeech_2022/turrisi22_interspeech.html",
-        "https://www.isca-archive.org/interspeech_2022/salim22_interspeech.html",
-        "https://www.isca-archive.org/interspeech_2022/zhang22o_interspeech.html",
-        "https://www.isca-archive.org/interspeech_2022/abderrazek22_interspeech.html",
-        "https://www.isca-archive.org/interspeech_2022/hernandez22_interspeech.html",
-        "https://www.isca-archive.org/interspeech_2022/tran22c_interspeech.html",
-        "https://www.isca-archive.org/ssw_2023/fong23b_ssw.html",
-        "https://www.isca-archive.org/interspeech_2023/venkatathirumalakumar23_interspeech.html",
-        "https://www.isca-archive.org/interspeech_2023/bhattacharjee23_interspeech.html",
-        "https://www.isca-archive.org/interspeech_2023/svihlik23_interspeech.html",
-        "https://www.isca-archive.org/interspeech_2023/illner23_interspeech.html",
-        "https://www.isca-archive.org/interspeech_2023/rathod23_interspeech.html",
-        "https://www.isca-archive.org/interspeech_2023/riosurrego23_interspeech.html",
-        "https://www.isca-archive.org/interspeech_2023/hermann23_interspeech.html",
-        "https://www.isca-archive.org/speechprosody_2024/fernandez24_speechprosody.html",
-        "https://www.isca-archive.org/issp_2024/munasinghe24_issp.html",
-        "https://www.isca-archive.org/interspeech_2024/lin24e_interspeech.html",
-        "https://www.isca-archive.org/interspeech_2024/gao24c_interspeech.html",
-        "https://www.isca-archive.org/interspeech_2024/samptur24_interspeech.html",
-        "https://www.isca-archive.org/interspeech_2024/zhang24l_interspeech.html",
-        "https://www.isca-archive.org/interspeech_2024/xiong24_interspeech.html",
-        "https://www.isca-archive.org/interspeech_2024/wan24b_interspeech.html",
-        "https://www.isca-archive.org/interspeech_2024/leung24_interspeech.html",
-        "https://www.isca-archive.org/interspeech_2024/zaheera24_interspeech.html"
-    ]
-
-    for idx, url in enumerate(sample_urls, 1):
-        print(f"正在处理 [{idx}/{len(sample_urls)}]: {url}")
-        download_pdf(url)
+    # 旧版平铺下载的PDF移入按内容寻址的存储，原文件名保留为链接
+    store = open_store(DOWNLOAD_DIR)
+    imported = store.import_dir()
+    if imported:
+        print(f"已把 {imported} 个已有PDF移入存储 {DOWNLOAD_DIR}/objects")
+    all_urls = load_urls(args.urls)
+
+    manifest = Manifest()
+    urls = all_urls if args.force else manifest.pending(MANIFEST_TASK, all_urls)
+    print(f"共 {len(all_urls)} 篇论文，跳过已完成的 {len(all_urls) - len(urls)} 篇")
+
+    cache = None if args.no_cache else HTTPCache()
+
+    if args.use_async:
+        asyncio.run(download_all_async(urls, args.concurrency, args.rate, args.burst, manifest, cache))
+    else:
+        for idx, url in enumerate(urls, 1):
+            print(f"正在处理 [{idx}/{len(urls)}]: {url}")
+            download_pdf(url, manifest, cache)
+        print(FETCHER.report())
+        METRICS.merge('fetch', FETCHER.stats)
+    print(store.report())
+    METRICS.merge('pdfstore', store.stats)
+    if args.index:
+        index = FullTextIndex(DOWNLOAD_DIR)
+        try:
+            indexed, failed = index.update()
+            print(f"全文索引: 新增 {indexed} 个，失败 {failed} 个")
+        except ImportError as e:
+            print(str(e))
+        finally:
+            index.close()
+    manifest.close()
+    if cache is not None:
+        print(cache.report())
+        METRICS.merge('cache', cache.stats)
+        cache.close()
+    metrics.finish(args)
 
     print("所有下载任务完成！")
@@ -0,0 +1,92 @@
+"""对比 CSV→DOCX 两种输出方式（stream / docx）的耗时与内存峰值
+
+用法: python bench/bench_docx.py --sizes 1000 10000 50000
+每个组合在独立子进程中运行，内存峰值取子进程的最大常驻内存（ru_maxrss），
+python-docx 的 lxml 分配不经过 tracemalloc，因此不用 tracemalloc 统计。
+"""
+import argparse
+import contextlib
+import csv
+import io
+import json
+import os
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.abspath(os.path.join(BENCH_DIR, '..'))
+sys.path.insert(0, os.path.join(ROOT, 'DownloadCite', 'ISCA'))
+sys.path.insert(0, os.path.join(ROOT, 'DownloadAbstract', 'IEEE'))
+
+WORDS = ('dysarthria speech intelligibility acoustic analysis recognition severity classification '
+         'articulatory prosody patients parkinson disease model neural network features assessment').split()
+
+
+def make_csvs(size, directory, seed=0):
+    """生成 citations.csv 与 IEEE_paper_metadata.csv 格式的合成数据"""
+    rng = random.Random(seed)
+    citations = os.path.join(directory, 'citations.csv')
+    metadata = os.path.join(directory, 'metadata.csv')
+    with open(citations, 'w', newline='', encoding='utf-8-sig') as f:
+        writer = csv.writer(f)
+        writer.writerow(['URL', 'Citation'])
+        for i in range(size):
+            title = ' '.join(rng.choices(WORDS, k=10)).capitalize()
+            writer.writerow([f'https://example.org/{i}.html',
+                             f'Author, A., Author, B. (2024) {title}. Proc. Interspeech 2024, {i}-{i + 4}'])
+    with open(metadata, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(['Title', 'Abstract', 'Keywords', 'Links', 'Citation'])
+        for i in range(size):
+            title = f'{i} ' + ' '.join(rng.choices(WORDS, k=10))
+            abstract = ' '.join(rng.choices(WORDS, k=180))
+            writer.writerow([title, abstract, '', '', ''])
+    return citations, metadata
+
+
+def child(kind, backend, csv_path, out_path):
+    """在子进程中执行一次转换并输出耗时与内存峰值"""
+    from csv_to_word import csv_to_word
+    from IEEE_csv_to_word import process_csv
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        if kind == 'isca':
+            csv_to_word(csv_path, out_path, backend)
+        else:
+            process_csv(csv_path, out_path, backend)
+    elapsed = time.perf_counter() - start
+    rss_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    print(json.dumps({'seconds': elapsed, 'rss_mb': rss_kb / 1024, 'bytes': os.path.getsize(out_path)}))
+
+
+def measure(kind, backend, csv_path, out_path):
+    output = subprocess.check_output([sys.executable, __file__, '--child', kind, backend, csv_path, out_path])
+    return json.loads(output.decode().strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 50000])
+    parser.add_argument('--backends', nargs='+', default=['docx', 'stream'])
+    parser.add_argument('--child', nargs=4, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.child:
+        child(*args.child)
+        return
+
+    print(f"{'类型':<6}{'条目数':>8}{'方式':>8}{'耗时(s)':>10}{'内存峰值(MB)':>14}{'文件(KB)':>10}")
+    for size in args.sizes:
+        with tempfile.TemporaryDirectory() as tmp:
+            citations, metadata = make_csvs(size, tmp)
+            for kind, csv_path in (('isca', citations), ('ieee', metadata)):
+                for backend in args.backends:
+                    r = measure(kind, backend, csv_path, os.path.join(tmp, f'{kind}_{backend}.docx'))
+                    print(f"{kind:<6}{size:>8}{backend:>8}{r['seconds']:>10.2f}{r['rss_mb']:>14.1f}{r['bytes'] / 1024:>10.0f}")
+
+
+if __name__ == '__main__':
+    main()
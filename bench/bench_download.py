@@ -0,0 +1,65 @@
+"""对比 isca_pdf_downloader 串行循环与异步并发模式的下载吞吐量（论文数/秒）
+
+用法: python bench/bench_download.py --papers 40 --latency 0.1 --delay 0.5
+两种模式使用相同的请求预算：串行模式每 delay 秒最多发出2个请求，
+异步模式的令牌桶速率默认取 2/delay。
+"""
+import argparse
+import asyncio
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import time
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, os.path.join(ROOT, 'DownloadPaper', 'ISCA'))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import isca_pdf_downloader as downloader
+from fixture_server import FixtureServer
+
+
+def run_serial(urls, delay):
+    downloader.REQUEST_DELAY = delay
+    start = time.perf_counter()
+    for url in urls:
+        downloader.download_pdf(url)
+    return time.perf_counter() - start
+
+
+def run_async(urls, concurrency, rate, burst):
+    start = time.perf_counter()
+    asyncio.run(downloader.download_all_async(urls, concurrency, rate, burst))
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--papers', type=int, default=40)
+    parser.add_argument('--latency', type=float, default=0.1, help="桩服务器每个请求的延迟秒数")
+    parser.add_argument('--delay', type=float, default=0.5, help="串行模式的 REQUEST_DELAY")
+    parser.add_argument('--concurrency', type=int, default=downloader.MAX_CONCURRENCY)
+    parser.add_argument('--rate', type=float, default=None, help="异步模式每秒请求数，默认 2/delay")
+    parser.add_argument('--burst', type=int, default=downloader.HOST_BURST)
+    args = parser.parse_args()
+    rate = args.rate or 2 / args.delay
+
+    with FixtureServer(latency=args.latency) as server, tempfile.TemporaryDirectory() as tmp:
+        urls = server.paper_urls(args.papers)
+        # 两种模式分别下载到各自的目录，避免后者命中前者已存储的PDF
+        with contextlib.redirect_stdout(io.StringIO()):
+            downloader.DOWNLOAD_DIR = os.path.join(tmp, 'serial')
+            serial = run_serial(urls, args.delay)
+            downloader.DOWNLOAD_DIR = os.path.join(tmp, 'async')
+            concurrent = run_async(urls, args.concurrency, rate, args.burst)
+
+    print(f"论文数: {args.papers}  延迟: {args.latency}s  请求预算: {rate:.2f} req/s")
+    print(f"串行模式: {serial:.2f}s  {args.papers / serial:.2f} 篇/秒")
+    print(f"异步模式: {concurrent:.2f}s  {args.papers / concurrent:.2f} 篇/秒")
+    print(f"加速比: {serial / concurrent:.2f}x")
+
+
+if __name__ == '__main__':
+    main()
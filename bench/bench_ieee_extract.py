@@ -0,0 +1,74 @@
+"""对比 IEEECrawler 两种提取路径的单篇论文耗时：直接HTTP解析 vs Selenium浏览器
+
+用法: python bench/bench_ieee_extract.py --papers 50 --latency 0.05
+浏览器路径需要本机装有Chrome，不可用时只测HTTP路径。
+"""
+import argparse
+import contextlib
+import io
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, os.path.join(ROOT, 'DownloadAbstract', 'IEEE'))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from ieee_dysarthria_crawler import IEEECrawler
+from miner.manifest import Manifest
+from miner.store import PaperStore
+from fixture_server import FixtureServer
+
+
+def measure(parse, paper_ids):
+    """逐篇计时，返回每篇耗时（秒）列表与失败数"""
+    timings, failures = [], 0
+    for pid in paper_ids:
+        start = time.perf_counter()
+        if parse(pid) is None:
+            failures += 1
+        timings.append(time.perf_counter() - start)
+    return timings, failures
+
+
+def report(name, timings, failures):
+    ordered = sorted(timings)
+    p95 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+    print(f"{name}: 平均 {statistics.mean(timings) * 1000:.1f}ms  p50 {statistics.median(timings) * 1000:.1f}ms  "
+          f"p95 {p95 * 1000:.1f}ms  失败 {failures}/{len(timings)}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--papers', type=int, default=50)
+    parser.add_argument('--latency', type=float, default=0.05, help="桩服务器每个请求的延迟秒数")
+    parser.add_argument('--skip-browser', action='store_true')
+    args = parser.parse_args()
+    paper_ids = [str(8512311 + i) for i in range(args.papers)]
+
+    with FixtureServer(latency=args.latency) as server, tempfile.TemporaryDirectory() as tmp:
+        manifest = Manifest(os.path.join(tmp, 'manifest.db'))
+        store = PaperStore(os.path.join(tmp, 'papers.db'))
+        # 只比较提取耗时，不按主机限速
+        crawler = IEEECrawler(manifest=manifest, base_url=server.base_url, store=store, rate=None)
+        try:
+            report("HTTP路径", *measure(crawler._parse_with_http, paper_ids))
+            if args.skip_browser:
+                return
+            try:
+                with contextlib.redirect_stdout(io.StringIO()):
+                    crawler.driver
+            except Exception as e:
+                print(f"浏览器路径: 跳过（无法启动Chrome: {type(e).__name__}）")
+                return
+            report("浏览器路径", *measure(crawler._parse_with_browser, paper_ids))
+        finally:
+            crawler.close()
+            manifest.close()
+            store.close()
+
+
+if __name__ == '__main__':
+    main()
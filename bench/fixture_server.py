@@ -0,0 +1,317 @@
+"""本地桩服务器：模拟ISCA Archive（首页、论文集目录页、论文页面与PDF）和IEEE（搜索页、搜索接口、文档页面），用于离线基准测试
+
+    python bench/fixture_server.py serve --port 8000 --latency 0.1 --error-rate 0.05 --throttle 3
+    python bench/fixture_server.py record https://www.isca-archive.org/interspeech_2024/lin24e_interspeech.html
+
+record 把真实页面保存到 fixtures/recorded/<路径>，服务器优先回放录制的页面，其余路径使用合成页面。
+error_rate 为随机返回 500/502/503 的比例；throttle 为每秒允许的请求数，超出时返回 429 和 Retry-After。
+"""
+import argparse
+import collections
+import hashlib
+import json
+import math
+import mimetypes
+import os
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+PDF_SIZE = 256 * 1024  # 桩PDF大小（字节）
+LAST_MODIFIED = 'Mon, 01 Jan 2024 00:00:00 GMT'
+ARCHIVE_SERIES = ('interspeech', 'slpat')
+ARCHIVE_YEARS = range(2019, 2024)
+ARCHIVE_PAPERS = 40  # 每个论文集的论文数，其中每5篇有1篇题目与构音障碍相关
+IEEE_RESULTS = 250  # 搜索结果总数
+IEEE_FIRST_ID = 9000000
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+RECORDED_DIR = os.path.join(FIXTURE_DIR, 'recorded')
+
+
+def load_fixture(name):
+    with open(os.path.join(FIXTURE_DIR, name), encoding='utf-8') as f:
+        return f.read()
+
+
+def make_pdf(size=PDF_SIZE):
+    """生成以 %PDF 开头的桩PDF内容"""
+    header = b'%PDF-1.4\n'
+    return header + b'0' * (size - len(header))
+
+
+def archive_index():
+    links = ''.join(f'<li><a href="{series}_{year}/index.html">{series.upper()} {year}</a></li>'
+                    for series in ARCHIVE_SERIES for year in ARCHIVE_YEARS)
+    return f'<html><body><ul>{links}</ul></body></html>'
+
+
+def proceedings_index(slug):
+    series = slug.rsplit('_', 1)[0]
+    items = []
+    for i in range(ARCHIVE_PAPERS):
+        topic = 'Dysarthric speech recognition' if i % 5 == 0 else 'Neural speech synthesis'
+        items.append(f'<a class="w3-text" href="p{i:03d}_{series}.html"><p>{topic} study {slug} {i}<br>'
+                     f'<span class="w3-text-gray">John Smith, Jane Doe</span></p></a>')
+    return f'<html><body><h2>{slug}</h2>{"".join(items)}</body></html>'
+
+
+def search_ids(page, rows, total=IEEE_RESULTS):
+    start = (page - 1) * rows
+    return [str(IEEE_FIRST_ID + i) for i in range(start, min(start + rows, total))]
+
+
+def search_results_page(page, rows):
+    """浏览器渲染后的搜索结果页面结构（xpl-results-list 下的 List-results-items）"""
+    items = ''.join(f'<div class="List-results-items" id="{pid}"><h3>Dysarthria paper {pid}</h3></div>'
+                    for pid in search_ids(page, rows))
+    return f'<html><body><xpl-results-list>{items}</xpl-results-list></body></html>'
+
+
+def recorded_path(path, directory=RECORDED_DIR):
+    """URL路径对应的录制文件，目录形式的路径保存为 index.html"""
+    path = path.lstrip('/')
+    if not path or path.endswith('/'):
+        path += 'index.html'
+    return os.path.join(directory, *path.split('/'))
+
+
+def record(urls, directory=RECORDED_DIR):
+    """下载真实页面保存为录制文件，返回保存的文件列表"""
+    import requests
+    saved = []
+    for url in urls:
+        response = requests.get(url, timeout=30, headers={'User-Agent': 'Mozilla/5.0'})
+        response.raise_for_status()
+        target = recorded_path(urlparse(url).path, directory)
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        with open(target, 'wb') as f:
+            f.write(response.content)
+        saved.append(target)
+    return saved
+
+
+class Throttle:
+    """服务器端的令牌桶：每秒 rate 个请求，超出时返回需要等待的秒数"""
+
+    def __init__(self, rate, burst=None):
+        self.rate = rate
+        self.capacity = burst or max(1.0, rate)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def take(self):
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return 0.0
+            return (1 - self.tokens) / self.rate
+
+
+class FixtureHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        pass
+
+    def _count(self, key):
+        # 处理线程并发更新计数
+        with self.server.lock:
+            self.server.stats[key] += 1
+
+    def _send(self, status, body, content_type, etag=None, headers=None):
+        self._count(status)
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        if etag:
+            self.send_header('ETag', etag)
+            self.send_header('Last-Modified', LAST_MODIFIED)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_cacheable(self, body, content_type):
+        """带 ETag 的响应，条件请求匹配时返回304"""
+        etag = '"' + hashlib.md5(body).hexdigest() + '"'
+        if self.headers.get('If-None-Match') == etag:
+            self._count(304)
+            self.send_response(304)
+            self.send_header('ETag', etag)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+        self._send(200, body, content_type, etag)
+
+    def _fault(self):
+        """按配置注入限流与服务器错误，已发送错误响应时返回True"""
+        server = self.server
+        if server.throttle is not None:
+            wait = server.throttle.take()
+            if wait > 0:
+                retry_after = f'{math.ceil(wait * 10) / 10:.1f}'
+                self._send(429, b'too many requests', 'text/plain', headers={'Retry-After': retry_after})
+                return True
+        if server.error_rate:
+            with server.lock:
+                fail = server.rng.random() < server.error_rate
+                status = server.rng.choice((500, 502, 503))
+            if fail:
+                self._send(status, b'server error', 'text/plain')
+                return True
+        return False
+
+    def _replay(self, path):
+        """回放录制的页面，没有录制文件时返回False"""
+        target = recorded_path(path, self.server.recorded_dir)
+        if not os.path.isfile(target):
+            return False
+        with open(target, 'rb') as f:
+            body = f.read()
+        content_type = mimetypes.guess_type(target)[0] or 'application/octet-stream'
+        if content_type.startswith('text/'):
+            content_type += '; charset=utf-8'
+        self._send_cacheable(body, content_type)
+        return True
+
+    def do_GET(self):
+        time.sleep(self.server.latency)
+        self._count('requests')
+        if self._fault():
+            return
+        url = urlparse(self.path)
+        path = url.path
+        if self._replay(path):
+            return
+        if path.startswith('/paper/') and path.endswith('.html'):
+            name = path.rsplit('/', 1)[-1][:-len('.html')]
+            html = self.server.isca_page.replace('__NAME__', name)
+            self._send_cacheable(html.encode('utf-8'), 'text/html; charset=utf-8')
+        elif path.startswith('/document/'):
+            paper_id = path.rstrip('/').rsplit('/', 1)[-1]
+            html = self.server.ieee_document.replace('__PAPER_ID__', paper_id)
+            self._send_cacheable(html.encode('utf-8'), 'text/html; charset=utf-8')
+        elif path == '/search/searchresult.jsp':
+            query = parse_qs(url.query)
+            page = int(query.get('pageNumber', ['1'])[0])
+            rows = int(query.get('rowsPerPage', ['100'])[0])
+            self._send(200, search_results_page(page, rows).encode('utf-8'), 'text/html; charset=utf-8')
+        elif path.startswith('/pdf/') and path.endswith('.pdf'):
+            self._send(200, self.server.pdf_body, 'application/pdf')
+        elif path in ('/', '/index.html'):
+            self._send_cacheable(archive_index().encode('utf-8'), 'text/html; charset=utf-8')
+        elif path.endswith('/index.html'):
+            self._send_cacheable(proceedings_index(path.strip('/').split('/')[0]).encode('utf-8'),
+                                 'text/html; charset=utf-8')
+        elif path.endswith('.html') and path.count('/') == 2:
+            # 论文集中的论文页面：/<会议>_<年份>/<名称>.html
+            name = path.strip('/').replace('/', '_')[:-len('.html')]
+            html = self.server.isca_page.replace('__NAME__', name)
+            self._send_cacheable(html.encode('utf-8'), 'text/html; charset=utf-8')
+        else:
+            self._send(404, b'not found', 'text/plain')
+
+    def do_POST(self):
+        time.sleep(self.server.latency)
+        self._count('requests')
+        length = int(self.headers.get('Content-Length') or 0)
+        body = self.rfile.read(length) if length else b''
+        if self._fault():
+            return
+        if urlparse(self.path).path == '/rest/search':
+            payload = json.loads(body or b'{}')
+            page, rows = int(payload.get('pageNumber', 1)), int(payload.get('rowsPerPage', 100))
+            records = [{'articleNumber': pid, 'articleTitle': f'Dysarthria paper {pid}'}
+                       for pid in search_ids(page, rows)]
+            data = {'totalRecords': IEEE_RESULTS, 'records': records}
+            self._send(200, json.dumps(data).encode('utf-8'), 'application/json')
+        else:
+            self._send(404, b'not found', 'text/plain')
+
+
+class FixtureServer:
+    """在后台线程中运行的桩服务器
+
+    latency 为每个请求的模拟延迟秒数，error_rate 为随机服务器错误的比例，
+    throttle 为每秒允许的请求数（None 不限流），stats 统计各状态码的响应数。
+    """
+
+    def __init__(self, latency=0.05, pdf_size=PDF_SIZE, host='127.0.0.1', port=0, error_rate=0.0, throttle=None,
+                 seed=0, recorded_dir=RECORDED_DIR):
+        self.httpd = ThreadingHTTPServer((host, port), FixtureHandler)
+        self.httpd.daemon_threads = True
+        self.httpd.latency = latency
+        self.httpd.error_rate = error_rate
+        self.httpd.throttle = Throttle(throttle) if throttle else None
+        self.httpd.rng = random.Random(seed)
+        self.httpd.lock = threading.Lock()
+        self.httpd.stats = collections.Counter()
+        self.httpd.recorded_dir = recorded_dir
+        self.httpd.pdf_body = make_pdf(pdf_size)
+        self.httpd.ieee_document = load_fixture('ieee_document.html')
+        self.httpd.isca_page = load_fixture('isca_paper.html')
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    @property
+    def base_url(self):
+        host, port = self.httpd.server_address[:2]
+        return f'http://{host}:{port}'
+
+    @property
+    def stats(self):
+        """各状态码响应数的快照"""
+        with self.httpd.lock:
+            return collections.Counter(self.httpd.stats)
+
+    def paper_urls(self, count):
+        return [f'{self.base_url}/paper/paper{i:04d}.html' for i in range(count)]
+
+    def ieee_ids(self, count):
+        return [str(IEEE_FIRST_ID + i) for i in range(count)]
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="ISCA / IEEE 桩服务器")
+    commands = parser.add_subparsers(dest='command', required=True)
+    serve = commands.add_parser('serve', help="在前台运行桩服务器")
+    serve.add_argument('--host', default='127.0.0.1')
+    serve.add_argument('--port', type=int, default=8000)
+    serve.add_argument('--latency', type=float, default=0.05, help="每个请求的延迟秒数")
+    serve.add_argument('--error-rate', type=float, default=0.0, help="随机返回 5xx 的比例")
+    serve.add_argument('--throttle', type=float, default=None, help="每秒允许的请求数，超出返回429")
+    rec = commands.add_parser('record', help="录制真实页面供回放")
+    rec.add_argument('urls', nargs='+')
+    args = parser.parse_args()
+
+    if args.command == 'record':
+        for path in record(args.urls):
+            print(f"已保存 {path}")
+        return
+    with FixtureServer(args.latency, host=args.host, port=args.port, error_rate=args.error_rate,
+                       throttle=args.throttle) as server:
+        print(f"桩服务器运行于 {server.base_url}，Ctrl+C 退出")
+        try:
+            while True:
+                time.sleep(1)
+        except KeyboardInterrupt:
+            pass
+        print(f"响应统计: {dict(server.stats)}")
+
+
+if __name__ == '__main__':
+    main()
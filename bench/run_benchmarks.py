@@ -0,0 +1,231 @@
+"""端到端基准测试：对桩服务器运行各爬虫与导出脚本，报告吞吐量、延迟分位数与内存峰值
+
+用法: python bench/run_benchmarks.py --papers 40 --latency 0.05 --error-rate 0.05 --throttle 3
+      python bench/run_benchmarks.py --workloads ieee docx_ieee --json results.json
+
+每个负载在独立子进程和临时工作目录中运行，内存峰值取子进程的最大常驻内存（ru_maxrss），
+延迟取该负载主要阶段的 span 耗时（见 miner.metrics）。服务器端的注入错误与限流对所有负载相同，
+表中的 429 / 5xx 列为该负载期间服务器实际返回的次数，表后汇总全部负载的次数。
+失败列为负载自身记录的失败条目数，缺失列为应处理条目数（--papers 或 --entries）减去完成数；
+有负载缺失条目时打印警告并以非零状态退出。
+异步PDF下载与各爬虫按 --rate（默认 2/delay 即每秒4个请求）限速，服务器限流不低于该值时不会返回429，
+因此 --throttle 默认取 --rate 的 3/4，0 表示不限流。
+引用抓取需要本机装有Chrome，找不到时跳过。
+"""
+import argparse
+import asyncio
+import collections
+import contextlib
+import csv
+import io
+import json
+import os
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.abspath(os.path.join(BENCH_DIR, '..'))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, BENCH_DIR)
+
+from fixture_server import FixtureServer
+from miner.metrics import METRICS, percentile
+
+WORKLOADS = ('pdf_serial', 'pdf_async', 'ieee', 'citation', 'docx_cite', 'docx_ieee')
+# 每个负载用于统计单条延迟的阶段
+STAGES = {
+    'pdf_serial': 'pdf.download',
+    'pdf_async': 'pdf.download',
+    'ieee': 'ieee.paper',
+    'citation': 'citation.page_load',
+    'docx_cite': 'docx.export',
+    'docx_ieee': 'docx.export',
+}
+# 每个负载记录失败条目的计数器（DOCX导出没有）
+FAILURES = {
+    'pdf_serial': 'pdf_failed',
+    'pdf_async': 'pdf_failed',
+    'ieee': 'ieee_failed',
+    'citation': 'citations_failed',
+}
+CHROME_BINARIES = ('google-chrome', 'google-chrome-stable', 'chromium', 'chromium-browser', 'chrome')
+
+
+def run_pdf_serial(server, params):
+    sys.path.insert(0, os.path.join(ROOT, 'DownloadPaper', 'ISCA'))
+    import isca_pdf_downloader as downloader
+    downloader.DOWNLOAD_DIR = 'paper_pdfs'
+    downloader.REQUEST_DELAY = params['delay']
+    downloader.setup_download_dir()
+    for url in server['paper_urls']:
+        downloader.download_pdf(url)
+    return METRICS.counters['pdf_downloaded']
+
+
+def run_pdf_async(server, params):
+    sys.path.insert(0, os.path.join(ROOT, 'DownloadPaper', 'ISCA'))
+    import isca_pdf_downloader as downloader
+    downloader.DOWNLOAD_DIR = 'paper_pdfs'
+    downloader.setup_download_dir()
+    return asyncio.run(downloader.download_all_async(server['paper_urls'], params['workers'],
+                                                     params['rate'], params['burst']))
+
+
+def run_ieee(server, params):
+    sys.path.insert(0, os.path.join(ROOT, 'DownloadAbstract', 'IEEE'))
+    from ieee_dysarthria_crawler import IEEECrawler, PAPER_IDS_CSV
+    from miner.manifest import Manifest
+    from miner.store import PaperStore
+    with open(PAPER_IDS_CSV, 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(['PaperID'])
+        writer.writerows([pid] for pid in server['ieee_ids'])
+    manifest, store = Manifest('manifest.db'), PaperStore('papers.db')
+    crawler = IEEECrawler(manifest=manifest, base_url=server['base_url'], workers=params['workers'],
+                          headless=True, store=store, rate=params['rate'], burst=params['burst'])
+    try:
+        crawler.crawl_metadata()
+    finally:
+        crawler.close()
+        manifest.close()
+        store.close()
+    return METRICS.counters['ieee_papers']
+
+
+def run_citation(server, params):
+    sys.path.insert(0, os.path.join(ROOT, 'DownloadCite', 'ISCA'))
+    from isca_dysarthria_crawler import CitationScraper
+    from miner.manifest import Manifest
+    from miner.store import PaperStore
+    manifest, store = Manifest('manifest.db'), PaperStore('papers.db')
+    scraper = CitationScraper(manifest=manifest, workers=params['workers'], headless=True, store=store,
+                              rate=params['rate'], burst=params['burst'])
+    try:
+        scraper.scrape(server['paper_urls'])
+    finally:
+        manifest.close()
+        store.close()
+    return METRICS.counters['citations_fetched']
+
+
+def _csvs(params):
+    from bench_docx import make_csvs
+    return make_csvs(params['entries'], '.')
+
+
+def run_docx_cite(server, params):
+    sys.path.insert(0, os.path.join(ROOT, 'DownloadCite', 'ISCA'))
+    from csv_to_word import csv_to_word
+    citations, _ = _csvs(params)
+    csv_to_word(citations, 'citations.docx', params['backend'])
+    return METRICS.counters['docx_entries']
+
+
+def run_docx_ieee(server, params):
+    sys.path.insert(0, os.path.join(ROOT, 'DownloadAbstract', 'IEEE'))
+    from IEEE_csv_to_word import process_csv
+    _, metadata = _csvs(params)
+    process_csv(metadata, 'metadata.docx', params['backend'])
+    return METRICS.counters['docx_entries']
+
+
+RUNNERS = {name: globals()[f'run_{name}'] for name in WORKLOADS}
+
+
+def child(name, server, params):
+    """在子进程中运行一个负载，输出完成与失败条目数、耗时、延迟分位数与内存峰值"""
+    METRICS.reset()
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        items = RUNNERS[name](server, params)
+    elapsed = time.perf_counter() - start
+    latencies = METRICS.durations(STAGES[name])
+    rss_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    failed = METRICS.counters[FAILURES[name]] if name in FAILURES else 0
+    print(json.dumps({'items': items, 'failed': failed, 'seconds': elapsed, 'p50': percentile(latencies, 0.5),
+                      'p95': percentile(latencies, 0.95), 'rss_mb': rss_kb / 1024}))
+
+
+def measure(name, server, params):
+    with tempfile.TemporaryDirectory() as tmp:
+        output = subprocess.check_output([sys.executable, os.path.abspath(__file__), '--child', name,
+                                          json.dumps(server), json.dumps(params)], cwd=tmp)
+    return json.loads(output.decode().strip().splitlines()[-1])
+
+
+def chrome_available():
+    return any(shutil.which(binary) for binary in CHROME_BINARIES)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--workloads', nargs='+', choices=WORKLOADS, default=list(WORKLOADS))
+    parser.add_argument('--papers', type=int, default=40, help="ISCA论文页面与IEEE文档的数量")
+    parser.add_argument('--entries', type=int, default=5000, help="DOCX导出的CSV条目数")
+    parser.add_argument('--backend', choices=['stream', 'docx'], default='stream', help="DOCX导出方式")
+    parser.add_argument('--latency', type=float, default=0.05, help="桩服务器每个请求的延迟秒数")
+    parser.add_argument('--error-rate', type=float, default=0.0, help="桩服务器随机返回 5xx 的比例")
+    parser.add_argument('--throttle', type=float, default=None, help="桩服务器每秒允许的请求数，超出返回429；默认 rate 的 3/4，0 不限流")
+    parser.add_argument('--workers', type=int, default=8, help="并发负载的工作线程数")
+    parser.add_argument('--delay', type=float, default=0.5, help="串行PDF下载的 REQUEST_DELAY")
+    parser.add_argument('--rate', type=float, default=None, help="异步PDF下载与爬虫每个主机每秒请求数，默认 2/delay")
+    parser.add_argument('--burst', type=int, default=2)
+    parser.add_argument('--json', default=None, help="把结果写入该JSON文件")
+    parser.add_argument('--child', nargs=3, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.child:
+        name, server, params = args.child
+        child(name, json.loads(server), json.loads(params))
+        return
+
+    params = {'workers': args.workers, 'delay': args.delay, 'rate': args.rate or 2 / args.delay,
+              'burst': args.burst, 'entries': args.entries, 'backend': args.backend}
+    throttle = args.throttle if args.throttle is not None else params['rate'] * 0.75
+    results = {}
+    print(f"{'负载':<12}{'条目':>8}{'失败':>6}{'缺失':>6}{'耗时(s)':>10}{'条目/秒':>10}{'p50(ms)':>10}"
+          f"{'p95(ms)':>10}{'内存峰值(MB)':>14}{'429':>6}{'5xx':>6}")
+    with FixtureServer(latency=args.latency, error_rate=args.error_rate, throttle=throttle or None) as server:
+        info = {'base_url': server.base_url, 'paper_urls': server.paper_urls(args.papers),
+                'ieee_ids': server.ieee_ids(args.papers)}
+        for name in args.workloads:
+            if name == 'citation' and not chrome_available():
+                print(f"{name:<12}跳过（未找到Chrome）")
+                continue
+            before = collections.Counter(server.stats)
+            r = measure(name, info, params)
+            served = server.stats - before
+            r['expected'] = args.entries if name.startswith('docx') else args.papers
+            r['missing'] = max(0, r['expected'] - r['items'])
+            r['throttled'] = served[429]
+            r['server_errors'] = sum(count for status, count in served.items() if isinstance(status, int)
+                                     and status >= 500)
+            results[name] = r
+            print(f"{name:<12}{r['items']:>8}{r['failed']:>6}{r['missing']:>6}{r['seconds']:>10.2f}"
+                  f"{r['items'] / r['seconds']:>10.2f}{r['p50'] * 1000:>10.1f}{r['p95'] * 1000:>10.1f}"
+                  f"{r['rss_mb']:>14.1f}{r['throttled']:>6}{r['server_errors']:>6}")
+
+    totals = {'throttle': throttle or None, 'throttled': sum(r['throttled'] for r in results.values()),
+              'server_errors': sum(r['server_errors'] for r in results.values())}
+    limit = f"限流 {throttle:g} 请求/秒" if throttle else "未限流"
+    print(f"服务器共返回 429 {totals['throttled']} 次、5xx {totals['server_errors']} 次（{limit}）")
+    if throttle and results and not totals['throttled']:
+        print(f"警告: 限流 {throttle:g} 请求/秒未触发任何429，请调低 --throttle")
+    incomplete = [name for name, r in results.items() if r['missing']]
+    for name in incomplete:
+        r = results[name]
+        print(f"警告: {name} 只完成 {r['items']}/{r['expected']} 条（失败 {r['failed']}），吞吐量不可与完整运行比较")
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump({'options': vars(args), 'totals': totals, 'results': results}, f, ensure_ascii=False,
+                      indent=2)
+    if incomplete:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1 @@
+"""DysarthriaMiner 各爬虫脚本共用的基础模块"""
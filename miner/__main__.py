@@ -0,0 +1,265 @@
+"""命令行入口：python -m miner <子命令>
+
+    python -m miner sources                              # 列出可用的数据源与导出器
+    python -m miner discover isca --output urls.txt      # 遍历ISCA Archive，输出与构音障碍相关的论文页面
+    python -m miner crawl isca                           # 自动发现论文，每个页面只请求一次，同时导出引用、PDF与元数据
+    python -m miner crawl isca --exporters citations,metadata --workers 4
+    python -m miner crawl ieee --query Dysarthria --pages 1-5
+    python -m miner blobs paper_pdfs --import            # 把平铺下载的PDF移入按内容寻址的存储并查看统计
+    python -m miner fulltext index paper_pdfs            # 多进程提取新PDF的正文，更新全文索引
+    python -m miner fulltext search intelligibility      # 检索题目、摘要与正文
+    python -m miner store import ieee IEEE_paper_metadata.csv   # 把已有CSV导入统一的元数据库
+    python -m miner store stats
+    python -m miner citations citations.csv --bibtex refs.bib   # 把引用文本解析为结构化字段，输出BibTeX
+"""
+import argparse
+import contextlib
+import sys
+
+from requests.adapters import HTTPAdapter
+
+from miner import citations
+from miner.blobstore import BlobStore
+from miner.fetch import DEFAULT_HEADERS, Fetcher
+from miner.fulltext import FullTextIndex
+from miner.httpcache import DEFAULT_CACHE, HTTPCache
+from miner.manifest import DEFAULT_MANIFEST, Manifest
+from miner.pipeline import EXPORTERS, SOURCES, Scheduler
+from miner.pipeline import discovery
+from miner.store import DEFAULT_STORE, SOURCES as STORE_SOURCES, PaperStore
+from miner import metrics
+from miner.metrics import METRICS
+
+REQUEST_TIMEOUT = 30
+HOST_RATE = 1.0  # 每个主机每秒允许的请求数
+HOST_BURST = 2  # 每个主机允许的突发请求数
+
+
+def run_sources(args):
+    print("数据源:")
+    for name, cls in SOURCES.items():
+        print(f"  {name:10} {cls.__doc__}  默认导出: {','.join(cls.default_exporters)}")
+    print("导出器:")
+    for name, cls in EXPORTERS.items():
+        print(f"  {name:10} {cls.__doc__}")
+
+
+def _make_fetcher(args):
+    fetcher = Fetcher(headers=DEFAULT_HEADERS, timeout=REQUEST_TIMEOUT, rate=args.rate, burst=args.burst,
+                      concurrency=args.workers, max_concurrency=args.workers)
+    adapter = HTTPAdapter(pool_maxsize=args.workers)
+    fetcher.session.mount('https://', adapter)
+    fetcher.session.mount('http://', adapter)
+    return fetcher
+
+
+def _add_common_arguments(parser):
+    parser.add_argument('--workers', type=int, default=8, help="并行抓取的工作线程数")
+    parser.add_argument('--rate', type=float, default=HOST_RATE, help="每个主机每秒请求数")
+    parser.add_argument('--burst', type=int, default=HOST_BURST, help="每个主机突发请求数")
+    parser.add_argument('--no-cache', action='store_true', help="不使用本地HTTP缓存")
+    parser.add_argument('--cache', default=DEFAULT_CACHE, help="HTTP缓存数据库路径")
+    parser.add_argument('--manifest', default=DEFAULT_MANIFEST, help="下载清单数据库路径")
+    metrics.add_arguments(parser)
+
+
+@contextlib.contextmanager
+def _resources(args):
+    """创建抓取器、HTTP缓存与下载清单，结束时关闭并输出统计与指标"""
+    metrics.start(args)
+    fetcher = _make_fetcher(args)
+    cache = None if args.no_cache else HTTPCache(args.cache)
+    manifest = Manifest(args.manifest)
+    try:
+        yield fetcher, cache, manifest
+    finally:
+        print(fetcher.report())
+        METRICS.merge('fetch', fetcher.stats)
+        fetcher.close()
+        if cache is not None:
+            print(cache.report())
+            METRICS.merge('cache', cache.stats)
+            cache.close()
+        manifest.close()
+        metrics.finish(args)
+
+
+def run_discover(args):
+    with _resources(args) as (fetcher, cache, manifest), open(args.output, 'w', encoding='utf-8') as out:
+        for url in discovery.ISCADiscovery.from_options(args, fetcher, manifest, cache).discover():
+            out.write(url + '\n')
+            out.flush()
+
+
+def run_crawl(args):
+    source = SOURCES[args.source](args)
+    names = [name for name in args.exporters.split(',') if name]
+    unknown = [name for name in names if name not in EXPORTERS]
+    if unknown:
+        sys.exit(f"未知的导出器: {', '.join(unknown)}")
+
+    with _resources(args) as (fetcher, cache, manifest):
+        exporters = [EXPORTERS[name](source, args) for name in names]
+        Scheduler(fetcher, manifest, cache, args.workers, args.queue_size).run(source, exporters, args.force)
+
+
+def run_blobs(args):
+    store = BlobStore(args.dir)
+    try:
+        if args.do_import:
+            print(f"导入 {store.import_dir()} 个文件")
+        s = store.summary()
+        print(f"{args.dir}: {s['blobs']} 个文件, {s['bytes'] / 1024 / 1024:.1f} MB, {s['refs']} 个链接/论文")
+    finally:
+        store.close()
+
+
+def run_fulltext_index(args):
+    metrics.start(args)
+    index = FullTextIndex(args.dir)
+    try:
+        indexed, failed = index.update(args.workers, args.retry_failed)
+        s = index.summary()
+        print(f"本次索引 {indexed} 个，失败 {failed} 个；索引中共 {s['documents']} 个文档")
+    except ImportError as e:
+        sys.exit(str(e))
+    finally:
+        index.close()
+    metrics.finish(args)
+
+
+def run_fulltext_search(args):
+    index = FullTextIndex(args.dir)
+    try:
+        results = index.search(args.query, args.limit)
+    finally:
+        index.close()
+    for name, title, snippet, url in results:
+        print(f"{name}  {title}")
+        if url:
+            print(f"    {url}")
+        print(f"    {snippet}")
+    print(f"共 {len(results)} 条结果")
+
+
+def run_store_import(args):
+    store = PaperStore(args.store)
+    try:
+        for path in args.csv:
+            total, changed = store.import_csv(args.source, path)
+            print(f"{path}: 读取 {total} 条，新增或更新 {changed} 条")
+    finally:
+        store.close()
+
+
+def run_store_stats(args):
+    store = PaperStore(args.store)
+    try:
+        for row in store.summary():
+            print(f"{row['source']:6} {row['papers']} 篇, 年份 {row['first'] or '-'}~{row['last'] or '-'}")
+    finally:
+        store.close()
+
+
+def run_citations(args):
+    records, malformed = [], []
+    for path in args.csv:
+        try:
+            parsed, bad, elapsed = citations.parse_csv(path, args.column, args.key_column)
+        except ValueError as e:
+            sys.exit(str(e))
+        total = len(parsed) + len(bad)
+        print(f"{path}: 解析 {len(parsed)}/{total} 条，格式错误 {len(bad)} 条，"
+              f"{total / elapsed if elapsed else 0:.0f} 条/秒")
+        records += parsed
+        malformed += bad
+    if args.output:
+        citations.write_records(records, args.output)
+        print(f"结构化字段已写入 {args.output}")
+    if args.bibtex:
+        citations.write_bibtex(records, args.bibtex)
+        print(f"BibTeX 已写入 {args.bibtex}")
+    if malformed:
+        if args.report:
+            citations.write_report(malformed, args.report)
+            print(f"格式错误的记录已写入 {args.report}")
+        else:
+            for key, reason, citation in malformed[:10]:
+                print(f"  {key}: {reason} - {citation[:80]}")
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog='python -m miner', description="DysarthriaMiner 统一命令行")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    commands.add_parser('sources', help="列出可用的数据源与导出器").set_defaults(func=run_sources)
+
+    discover = commands.add_parser('discover', help="只运行发现阶段，输出论文页面URL列表")
+    by_source = discover.add_subparsers(dest='source', required=True)
+    isca = by_source.add_parser('isca', help="遍历ISCA Archive目录页，按关键词筛选论文")
+    isca.add_argument('--output', required=True, help="URL列表输出文件，可作为各脚本的 --urls")
+    discovery.add_arguments(isca)
+    _add_common_arguments(isca)
+    isca.set_defaults(func=run_discover)
+
+    crawl = commands.add_parser('crawl', help="运行抓取流水线 discover → fetch → parse → export")
+    by_source = crawl.add_subparsers(dest='source', required=True)
+    for name, cls in SOURCES.items():
+        sub = by_source.add_parser(name, help=cls.__doc__)
+        sub.add_argument('--exporters', default=','.join(cls.default_exporters),
+                         help=f"逗号分隔的导出器（可选: {','.join(EXPORTERS)}）")
+        sub.add_argument('--out-dir', default='.', help="导出文件所在目录")
+        sub.add_argument('--queue-size', type=int, default=None, help="待处理条目队列的容量")
+        sub.add_argument('--force', action='store_true', help="忽略下载清单，重新处理全部条目")
+        sub.add_argument('--store', default=DEFAULT_STORE, help="store 导出器写入的元数据库路径")
+        _add_common_arguments(sub)
+        cls.add_arguments(sub)
+        sub.set_defaults(func=run_crawl)
+
+    blobs = commands.add_parser('blobs', help="PDF存储的统计与旧文件导入")
+    blobs.add_argument('dir', nargs='?', default='paper_pdfs', help="PDF下载目录")
+    blobs.add_argument('--import', dest='do_import', action='store_true', help="把目录中平铺的PDF移入存储")
+    blobs.set_defaults(func=run_blobs)
+
+    fulltext = commands.add_parser('fulltext', help="PDF全文索引与检索")
+    actions = fulltext.add_subparsers(dest='action', required=True)
+    index = actions.add_parser('index', help="提取新PDF的正文与首页元数据并写入全文索引")
+    index.add_argument('dir', nargs='?', default='paper_pdfs', help="PDF下载目录")
+    index.add_argument('--workers', type=int, default=None, help="提取进程数，默认为CPU核数")
+    index.add_argument('--retry-failed', action='store_true', help="重新提取上次失败的文件")
+    metrics.add_arguments(index)
+    index.set_defaults(func=run_fulltext_index)
+    search = actions.add_parser('search', help="检索全文索引（FTS5 语法）")
+    search.add_argument('query')
+    search.add_argument('--dir', default='paper_pdfs', help="PDF下载目录")
+    search.add_argument('--limit', type=int, default=20)
+    search.set_defaults(func=run_fulltext_search)
+
+    store = commands.add_parser('store', help="统一的论文元数据库")
+    actions = store.add_subparsers(dest='action', required=True)
+    importer = actions.add_parser('import', help="导入已有的元数据或引用CSV")
+    importer.add_argument('source', choices=STORE_SOURCES)
+    importer.add_argument('csv', nargs='+', help="IEEE_paper_metadata.csv / citations.csv / isca_paper_metadata.csv")
+    importer.set_defaults(func=run_store_import)
+    actions.add_parser('stats', help="各数据源的论文数与年份范围").set_defaults(func=run_store_stats)
+    for sub in (importer, actions.choices['stats']):
+        sub.add_argument('--store', default=DEFAULT_STORE, help="元数据库路径")
+
+    cite = commands.add_parser('citations', help="把IEEE/ISCA引用文本解析为作者、题目、会议、年份、页码与DOI")
+    cite.add_argument('csv', nargs='+', help="含引用列的CSV，如 citations.csv / IEEE_paper_metadata.csv")
+    cite.add_argument('--column', default='Citation', help="引用文本所在的列")
+    cite.add_argument('--key-column', default=None, help="条目键所在的列，默认取 URL 或 Links 列")
+    cite.add_argument('--output', default=None, help="结构化字段输出CSV")
+    cite.add_argument('--bibtex', default=None, help="BibTeX 输出文件")
+    cite.add_argument('--report', default=None, help="格式错误记录的输出CSV，默认只打印前10条")
+    cite.set_defaults(func=run_citations)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    args.func(args)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,232 @@
+"""按内容寻址的PDF存储：文件以SHA-256命名分片存放，相同内容只保存一份
+
+    paper_pdfs/
+        objects/3f/a2/3fa2...e1.pdf    # 实际文件，按哈希前两级分片
+        index.db                       # 论文URL → 文件哈希、可读文件名
+        lin24e_interspeech.pdf         # 指向 objects 中文件的符号链接
+
+下载前按URL查询索引即可判断文件是否已存在；可读文件名冲突但内容不同时加哈希后缀，
+不会覆盖已有文件。不支持符号链接的文件系统退回硬链接，仍不行时只在索引中记录文件名。
+打开存储时清理进程崩溃或被终止后残留在 .partial 中的临时文件。
+"""
+import collections
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime, timezone
+
+OBJECTS_DIR = 'objects'
+INDEX_NAME = 'index.db'
+PARTIAL_DIR = '.partial'
+HASH_CHUNK = 1024 * 1024
+STALE_PARTIAL_AGE = 3600  # .partial 中超过该秒数未修改的临时文件视为残留（其他进程正在写的文件不受影响）
+IMPORT_SUFFIX = '.import'
+
+_SCHEMA = '''
+CREATE TABLE IF NOT EXISTS blobs (
+    sha256 TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    created_at TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS refs (
+    key TEXT PRIMARY KEY,
+    sha256 TEXT NOT NULL,
+    name TEXT NOT NULL,
+    etag TEXT,
+    last_modified TEXT,
+    updated_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_refs_sha256 ON refs (sha256);
+CREATE INDEX IF NOT EXISTS idx_refs_name ON refs (name);
+'''
+
+_stores = {}
+_stores_lock = threading.Lock()
+
+
+def _now():
+    return datetime.now(timezone.utc).isoformat(timespec='seconds')
+
+
+def sha256_file(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class BlobStore:
+    """root 目录下的内容寻址存储，key 一般为PDF链接
+
+    多个线程或进程可以同时写入：文件先写到 .partial 再原子重命名，
+    同一内容被并发写入时结果相同。写入与命中情况记录在 stats 计数器中。
+    """
+
+    def __init__(self, root, suffix='.pdf'):
+        self.root = root
+        self.suffix = suffix
+        self.partial_dir = os.path.join(root, PARTIAL_DIR)
+        self.stats = collections.Counter()
+        self._stats_lock = threading.Lock()
+        os.makedirs(self.partial_dir, exist_ok=True)
+        self._lock = threading.Lock()
+        self.clean_partials()
+        self._conn = sqlite3.connect(os.path.join(root, INDEX_NAME), check_same_thread=False, timeout=30)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.executescript(_SCHEMA)
+
+    def _count(self, name, n=1):
+        with self._stats_lock:
+            self.stats[name] += n
+
+    def clean_partials(self, max_age=STALE_PARTIAL_AGE):
+        """删除残留的下载临时文件与链接；导入中断的原文件移回原位，返回清理数量"""
+        cutoff = time.time() - max_age
+        removed = 0
+        for entry in os.scandir(self.partial_dir):
+            try:
+                if not entry.is_file(follow_symlinks=False) and not entry.is_symlink():
+                    continue
+                if entry.stat(follow_symlinks=False).st_mtime > cutoff:
+                    continue
+                original = os.path.join(self.root, entry.name[:-len(IMPORT_SUFFIX)])
+                if entry.name.endswith(IMPORT_SUFFIX) and not os.path.lexists(original):
+                    os.replace(entry.path, original)
+                else:
+                    os.remove(entry.path)
+                removed += 1
+            except FileNotFoundError:
+                continue  # 其他进程同时清理
+        self._count('partials_removed', removed)
+        return removed
+
+    def object_path(self, sha256):
+        return os.path.join(self.root, OBJECTS_DIR, sha256[:2], sha256[2:4], sha256 + self.suffix)
+
+    def has(self, sha256):
+        return os.path.exists(self.object_path(sha256))
+
+    def _info(self, row):
+        key, sha256, name, etag, last_modified, size = row
+        return {'path': os.path.join(self.root, name), 'blob': self.object_path(sha256), 'size': size,
+                'sha256': sha256, 'etag': etag, 'last_modified': last_modified}
+
+    def lookup(self, key):
+        """已存储的条目信息（与 add 的返回值相同），不存在或文件已被删除时返回None"""
+        with self._lock:
+            row = self._conn.execute('''
+                SELECT r.key, r.sha256, r.name, r.etag, r.last_modified, b.size
+                FROM refs r JOIN blobs b ON b.sha256 = r.sha256 WHERE r.key = ?
+            ''', (key,)).fetchone()
+        if row is None or not self.has(row[1]):
+            return None
+        self._count('hits')
+        return self._info(row)
+
+    def add(self, tmp_path, sha256, size, key, name, etag=None, last_modified=None):
+        """把已校验的临时文件移入存储并建立 key → 文件 的索引与可读文件名
+
+        内容已存在时删除临时文件。返回包含可读路径、实际文件路径、大小、哈希与缓存校验头的字典。
+        """
+        blob = self.object_path(sha256)
+        if os.path.exists(blob):
+            os.remove(tmp_path)
+            self._count('deduplicated')
+        else:
+            os.makedirs(os.path.dirname(blob), exist_ok=True)
+            os.replace(tmp_path, blob)
+            self._count('stored')
+
+        with self._lock:
+            name = self._claim_name(name or sha256[:16] + self.suffix, sha256, key)
+            now = _now()
+            self._conn.execute('INSERT OR IGNORE INTO blobs (sha256, size, created_at) VALUES (?, ?, ?)',
+                               (sha256, size, now))
+            self._conn.execute('''
+                INSERT OR REPLACE INTO refs (key, sha256, name, etag, last_modified, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?)
+            ''', (key, sha256, name, etag, last_modified, now))
+            self._conn.commit()
+        self._link(name, sha256)
+        return self._info((key, sha256, name, etag, last_modified, size))
+
+    def _claim_name(self, name, sha256, key):
+        """可读文件名已被其他内容占用时加哈希后缀，同一内容共用一个文件名"""
+        owner = self._conn.execute('SELECT sha256 FROM refs WHERE name = ? AND key != ? LIMIT 1',
+                                   (name, key)).fetchone()
+        path = os.path.join(self.root, name)
+        taken = owner[0] != sha256 if owner is not None else (
+            os.path.lexists(path) and not (os.path.islink(path) or self._same_file(path, sha256)))
+        if not taken:
+            return name
+        stem, ext = os.path.splitext(name)
+        return f"{stem}-{sha256[:8]}{ext}"
+
+    def _same_file(self, path, sha256):
+        try:
+            return os.path.samefile(path, self.object_path(sha256))
+        except OSError:
+            return False
+
+    def _link(self, name, sha256):
+        """原子地创建或更新 name → 实际文件 的符号链接"""
+        path = os.path.join(self.root, name)
+        target = os.path.relpath(self.object_path(sha256), self.root)
+        if os.path.islink(path) and os.readlink(path) == target:
+            return
+        tmp = os.path.join(self.partial_dir, f"{name}.{threading.get_ident()}.link")
+        try:
+            os.symlink(target, tmp)
+        except OSError:
+            try:
+                os.link(self.object_path(sha256), tmp)
+            except OSError:
+                self._count('unlinked')
+                return
+        os.replace(tmp, path)
+
+    def import_file(self, path, key=None):
+        """把目录中已有的普通文件（旧版平铺下载的PDF）移入存储，原位置换成链接"""
+        name = os.path.basename(path)
+        sha256 = sha256_file(path)
+        tmp = os.path.join(self.partial_dir, name + IMPORT_SUFFIX)
+        os.replace(path, tmp)
+        return self.add(tmp, sha256, os.path.getsize(tmp), key or f"file:{name}", name)
+
+    def import_dir(self):
+        """导入 root 下所有未纳入存储的 PDF 文件，返回导入数量"""
+        count = 0
+        for entry in os.scandir(self.root):
+            if entry.is_file(follow_symlinks=False) and entry.name.endswith(self.suffix):
+                self.import_file(entry.path)
+                count += 1
+        return count
+
+    def summary(self):
+        """存储中的文件数、总大小与索引条目数"""
+        with self._lock:
+            blobs, total = self._conn.execute('SELECT COUNT(*), COALESCE(SUM(size), 0) FROM blobs').fetchone()
+            refs = self._conn.execute('SELECT COUNT(*) FROM refs').fetchone()[0]
+        return {'blobs': blobs, 'bytes': total, 'refs': refs}
+
+    def report(self):
+        s = self.stats
+        return (f"PDF存储: 新增 {s['stored']}, 内容重复 {s['deduplicated']}, 已存在跳过 {s['hits']}, "
+                f"未能创建链接 {s['unlinked']}, 清理残留临时文件 {s['partials_removed']}")
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+def open_store(root):
+    """同一目录在进程内共用一个 BlobStore"""
+    key = os.path.abspath(root)
+    with _stores_lock:
+        if key not in _stores:
+            os.makedirs(root, exist_ok=True)
+            _stores[key] = BlobStore(root)
+        return _stores[key]
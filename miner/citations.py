@@ -0,0 +1,282 @@
+"""引用文本解析：把 IEEE "Cite This" 与 ISCA "Cite as" 的纯文本引用拆成结构化字段并输出 BibTeX
+
+    IEEE: B. Kashyap, P. N. Pathirana and D. Szmulewicz, "Title," 2018 40th ... (EMBC), Honolulu, HI, USA, 2018, pp. 425-428, doi: 10.1109/EMBC.2018.8512311.
+    ISCA: Smith, J., Doe, J. (2023) Title. Proc. INTERSPEECH 2023, 1-5, doi: 10.21437/Interspeech.2023-123
+
+所有正则在导入时编译；parse_many 一次处理整批引用，无法解析的记录收集到报告中而不是抛出异常。
+"""
+import csv
+import re
+import time
+import unicodedata
+
+FIELDS = ['format', 'entry', 'authors', 'title', 'venue', 'publisher', 'year', 'volume', 'number', 'pages', 'doi']
+
+# 题目本身可能含引号（'"Hello," said the model'），以最后一个引号（通常为 ,"）为题目的结尾
+_IEEE_RE = re.compile(r'^(?P<authors>[^"]*?),?\s*"(?P<quoted>(?P<title>.+?),?)"(?=[^"]*$)\s*,?\s*(?P<journal>in\s+)?'
+                      r'(?P<rest>.*)$', re.DOTALL)
+_ISCA_RE = re.compile(
+    r'^(?P<authors>.*?)\s*\((?P<year>\d{4})\)\s*(?P<title>.+?)\.\s+(?:Proc\.\s*)?(?P<venue>[^,]+?)'
+    r'(?:,\s*(?P<pages>\d+\s*[-–]\s*\d+|\d+))?(?:,\s*doi:\s*(?P<doi>\S+?))?\.?\s*$', re.DOTALL)
+_DOI_RE = re.compile(r',?\s*doi:\s*(\S+?)\.?\s*$')
+_PAGES_RE = re.compile(r'\bpp?\.\s*(\d+(?:\s*[-–]\s*\d+)?)')
+_VOLUME_RE = re.compile(r'\bvol\.\s*([\w.-]+)')
+_NUMBER_RE = re.compile(r'\bno\.\s*([\w.-]+)')
+_YEAR_RE = re.compile(r'\b(?:19|20)\d{2}\b')
+# 期刊名本身可能含逗号（"IEEE/ACM Transactions on Audio, Speech, and Language Processing"），截到卷号/页码为止
+_JOURNAL_END_RE = re.compile(r',\s*(?:vol\.|no\.|pp?\.|early access|(?:19|20)\d{2}\b)', re.IGNORECASE)
+_EARLY_ACCESS_RE = re.compile(r',\s*early access\b', re.IGNORECASE)
+# 会议引用末尾为 "会议名, 地点, 年份, pp. 页码"，地点有 1~4 段（城市 / 城市, 国家 / 城市, 州, 国家 ...）
+_CONF_TAIL_RE = re.compile(r',\s*((?:19|20)\d{2})\s*(?:,\s*pp?\..*)?$', re.DOTALL)
+_LOCATION_RE = re.compile(r"[^\W\d][\w'.-]*(?:\s+[^\W\d(]?[\w'.()-]*){0,3}")
+# 会议名中常见而地名中没有的词：连接词、全大写缩写（ICASSP），以及会议类名词
+_NOT_LOCATION_RE = re.compile(r'\b(?:and|on|for|the|in|to|with|their)\b|\([A-Z&-]{2,}\)|\d')
+_VENUE_WORD_RE = re.compile(r'Conference|Symposium|Workshop|Congress|Proceedings?|Society|Summit|Meeting|Processing'
+                            r'|Systems|Computers|Engineering|Technolog|Applications|Sciences|Communications?')
+_ABSTRACT_TAIL_RE = re.compile(r'\s+Abstract:.*$', re.DOTALL)
+_ET_AL_RE = re.compile(r'\s+et\s+al\.?$')
+_IEEE_AUTHORS_RE = re.compile(r'[,;]\s*(?:and\s+)?|\s+and\s+')
+_ISCA_AUTHORS_RE = re.compile(r'(?<=\.),\s*')
+_SPACE_RE = re.compile(r'\s+')
+_KEY_RE = re.compile(r'[^a-z0-9]')
+_BIBTEX_ESCAPE_RE = re.compile(r'([&%$#_])')
+
+
+def _space(text):
+    return _SPACE_RE.sub(' ', text or '').strip()
+
+
+def _pages(text):
+    return re.sub(r'\s*[-–]\s*', '-', text) if text else ''
+
+
+def _ieee_authors(text):
+    """'A. B, C. D and E. F' -> ['A. B', 'C. D', 'E. F']，'X. Y et al.' 末尾加 'others'"""
+    text = _space(text)
+    authors = [a for a in _IEEE_AUTHORS_RE.split(_ET_AL_RE.sub('', text)) if a]
+    if _ET_AL_RE.search(text):
+        authors.append('others')
+    return authors
+
+
+def _is_location(segment):
+    return (bool(_LOCATION_RE.fullmatch(segment)) and not _NOT_LOCATION_RE.search(segment)
+            and not _VENUE_WORD_RE.search(segment))
+
+
+def _split_conference(rest):
+    """会议引用拆成 (会议名, 年份)：从右向左去掉页码、年份与地点，会议名本身可以含逗号"""
+    tail = _CONF_TAIL_RE.search(rest)
+    if tail is None:
+        return rest, ''
+    segments = [seg.strip() for seg in rest[:tail.start()].split(',')]
+    # 地点最多四段（Seoul, Korea, Republic of / Honolulu, Oahu, HI, USA），遇到不像地名的一段即为会议名的结尾
+    dropped = 0
+    while len(segments) > 1 and dropped < 4 and _is_location(segments[-1]):
+        segments.pop()
+        dropped += 1
+    return ', '.join(segments), tail.group(1)
+
+
+def _split_journal(rest):
+    """期刊/图书引用（"in 期刊名, vol. ..."）拆成 (期刊或书名, 年份, 出版社)
+
+    期刊名本身可能含逗号，截到卷号/页码/年份为止；没有卷号的 "in 书名, 出版社, pp. ..." 为图书章节。
+    """
+    end = _JOURNAL_END_RE.search(rest)
+    venue = rest[:end.start()] if end else rest
+    years = _YEAR_RE.findall(rest[len(venue):])
+    publisher = ''
+    if (not _VOLUME_RE.search(rest) and not _NUMBER_RE.search(rest) and not _EARLY_ACCESS_RE.search(rest)
+            and ',' in venue):
+        venue, publisher = venue.rsplit(',', 1)
+    return venue, years[-1] if years else '', publisher.strip()
+
+
+def _parse_ieee(match):
+    rest = match.group('rest')
+    doi = ''
+    if m := _DOI_RE.search(rest):
+        doi = m.group(1)
+        rest = rest[:m.start()]
+    pages = _PAGES_RE.search(rest)
+    volume = _VOLUME_RE.search(rest)
+    number = _NUMBER_RE.search(rest)
+    publisher = ''
+    if match.group('journal'):
+        venue, year, publisher = _split_journal(rest)
+        entry = 'incollection' if publisher else 'article'
+    else:
+        venue, year = _split_conference(rest)
+        entry = 'inproceedings'
+    return {
+        'format': 'ieee',
+        'entry': entry,
+        'authors': _ieee_authors(match.group('authors')),
+        'title': _space(match.group('title')),
+        'venue': _space(venue).rstrip('., '),
+        'publisher': publisher,
+        'year': year,
+        'volume': volume.group(1) if volume else '',
+        'number': number.group(1) if number else '',
+        'pages': _pages(pages.group(1)) if pages else '',
+        'doi': doi,
+    }
+
+
+def _parse_isca(match):
+    return {
+        'format': 'isca',
+        'entry': 'inproceedings',
+        'authors': [a.strip() for a in _ISCA_AUTHORS_RE.split(_space(match.group('authors'))) if a.strip()],
+        'title': _space(match.group('title')),
+        'venue': _space(match.group('venue')),
+        'publisher': '',
+        'year': match.group('year'),
+        'volume': '',
+        'number': '',
+        'pages': _pages(match.group('pages')),
+        'doi': match.group('doi') or '',
+    }
+
+
+def parse_or_reason(citation):
+    """解析一条引用，返回 (记录, None) 或 (None, 失败原因)"""
+    text = _space(citation)
+    if not text:
+        return None, "空引用"
+    if '"' in text:
+        match = _IEEE_RE.match(_ABSTRACT_TAIL_RE.sub('', text))
+        record = _parse_ieee(match) if match else None
+    else:
+        match = _ISCA_RE.match(text)
+        record = _parse_isca(match) if match else None
+    if record is None:
+        return None, "无法识别的引用格式"
+    if not record['title']:
+        return None, "缺少题目"
+    # 期刊（尤其是 early access）与图书章节常不带出版年份，会议引用必须有年份
+    if not record['year'] and record['entry'] == 'inproceedings':
+        return None, "缺少年份"
+    return record, None
+
+
+def parse(citation):
+    """解析一条引用，无法解析时返回None"""
+    return parse_or_reason(citation)[0]
+
+
+def quoted_title(citation):
+    """IEEE 引用中引号内的原文（含末尾逗号，与元数据CSV的 Title 列格式一致），没有引号时返回None"""
+    match = _IEEE_RE.match(_ABSTRACT_TAIL_RE.sub('', _space(citation)))
+    return match.group('quoted') if match else None
+
+
+def parse_many(citations):
+    """批量解析 [(键, 引用)]，返回 (记录列表, 格式错误报告)
+
+    记录中附带 key；报告为 [(键, 失败原因, 原始引用)]。
+    """
+    records, malformed = [], []
+    for key, citation in citations:
+        record, reason = parse_or_reason(citation)
+        if record is None:
+            malformed.append((key, reason, citation))
+        else:
+            record['key'] = key
+            records.append(record)
+    return records, malformed
+
+
+def _ascii(text):
+    return unicodedata.normalize('NFKD', text).encode('ascii', 'ignore').decode('ascii')
+
+
+def _last_name(author):
+    """'B. Kashyap' -> 'Kashyap'，'Smith, J.' -> 'Smith'"""
+    if ',' in author:
+        return author.split(',')[0]
+    return author.split()[-1] if author.split() else ''
+
+
+def _bibtex_author(author):
+    """BibTeX 作者统一为 'Last, First' 形式"""
+    if ',' in author or author == 'others':
+        return author
+    parts = author.split()
+    return f"{parts[-1]}, {' '.join(parts[:-1])}" if len(parts) > 1 else author
+
+
+def _escape(text):
+    return _BIBTEX_ESCAPE_RE.sub(r'\\\1', text)
+
+
+def cite_key(record):
+    """引用键：第一作者姓 + 年份 + 题目第一个词，如 kashyap2018quantitative"""
+    author = _last_name(record['authors'][0]) if record['authors'] else 'anon'
+    words = [w for w in _ascii(record['title']).lower().split() if len(w) > 3] or ['paper']
+    return _KEY_RE.sub('', _ascii(author).lower()) + record['year'] + _KEY_RE.sub('', words[0])
+
+
+def to_bibtex(record, key=None):
+    """输出一条 BibTeX：IEEE期刊为 @article，图书章节为 @incollection，其余为 @inproceedings"""
+    is_article = record['entry'] == 'article'
+    fields = [
+        ('author', ' and '.join(_bibtex_author(a) for a in record['authors'])),
+        ('title', '{' + record['title'] + '}'),
+        ('journal' if is_article else 'booktitle', record['venue']),
+        ('publisher', record['publisher']),
+        ('year', record['year']),
+        ('volume', record['volume']),
+        ('number', record['number']),
+        ('pages', record['pages'].replace('-', '--')),
+        ('doi', record['doi']),
+    ]
+    body = ',\n'.join(f"  {name} = {{{_escape(value)}}}" for name, value in fields if value)
+    return f"@{record['entry']}{{{key or cite_key(record)},\n{body}\n}}\n"
+
+
+def write_bibtex(records, path):
+    """写出 BibTeX 文件，重复的引用键依次加 a、b、c… 后缀"""
+    used = {}
+    with open(path, 'w', encoding='utf-8') as f:
+        for record in records:
+            key = cite_key(record)
+            count = used.get(key, 0)
+            used[key] = count + 1
+            if count:
+                key += chr(ord('a') + count - 1) if count <= 26 else str(count)
+            f.write(to_bibtex(record, key) + '\n')
+
+
+def parse_csv(path, column='Citation', key_column=None, encoding='utf-8-sig'):
+    """解析CSV中一列引用，key_column 默认取 URL 或 Links 列，都没有时为行号
+
+    返回 (记录列表, 格式错误报告, 耗时秒数)。
+    """
+    with open(path, newline='', encoding=encoding) as f:
+        reader = csv.DictReader(f)
+        if column not in (reader.fieldnames or []):
+            raise ValueError(f"{path} 中没有 {column} 列")
+        key_column = key_column or next((c for c in ('URL', 'Links') if c in reader.fieldnames), None)
+        rows = [(row.get(key_column) if key_column else str(idx), row[column]) for idx, row in enumerate(reader, 1)]
+    start = time.perf_counter()
+    records, malformed = parse_many(rows)
+    return records, malformed, time.perf_counter() - start
+
+
+def write_records(records, path):
+    """结构化字段写出为CSV，作者以 '; ' 分隔"""
+    with open(path, 'w', newline='', encoding='utf-8-sig') as f:
+        writer = csv.writer(f)
+        writer.writerow(['key'] + FIELDS)
+        for record in records:
+            writer.writerow([record['key']] + ['; '.join(record['authors']) if name == 'authors' else record[name]
+                                               for name in FIELDS])
+
+
+def write_report(malformed, path):
+    with open(path, 'w', newline='', encoding='utf-8-sig') as f:
+        writer = csv.writer(f)
+        writer.writerow(['key', 'reason', 'citation'])
+        writer.writerows(malformed)
@@ -0,0 +1,170 @@
+import collections
+import queue
+import threading
+
+_DONE = object()
+_install_lock = threading.Lock()
+_driver_path = None
+
+
+def chromedriver_path():
+    """只安装一次 chromedriver，避免多个工作线程同时下载"""
+    global _driver_path
+    with _install_lock:
+        if _driver_path is None:
+            from webdriver_manager.chrome import ChromeDriverManager
+            _driver_path = ChromeDriverManager().install()
+        return _driver_path
+
+
+class LazyDriver:
+    """浏览器代理：第一次访问属性时才真正启动浏览器，HTTP路径成功时不会启动Chrome"""
+
+    def __init__(self, factory):
+        self._factory = factory
+        self._driver = None
+
+    @property
+    def started(self):
+        return self._driver is not None
+
+    def __getattr__(self, name):
+        if self._driver is None:
+            self._driver = self._factory()
+        return getattr(self._driver, name)
+
+    def quit(self):
+        if self._driver is not None:
+            try:
+                self._driver.quit()
+            except Exception:
+                pass
+            self._driver = None
+
+
+class DriverPool:
+    """浏览器工作池：workers 个线程各自持有一个浏览器，从共享队列领取任务
+
+    - 每个浏览器处理 recycle_after 个页面后重建，限制内存增长
+    - 任务函数抛出异常视为浏览器崩溃：重建浏览器，把当前条目重新放回队列，
+      超过 max_retries 次后该条目结果为 None
+    - imap 按输入顺序返回结果；输入可以是生成器，已读取但尚未按序产出的条目最多
+      queue_size + workers 个，慢条目或慢消费者都会让读取暂停（背压），乱序完成的结果不会无限堆积
+    """
+
+    def __init__(self, factory, workers=1, recycle_after=50, max_retries=2, queue_size=None):
+        self.factory = factory
+        self.workers = max(1, workers)
+        self.recycle_after = recycle_after
+        self.max_retries = max_retries
+        self.queue_size = queue_size or self.workers * 2
+        self.stats = collections.Counter()
+        self._stats_lock = threading.Lock()
+
+    def _count(self, name):
+        with self._stats_lock:
+            self.stats[name] += 1
+
+    def imap_items(self, func, items):
+        """对每个条目执行 func(driver, item)，按输入顺序逐个产出 (条目, 结果)"""
+        tasks = queue.Queue(maxsize=self.queue_size)
+        # 已读取但尚未产出的条目数上限，按序产出一个才放行下一个
+        window = threading.Semaphore(self.queue_size + self.workers)
+        retries = collections.deque()
+        results = queue.Queue()
+        state = {'total': None, 'stop': False}
+        lock = threading.Lock()
+
+        def feed():
+            count = 0
+            try:
+                for item in items:
+                    while not state['stop'] and not window.acquire(timeout=0.1):
+                        pass
+                    while not state['stop']:
+                        try:
+                            tasks.put((count, item, 0), timeout=0.1)
+                            break
+                        except queue.Full:
+                            continue
+                    if state['stop']:
+                        break
+                    count += 1
+            except Exception as e:
+                results.put((None, e))
+            finally:
+                state['total'] = count
+
+        def next_task():
+            while not state['stop']:
+                with lock:
+                    if retries:
+                        return retries.popleft()
+                try:
+                    return tasks.get(timeout=0.1)
+                except queue.Empty:
+                    with lock:
+                        if state['total'] is not None and not retries and tasks.empty():
+                            return _DONE
+
+        def work():
+            driver = LazyDriver(self.factory)
+            pages = 0
+            try:
+                while (task := next_task()) not in (_DONE, None):
+                    idx, item, attempt = task
+                    if pages >= self.recycle_after:
+                        driver.quit()
+                        pages = 0
+                        self._count('recycled')
+                    pages += 1
+                    try:
+                        results.put((idx, (item, func(driver, item))))
+                    except Exception as e:
+                        # 浏览器崩溃：重建浏览器并把条目放回队列
+                        driver.quit()
+                        pages = 0
+                        self._count('crashes')
+                        if attempt < self.max_retries:
+                            with lock:
+                                retries.append((idx, item, attempt + 1))
+                        else:
+                            print(f"条目 {item} 重试 {attempt} 次后仍失败: {str(e)}")
+                            results.put((idx, (item, None)))
+            finally:
+                driver.quit()
+
+        threads = [threading.Thread(target=feed, daemon=True)]
+        threads += [threading.Thread(target=work, daemon=True) for _ in range(self.workers)]
+        for t in threads:
+            t.start()
+
+        pending = {}
+        next_idx = 0
+        try:
+            while state['total'] is None or next_idx < state['total']:
+                try:
+                    idx, result = results.get(timeout=0.1)
+                except queue.Empty:
+                    if not any(t.is_alive() for t in threads[1:]) and results.empty():
+                        break
+                    continue
+                if idx is None:
+                    raise result
+                pending[idx] = result
+                while next_idx in pending:
+                    yield pending.pop(next_idx)
+                    next_idx += 1
+                    window.release()
+        finally:
+            state['stop'] = True
+            for t in threads:
+                t.join()
+
+    def imap(self, func, items):
+        """对每个条目执行 func(driver, item)，按输入顺序逐个产出结果"""
+        for _, result in self.imap_items(func, items):
+            yield result
+
+    def map(self, func, items):
+        return list(self.imap(func, items))
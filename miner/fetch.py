@@ -0,0 +1,311 @@
+"""统一的抓取层：错误分类、带抖动的指数退避重试、按主机熔断、自适应并发
+
+所有网络操作（requests 请求、流式下载、Selenium 页面操作）都可以经 Fetcher.call 执行：
+- 429 / 5xx / 超时 / 网络错误会重试，等待时间为带抖动的指数退避，并遵守 Retry-After
+- 每个主机一个熔断器：连续失败达到阈值后暂停该主机，到期后只放行一个探测请求；
+  429 说明服务器仍然可用，不计入熔断，只按 Retry-After 暂停该主机的令牌桶
+- 全局并发上限按 AIMD 调整：被限流时减半，成功时缓慢增加
+"""
+import collections
+import email.utils
+import random
+import threading
+import time
+from urllib.parse import urlparse
+
+import requests
+
+from miner.metrics import METRICS
+from miner.ratelimit import HostRateLimiter
+
+THROTTLE = 'throttle'
+SERVER = 'server'
+TIMEOUT = 'timeout'
+NETWORK = 'network'
+CLIENT = 'client'
+PARSE = 'parse'
+
+RETRYABLE = {THROTTLE, SERVER, TIMEOUT, NETWORK}
+
+DEFAULT_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+}
+
+# Selenium 的异常按类名识别，避免本模块依赖 selenium
+_SELENIUM_KINDS = {
+    'TimeoutException': TIMEOUT,
+    'NoSuchElementException': PARSE,
+    'StaleElementReferenceException': PARSE,
+}
+
+
+class FetchError(Exception):
+    """已分类的抓取错误，kind 为 THROTTLE / SERVER / TIMEOUT / NETWORK / CLIENT / PARSE 之一"""
+
+    def __init__(self, kind, message, status=None, retry_after=None):
+        super().__init__(message)
+        self.kind = kind
+        self.status = status
+        self.retry_after = retry_after
+
+
+def parse_retry_after(value):
+    """Retry-After 可以是秒数或HTTP日期，返回秒数，无法解析时返回None"""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, email.utils.parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def check_response(response):
+    """状态码 >= 400 时关闭响应并抛出分类后的 FetchError"""
+    status = response.status_code
+    if status < 400:
+        return response
+    response.close()
+    message = f"HTTP {status}: {response.url}"
+    if status == 429:
+        raise FetchError(THROTTLE, message, status, parse_retry_after(response.headers.get('Retry-After')))
+    if status == 503:
+        raise FetchError(SERVER, message, status, parse_retry_after(response.headers.get('Retry-After')))
+    if status >= 500:
+        raise FetchError(SERVER, message, status)
+    raise FetchError(CLIENT, message, status)
+
+
+def classify(exc):
+    """把异常归类为 FetchError，无法识别的异常返回None（由调用方原样抛出）"""
+    if isinstance(exc, FetchError):
+        return exc
+    if isinstance(exc, requests.Timeout):
+        return FetchError(TIMEOUT, str(exc))
+    if isinstance(exc, (requests.ConnectionError, requests.exceptions.ChunkedEncodingError)):
+        return FetchError(NETWORK, str(exc))
+    if isinstance(exc, requests.HTTPError) and exc.response is not None:
+        try:
+            check_response(exc.response)
+        except FetchError as err:
+            return err
+    kind = _SELENIUM_KINDS.get(type(exc).__name__)
+    if kind is not None:
+        return FetchError(kind, str(exc) or type(exc).__name__)
+    if isinstance(exc, (ValueError, KeyError, IndexError, AttributeError)):
+        return FetchError(PARSE, str(exc))
+    if isinstance(exc, OSError):
+        return FetchError(NETWORK, str(exc))
+    return None
+
+
+class RetryPolicy:
+    """带完全抖动的指数退避：第 n 次重试等待 uniform(0, min(cap, base * 2^n))
+
+    服务器给出 Retry-After 时按它等待，另加不超过 base 的抖动，避免被暂停的请求同时重试。
+    429 另计次数：服务器只是要求降速，最多重试 max_throttled 次，不占用 max_attempts。
+    """
+
+    def __init__(self, max_attempts=4, base=0.5, cap=30.0, max_throttled=10):
+        self.max_attempts = max_attempts
+        self.max_throttled = max_throttled
+        self.base = base
+        self.cap = cap
+
+    def delay(self, attempt, retry_after=None):
+        if retry_after is not None:
+            return min(retry_after, self.cap * 4) + random.uniform(0, self.base)
+        return random.uniform(0, min(self.cap, self.base * (2 ** attempt)))
+
+
+class CircuitBreaker:
+    """单个主机的熔断器
+
+    连续 failure_threshold 次可重试错误（429 除外）后断开 reset_timeout 秒（或 Retry-After），
+    期间请求在 acquire 中等待；到期后进入半开状态，只放行一个探测请求，
+    探测成功则恢复，失败则再次断开。断开前已发出的请求随后失败时不会延长断开时间。
+    """
+
+    CLOSED, OPEN, HALF_OPEN = 'closed', 'open', 'half_open'
+
+    def __init__(self, failure_threshold=5, reset_timeout=30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self.opened = 0
+        self._failures = 0
+        self._open_until = 0.0
+        self._probing = False
+        self._cond = threading.Condition()
+
+    def acquire(self):
+        """等待直到允许发出请求，返回是否因熔断而等待过"""
+        waited = False
+        with self._cond:
+            while True:
+                now = time.monotonic()
+                if self.state == self.CLOSED:
+                    return waited
+                if self.state == self.OPEN:
+                    if now < self._open_until:
+                        self._cond.wait(self._open_until - now)
+                        waited = True
+                        continue
+                    self.state = self.HALF_OPEN
+                if not self._probing:
+                    self._probing = True
+                    return waited
+                self._cond.wait(1.0)
+                waited = True
+
+    def record(self, error=None):
+        """记录一次结果：error 为None表示成功，不可重试的错误不影响熔断状态"""
+        with self._cond:
+            if error is None:
+                self.state = self.CLOSED
+                self._failures = 0
+            elif error.kind in RETRYABLE and error.kind != THROTTLE:
+                # 只在闭合时计数；已断开时到达的失败来自断开前发出的请求，不再延长断开时间
+                if self.state == self.CLOSED:
+                    self._failures += 1
+                    if self._failures >= self.failure_threshold:
+                        self._open(error)
+                elif self.state == self.HALF_OPEN:
+                    self._open(error)
+            self._probing = False
+            self._cond.notify_all()
+
+    def _open(self, error):
+        self.state = self.OPEN
+        self.opened += 1
+        self._failures = 0
+        self._open_until = time.monotonic() + max(self.reset_timeout, error.retry_after or 0)
+
+
+class AdaptiveLimiter:
+    """AIMD 并发控制：被限流时上限减半，每次成功增加 1/上限，介于 minimum 与 maximum 之间"""
+
+    def __init__(self, initial=4, minimum=1, maximum=16):
+        self.limit = float(initial)
+        self.minimum = minimum
+        self.maximum = maximum
+        self._active = 0
+        self._cond = threading.Condition()
+
+    def acquire(self):
+        with self._cond:
+            while self._active >= int(self.limit):
+                self._cond.wait()
+            self._active += 1
+
+    def release(self, error=None):
+        with self._cond:
+            self._active -= 1
+            if error is None:
+                self.limit = min(self.maximum, self.limit + 1 / self.limit)
+            elif error.kind == THROTTLE:
+                self.limit = max(self.minimum, self.limit / 2)
+            self._cond.notify_all()
+
+
+class Fetcher:
+    """带重试、熔断和自适应并发的抓取器
+
+    get() 的用法与 requests.Session.get 相同，可直接传给 HTTPCache 作为 session；
+    call(url, fn) 用同样的策略执行任意操作（流式下载、Selenium 页面操作等），
+    url 只用于确定主机。rate 不为None时每个主机额外按令牌桶限速；
+    429 的 Retry-After 暂停该主机的所有请求，并让并发上限减半，但不计入熔断。
+    """
+
+    def __init__(self, session=None, headers=None, timeout=30, policy=None, rate=None, burst=1,
+                 concurrency=4, max_concurrency=16, breaker_threshold=5, breaker_reset=30.0):
+        self.session = session or requests.Session()
+        if headers:
+            self.session.headers.update(headers)
+        self.timeout = timeout
+        self.policy = policy or RetryPolicy()
+        # rate 为None时不限速，但仍按429的 Retry-After 暂停对应主机
+        self.rate_limiter = HostRateLimiter(rate or 0, burst)
+        self.limiter = AdaptiveLimiter(concurrency, 1, max_concurrency)
+        self.breaker_threshold = breaker_threshold
+        self.breaker_reset = breaker_reset
+        self.stats = collections.Counter()
+        self._breakers = {}
+        self._lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+
+    def breaker(self, url):
+        host = urlparse(url).netloc
+        with self._lock:
+            if host not in self._breakers:
+                self._breakers[host] = CircuitBreaker(self.breaker_threshold, self.breaker_reset)
+            return self._breakers[host]
+
+    def _count(self, name):
+        # 多个工作线程共用一个抓取器
+        with self._stats_lock:
+            self.stats[name] += 1
+
+    def call(self, url, fn):
+        """执行 fn()，可重试的错误按策略重试（429 与其他错误分别计次），最终失败抛出 FetchError"""
+        breaker = self.breaker(url)
+        tries = collections.Counter()
+        while True:
+            if breaker.acquire():
+                self._count('breaker_waits')
+            self.rate_limiter.acquire(url)
+            self.limiter.acquire()
+            error = None
+            try:
+                self._count('attempts')
+                return fn()
+            except Exception as exc:
+                error = classify(exc)
+                if error is None:
+                    raise
+                if error is not exc:
+                    error.__cause__ = exc
+            finally:
+                self.limiter.release(error)
+                breaker.record(error)
+
+            self._count(error.kind)
+            throttled = error.kind == THROTTLE
+            if throttled and error.retry_after:
+                self.rate_limiter.pause(url, error.retry_after)
+            tries[throttled] += 1
+            attempt = tries[throttled]
+            budget = self.policy.max_throttled if throttled else self.policy.max_attempts
+            if error.kind not in RETRYABLE or attempt >= budget:
+                self._count('failures')
+                raise error
+            self._count('retries')
+            time.sleep(self.policy.delay(attempt - 1, error.retry_after))
+
+    def request(self, method, url, headers=None, timeout=None, **kwargs):
+        """带重试的请求，返回状态码 < 400 的响应（包括304）"""
+        def send():
+            with METRICS.span('http.request', method=method, url=url):
+                response = self.session.request(method, url, headers=headers, timeout=timeout or self.timeout,
+                                                **kwargs)
+                return check_response(response)
+        return self.call(url, send)
+
+    def get(self, url, headers=None, timeout=None, **kwargs):
+        return self.request('GET', url, headers, timeout, **kwargs)
+
+    def post(self, url, headers=None, timeout=None, **kwargs):
+        return self.request('POST', url, headers, timeout, **kwargs)
+
+    def report(self):
+        s = self.stats
+        opened = sum(b.opened for b in self._breakers.values())
+        return (f"抓取统计: 尝试 {s['attempts']}, 重试 {s['retries']}, 最终失败 {s['failures']}, "
+                f"限流 {s[THROTTLE]}, 服务器错误 {s[SERVER]}, 超时 {s[TIMEOUT]}, 网络错误 {s[NETWORK]}, "
+                f"熔断 {opened} 次, 当前并发上限 {self.limiter.limit:.1f}")
+
+    def close(self):
+        self.session.close()
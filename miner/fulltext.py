@@ -0,0 +1,200 @@
+"""PDF全文索引：多进程提取正文与首页元数据，写入 SQLite FTS5 全文索引
+
+    python -m miner fulltext index paper_pdfs --workers 4
+    python -m miner fulltext search "intelligibility"
+    python -m miner fulltext search "TTS AND dysarthric"
+
+文档以文件内容的SHA-256为键，重复运行只提取新增的PDF（提取失败的文件同样记录，--retry-failed 重新提取）。
+需要安装 pypdf（pip install pypdf）。
+"""
+import os
+import re
+import sqlite3
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime, timezone
+
+from miner.blobstore import INDEX_NAME, OBJECTS_DIR, sha256_file
+from miner.metrics import METRICS
+
+try:
+    from pypdf import PdfReader
+except ImportError:
+    PdfReader = None
+
+INDEX_FILE = 'fulltext.db'  # 默认位于PDF目录中
+BATCH_SIZE = 50  # 每提交一次事务写入的文档数
+MAX_ABSTRACT = 5000
+
+_SPACE_RE = re.compile(r'[ \t\r\f\v]+')
+_HYPHEN_RE = re.compile(r'(\w)-\n(\w)')
+_ABSTRACT_RE = re.compile(
+    r'\bAbstract\b\s*[:.\-—]?\s*(.+?)(?=\bIndex Terms\b|\bKeywords\b|\n\s*(?:1\.?|I\.)\s*Introduction\b|$)',
+    re.IGNORECASE | re.DOTALL)
+
+_SCHEMA = '''
+CREATE TABLE IF NOT EXISTS documents (
+    sha256 TEXT PRIMARY KEY,
+    path TEXT NOT NULL,
+    name TEXT,
+    url TEXT,
+    title TEXT,
+    authors TEXT,
+    pages INTEGER,
+    error TEXT,
+    indexed_at TEXT NOT NULL
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS fulltext USING fts5(
+    sha256 UNINDEXED, title, abstract, body, tokenize = 'porter unicode61'
+);
+'''
+
+
+def _now():
+    return datetime.now(timezone.utc).isoformat(timespec='seconds')
+
+
+def _clean(text):
+    """合并断行连字符（intelli-\\ngibility），压缩空白"""
+    text = '\n'.join(line for line in (_SPACE_RE.sub(' ', l).strip() for l in (text or '').splitlines()) if line)
+    return _HYPHEN_RE.sub(r'\1\2', text)
+
+
+def parse_first_page(text, meta_title='', meta_author=''):
+    """从首页文本中提取题目、作者与摘要；PDF元数据中的题目可用时优先使用"""
+    lines = text.splitlines()
+    title = meta_title.strip() if meta_title and len(meta_title.strip()) > 8 else (lines[0] if lines else '')
+    match = _ABSTRACT_RE.search(text)
+    abstract = ' '.join(match.group(1).split())[:MAX_ABSTRACT] if match else ''
+    return {'title': title, 'authors': (meta_author or '').strip(), 'abstract': abstract}
+
+
+def extract(path):
+    """在工作进程中提取单个PDF，返回记录字典；失败时 error 字段为错误信息"""
+    start = time.perf_counter()
+    try:
+        reader = PdfReader(path)
+        pages = [_clean(page.extract_text() or '') for page in reader.pages]
+        meta = reader.metadata or {}
+        record = parse_first_page(pages[0] if pages else '', meta.get('/Title') or '', meta.get('/Author') or '')
+        record.update(body='\n'.join(pages), pages=len(pages), error=None)
+    except Exception as e:
+        record = {'title': '', 'authors': '', 'abstract': '', 'body': '', 'pages': 0,
+                  'error': f"{type(e).__name__}: {str(e)}"}
+    record['elapsed'] = time.perf_counter() - start
+    return record
+
+
+def iter_pdfs(directory):
+    """目录中的全部PDF，产出 (SHA-256, 路径)
+
+    内容寻址存储中的文件直接以文件名为哈希，存储之外的普通PDF文件计算哈希，符号链接跳过。
+    """
+    objects = os.path.join(directory, OBJECTS_DIR)
+    for root, _, files in os.walk(objects):
+        for name in files:
+            if name.endswith('.pdf'):
+                yield name[:-len('.pdf')], os.path.join(root, name)
+    if os.path.isdir(directory):
+        for entry in os.scandir(directory):
+            if entry.is_file(follow_symlinks=False) and entry.name.endswith('.pdf'):
+                yield sha256_file(entry.path), entry.path
+
+
+def _store_names(directory):
+    """内容寻址存储的索引中 哈希 → (可读文件名, PDF链接)，导入的旧文件没有链接"""
+    path = os.path.join(directory, INDEX_NAME)
+    if not os.path.exists(path):
+        return {}
+    conn = sqlite3.connect(path)
+    try:
+        return {sha256: (name, None if key.startswith('file:') else key) for sha256, name, key in
+                conn.execute('SELECT sha256, name, key FROM refs ORDER BY updated_at')}
+    finally:
+        conn.close()
+
+
+class FullTextIndex:
+    """PDF目录的全文索引，默认保存在 <目录>/fulltext.db"""
+
+    def __init__(self, directory='paper_pdfs', path=None):
+        self.directory = directory
+        self.path = path or os.path.join(directory, INDEX_FILE)
+        self._conn = sqlite3.connect(self.path)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.executescript(_SCHEMA)
+
+    def _pending(self, retry_failed):
+        query = 'SELECT sha256 FROM documents' + (' WHERE error IS NULL' if retry_failed else '')
+        known = {row[0] for row in self._conn.execute(query)}
+        pending = {}
+        for sha256, path in iter_pdfs(self.directory):
+            if sha256 not in known:
+                pending.setdefault(sha256, path)
+        return pending
+
+    def _write(self, sha256, path, record, names):
+        name, url = names.get(sha256, (os.path.basename(path), None))
+        self._conn.execute('DELETE FROM fulltext WHERE sha256 = ?', (sha256,))
+        self._conn.execute('''
+            INSERT OR REPLACE INTO documents (sha256, path, name, url, title, authors, pages, error, indexed_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ''', (sha256, path, name, url, record['title'], record['authors'], record['pages'], record['error'], _now()))
+        if record['error'] is None:
+            self._conn.execute('INSERT INTO fulltext (sha256, title, abstract, body) VALUES (?, ?, ?, ?)',
+                               (sha256, record['title'], record['abstract'], record['body']))
+
+    def update(self, workers=None, retry_failed=False):
+        """用进程池提取尚未索引的PDF并写入索引，返回 (成功数, 失败数)"""
+        if PdfReader is None:
+            raise ImportError("全文索引需要 pypdf：pip install pypdf")
+        pending = self._pending(retry_failed)
+        names = _store_names(self.directory)
+        print(f"共 {len(pending)} 个新PDF待提取")
+        indexed = failed = 0
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = {pool.submit(extract, path): (sha256, path) for sha256, path in pending.items()}
+            for idx, future in enumerate(as_completed(futures), 1):
+                sha256, path = futures[future]
+                record = future.result()
+                METRICS.observe('fulltext.extract', record['elapsed'], record['error'] is None)
+                with METRICS.span('fulltext.write'):
+                    self._write(sha256, path, record, names)
+                if record['error'] is None:
+                    indexed += 1
+                else:
+                    failed += 1
+                    print(f"提取失败: {path} - {record['error']}")
+                if idx % BATCH_SIZE == 0:
+                    self._conn.commit()
+                    print(f"已提取 {idx}/{len(pending)}")
+        self._conn.commit()
+        METRICS.incr('fulltext_indexed', indexed)
+        METRICS.incr('fulltext_failed', failed)
+        return indexed, failed
+
+    def search(self, query, limit=20):
+        """全文检索，返回按相关度排序的 [(文件名, 题目, 摘录, PDF链接)]
+
+        query 使用 FTS5 语法（AND / OR / NOT / "短语" / 前缀*），语法错误时按普通词语检索；
+        题目的权重高于摘要，摘要高于正文。
+        """
+        sql = '''
+            SELECT d.name, d.title, snippet(fulltext, 3, '[', ']', ' … ', 12), d.url
+            FROM fulltext JOIN documents d ON d.sha256 = fulltext.sha256
+            WHERE fulltext MATCH ? ORDER BY bm25(fulltext, 0, 10, 5, 1) LIMIT ?
+        '''
+        try:
+            rows = self._conn.execute(sql, (query, limit)).fetchall()
+        except sqlite3.OperationalError:
+            quoted = ' '.join('"{}"'.format(term.replace('"', '""')) for term in query.split())
+            rows = self._conn.execute(sql, (quoted, limit)).fetchall()
+        return [(name, title, ' '.join(snippet.split()), url) for name, title, snippet, url in rows]
+
+    def summary(self):
+        total, failed = self._conn.execute(
+            'SELECT COUNT(*), COUNT(error) FROM documents').fetchone()
+        return {'documents': total - failed, 'failed': failed}
+
+    def close(self):
+        self._conn.close()
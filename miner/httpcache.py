@@ -0,0 +1,210 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+import hashlib
+from collections import Counter
+
+import requests
+
+from miner.fetch import classify, RETRYABLE
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+DEFAULT_CACHE = os.path.join(ROOT, 'http_cache.db')
+DEFAULT_TTL = 7 * 24 * 3600  # ISCA归档页面基本不变，默认缓存一周
+DEFAULT_MAX_BYTES = 200 * 1024 * 1024
+
+MISSING = object()  # lookup_parsed 未命中时的返回值
+
+_SCHEMA = '''
+CREATE TABLE IF NOT EXISTS responses (
+    url TEXT PRIMARY KEY,
+    status INTEGER NOT NULL,
+    etag TEXT,
+    last_modified TEXT,
+    content_hash TEXT NOT NULL,
+    body BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    fetched_at REAL NOT NULL,
+    accessed_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_responses_accessed ON responses (accessed_at);
+CREATE TABLE IF NOT EXISTS parsed (
+    url TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    content_hash TEXT NOT NULL,
+    value TEXT NOT NULL,
+    PRIMARY KEY (url, kind)
+);
+'''
+
+
+class HTTPCache:
+    """基于SQLite的HTTP响应缓存
+
+    TTL 内直接返回缓存内容；过期后携带 If-None-Match / If-Modified-Since 重新验证，
+    304 时沿用缓存。缓存总大小超过 max_bytes 时按最近最少使用（LRU）淘汰。
+    另外缓存页面解析结果（如 URL→PDF链接），页面内容不变时连解析也一并跳过。
+    命中情况记录在 stats 计数器中（多线程共用时加锁计数）。
+    """
+
+    def __init__(self, path=DEFAULT_CACHE, ttl=DEFAULT_TTL, max_bytes=DEFAULT_MAX_BYTES):
+        self.path = path
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.stats = Counter()
+        self._stats_lock = threading.Lock()
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.executescript(_SCHEMA)
+        self._total = self._conn.execute('SELECT COALESCE(SUM(size), 0) FROM responses').fetchone()[0]
+
+    def _count(self, name):
+        with self._stats_lock:
+            self.stats[name] += 1
+
+    def _load(self, url):
+        with self._lock:
+            return self._conn.execute(
+                'SELECT etag, last_modified, content_hash, body, fetched_at FROM responses WHERE url = ?',
+                (url,)).fetchone()
+
+    def _touch(self, url, fetched=False):
+        now = time.time()
+        with self._lock:
+            if fetched:
+                self._conn.execute('UPDATE responses SET accessed_at = ?, fetched_at = ? WHERE url = ?', (now, now, url))
+            else:
+                self._conn.execute('UPDATE responses SET accessed_at = ? WHERE url = ?', (now, url))
+            self._conn.commit()
+
+    def _store(self, url, response):
+        body = zlib.compress(response.content)
+        content_hash = hashlib.sha256(response.content).hexdigest()
+        now = time.time()
+        with self._lock:
+            old = self._conn.execute('SELECT size FROM responses WHERE url = ?', (url,)).fetchone()
+            self._conn.execute('''
+                INSERT OR REPLACE INTO responses
+                    (url, status, etag, last_modified, content_hash, body, size, fetched_at, accessed_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ''', (url, response.status_code, response.headers.get('ETag'), response.headers.get('Last-Modified'),
+                  content_hash, body, len(body), now, now))
+            self._total += len(body) - (old[0] if old else 0)
+            self._evict()
+            self._conn.commit()
+        return content_hash
+
+    def _evict(self):
+        """淘汰最久未访问的条目直到总大小不超过上限（调用方持有锁）"""
+        while self._total > self.max_bytes:
+            row = self._conn.execute('SELECT url, size FROM responses ORDER BY accessed_at LIMIT 1').fetchone()
+            if row is None:
+                break
+            self._conn.execute('DELETE FROM responses WHERE url = ?', (row[0],))
+            self._conn.execute('DELETE FROM parsed WHERE url = ?', (row[0],))
+            self._total -= row[1]
+            self._count('evictions')
+
+    def fetch(self, url, session=None, headers=None, timeout=30):
+        """获取页面，返回 (正文字节, 内容哈希)
+
+        session 可以是 requests.Session，也可以是带重试与熔断的 miner.fetch.Fetcher；
+        重新验证时网络请求最终失败则退回使用过期的缓存内容。
+        """
+        cached = self._load(url)
+        if cached is not None:
+            etag, last_modified, content_hash, body, fetched_at = cached
+            if time.time() - fetched_at < self.ttl:
+                self._count('hits')
+                self._touch(url)
+                return zlib.decompress(body), content_hash
+
+            # 过期后发送条件请求重新验证
+            headers = dict(headers or {})
+            if etag:
+                headers['If-None-Match'] = etag
+            if last_modified:
+                headers['If-Modified-Since'] = last_modified
+
+        http = session or requests
+        try:
+            response = http.get(url, headers=headers, timeout=timeout)
+        except Exception as exc:
+            error = classify(exc)
+            if cached is None or error is None or error.kind not in RETRYABLE:
+                raise
+            self._count('stale')
+            return zlib.decompress(cached[3]), cached[2]
+        if cached is not None and response.status_code == 304:
+            self._count('revalidated')
+            self._touch(url, fetched=True)
+            return zlib.decompress(cached[3]), cached[2]
+
+        response.raise_for_status()
+        self._count('misses')
+        return response.content, self._store(url, response)
+
+    def get_text(self, url, session=None, headers=None, timeout=30, encoding='utf-8'):
+        body, _ = self.fetch(url, session, headers, timeout)
+        return body.decode(encoding, errors='replace')
+
+    def lookup_parsed(self, url, kind):
+        """不发请求地查询仍在 TTL 内的解析结果，未命中返回 MISSING"""
+        with self._lock:
+            row = self._conn.execute('''
+                SELECT p.value FROM parsed p JOIN responses r
+                    ON r.url = p.url AND r.content_hash = p.content_hash
+                WHERE p.url = ? AND p.kind = ? AND r.fetched_at > ?
+            ''', (url, kind, time.time() - self.ttl)).fetchone()
+        if row is None:
+            return MISSING
+        self._count('parsed_hits')
+        self._touch(url)
+        return json.loads(row[0])
+
+    def get_parsed(self, url, kind, parse, session=None, headers=None, timeout=30):
+        """返回页面的解析结果 parse(text, url)，页面内容未变化时直接复用上次的结果
+
+        parse 的返回值需可被 JSON 序列化。
+        """
+        value = self.lookup_parsed(url, kind)
+        if value is not MISSING:
+            return value
+
+        body, content_hash = self.fetch(url, session, headers, timeout)
+        with self._lock:
+            row = self._conn.execute('SELECT content_hash, value FROM parsed WHERE url = ? AND kind = ?',
+                                     (url, kind)).fetchone()
+        if row is not None and row[0] == content_hash:
+            self._count('parsed_hits')
+            return json.loads(row[1])
+
+        self._count('parsed_misses')
+        value = parse(body.decode('utf-8', errors='replace'), url)
+        with self._lock:
+            self._conn.execute('INSERT OR REPLACE INTO parsed (url, kind, content_hash, value) VALUES (?, ?, ?, ?)',
+                               (url, kind, content_hash, json.dumps(value, ensure_ascii=False)))
+            self._conn.commit()
+        return value
+
+    def report(self):
+        """返回缓存命中情况的摘要"""
+        s = self.stats
+        lookups = s['hits'] + s['revalidated'] + s['misses']
+        rate = (s['hits'] + s['revalidated']) / lookups if lookups else 0.0
+        return (f"HTTP缓存: 命中 {s['hits']}, 重新验证 {s['revalidated']}, 未命中 {s['misses']}, 过期回退 {s['stale']}, "
+                f"淘汰 {s['evictions']}, 命中率 {rate:.0%}; 解析缓存: 命中 {s['parsed_hits']}, 未命中 {s['parsed_misses']}")
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
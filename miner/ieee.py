@@ -0,0 +1,134 @@
+"""IEEE Xplore 文档页面的直接解析：读取页面内嵌的 xplGlobal.document.metadata JSON"""
+import json
+import re
+from urllib.parse import urlencode
+
+from miner import citations
+
+BASE_URL = 'https://ieeexplore.ieee.org'
+FIELDNAMES = ['Title', 'Abstract', 'Keywords', 'Links', 'Citation']
+SEARCH_QUERY = 'Dysarthria'
+ROWS_PER_PAGE = 100
+
+_METADATA_RE = re.compile(r'xplGlobal\.document\.metadata\s*=\s*')
+_TAG_RE = re.compile(r'<[^>]+>')
+
+
+def extract_metadata(html):
+    """从文档页面HTML中取出元数据JSON，未找到时抛出 ValueError"""
+    match = _METADATA_RE.search(html)
+    if not match:
+        raise ValueError("页面中未找到 xplGlobal.document.metadata")
+    metadata, _ = json.JSONDecoder().raw_decode(html, match.end())
+    return metadata
+
+
+def _clean(text):
+    return _TAG_RE.sub('', text or '').strip()
+
+
+def _initials(first_name):
+    """'Pubudu N.' -> 'P. N.'，连字符名保留连字符：'Jean-Luc' -> 'J.-L.'"""
+    parts = []
+    for word in first_name.split():
+        parts.append('-'.join(piece[0] + '.' for piece in word.split('-') if piece))
+    return ' '.join(parts)
+
+
+def format_authors(authors):
+    """按IEEE引用格式输出作者列表：'B. Kashyap, P. N. Pathirana and D. Szmulewicz'"""
+    names = []
+    for author in authors:
+        first, last = author.get('firstName'), author.get('lastName')
+        if first and last:
+            names.append(f"{_initials(first)} {last}")
+        elif author.get('name'):
+            names.append(author['name'])
+    if len(names) <= 1:
+        return ''.join(names)
+    return ', '.join(names[:-1]) + ' and ' + names[-1]
+
+
+def format_citation(metadata):
+    """根据元数据拼出与 "Cite This" 对话框一致的纯文本引用"""
+    head = f'{format_authors(metadata.get("authors", []))}, "{_clean(metadata.get("title"))},"'
+    parts = []
+    venue = metadata.get('displayPublicationTitle') or metadata.get('publicationTitle')
+    if venue:
+        parts.append(_clean(venue))
+    pages = ''
+    if metadata.get('startPage'):
+        pages = f"pp. {metadata['startPage']}-{metadata['endPage']}" if metadata.get('endPage') else f"p. {metadata['startPage']}"
+    year = metadata.get('publicationYear')
+
+    if metadata.get('volume'):
+        # 期刊：卷、期、页码、年份
+        parts.append(f"vol. {metadata['volume']}")
+        if metadata.get('issue'):
+            parts.append(f"no. {metadata['issue']}")
+        parts.extend(p for p in (pages, year) if p)
+    else:
+        # 会议：地点、年份、页码
+        parts.extend(p for p in (metadata.get('confLoc'), year, pages) if p)
+    if metadata.get('doi'):
+        parts.append(f"doi: {metadata['doi']}")
+    return f"{head} {', '.join(str(p) for p in parts)}."
+
+
+def format_keywords(metadata):
+    """按页面导出格式输出关键词：'keywords: {a;b;c},'"""
+    words = []
+    for group in metadata.get('keywords', []):
+        for kwd in group.get('kwd', []):
+            if kwd not in words:
+                words.append(kwd)
+    return 'keywords: {' + ';'.join(words) + '},'
+
+
+def stamp_link(metadata, paper_id, base_url=BASE_URL):
+    link = f"{base_url}/stamp/stamp.jsp?tp=&arnumber={paper_id}"
+    if metadata.get('isNumber'):
+        link += f"&isnumber={metadata['isNumber']}"
+    return link
+
+
+def parse_document(html, paper_id, base_url=BASE_URL):
+    """解析文档页面，返回与浏览器路径字段一致的记录字典
+
+    另外附带 Authors / Year / Venue / DOI 供元数据库使用，写CSV时按 FIELDNAMES 取列，不受影响。
+    """
+    metadata = extract_metadata(html)
+    citation = format_citation(metadata)
+    # 与浏览器路径保持一致：题目取自引用中引号内的原文（含末尾逗号）
+    return {
+        'Title': citations.quoted_title(citation) or _clean(metadata.get('title')),
+        'Abstract': _clean(metadata.get('abstract')),
+        'Keywords': format_keywords(metadata),
+        'Links': stamp_link(metadata, paper_id, base_url),
+        'Citation': citation,
+        'Authors': format_authors(metadata.get('authors', [])),
+        'Year': metadata.get('publicationYear') or '',
+        'Venue': _clean(metadata.get('displayPublicationTitle') or metadata.get('publicationTitle')),
+        'DOI': metadata.get('doi') or '',
+    }
+
+
+def search_page_url(query=SEARCH_QUERY, page=1, base_url=BASE_URL, rows=ROWS_PER_PAGE):
+    """搜索结果页面（需要浏览器渲染）的URL"""
+    params = {'newsearch': 'true', 'queryText': query, 'highlight': 'true', 'returnType': 'SEARCH',
+              'matchPubs': 'true', 'pageNumber': page, 'returnFacets': 'ALL', 'rowsPerPage': rows}
+    return f"{base_url}/search/searchresult.jsp?{urlencode(params)}"
+
+
+def search_request(query=SEARCH_QUERY, page=1, base_url=BASE_URL, rows=ROWS_PER_PAGE):
+    """搜索页面背后的 REST 接口，返回 (URL, JSON请求体, 请求头)，不需要浏览器"""
+    payload = {'newsearch': True, 'queryText': query, 'highlight': True, 'returnType': 'SEARCH',
+               'matchPubs': True, 'pageNumber': page, 'rowsPerPage': rows, 'returnFacets': ['ALL']}
+    headers = {'Origin': base_url, 'Referer': search_page_url(query, page, base_url, rows),
+               'Content-Type': 'application/json'}
+    return f"{base_url}/rest/search", payload, headers
+
+
+def parse_search_results(data):
+    """从 REST 搜索结果中取出文档ID列表"""
+    return [str(record['articleNumber']) for record in data.get('records', []) if record.get('articleNumber')]
@@ -0,0 +1,95 @@
+"""ISCA Archive 页面的直接解析：论文页面（引用、PDF链接与基本元数据）以及首页、论文集目录页"""
+import re
+from urllib.parse import urljoin, urlparse
+
+from bs4 import BeautifulSoup
+
+BASE_URL = 'https://www.isca-archive.org'
+FIELDNAMES = ['URL', 'Title', 'Authors', 'Year', 'Venue', 'Abstract', 'DOI', 'PDF', 'Citation']
+
+_SPACE_RE = re.compile(r'\s+')
+_YEAR_RE = re.compile(r'_(\d{4})/')
+_PROCEEDINGS_RE = re.compile(r'^/?([a-z][a-z0-9]*)_(\d{4})/(?:index\.html)?$')
+
+
+def _text(node):
+    return _SPACE_RE.sub(' ', node.get_text(' ')).strip() if node is not None else ''
+
+
+def _meta(soup, name):
+    tag = soup.find('meta', attrs={'name': name})
+    return tag['content'].strip() if tag is not None and tag.get('content') else ''
+
+
+def find_pdf_link(soup, url):
+    """页面中第一个指向 .pdf 的链接（完整URL），未找到时返回None"""
+    pdf_link = soup.find('a', href=lambda href: href and href.endswith('.pdf'))
+    if not pdf_link:
+        return None
+    return urljoin(url, pdf_link['href'])
+
+
+def parse_pdf_link(html, url):
+    """从论文页面HTML中解析出完整的PDF链接，未找到时返回None"""
+    return find_pdf_link(BeautifulSoup(html, 'html.parser'), url)
+
+
+def parse_page(html, url):
+    """解析论文页面，返回 FIELDNAMES 字段的记录字典
+
+    引用取自页面中隐藏的 #citation-content（即浏览器点击 "Cite as" 后显示的文本），
+    其余字段优先使用 citation_* meta 标签，缺失时从页面正文中提取。
+    """
+    soup = BeautifulSoup(html, 'html.parser')
+    title = _meta(soup, 'citation_title') or _text(soup.find('h3'))
+    authors = [tag['content'].strip() for tag in soup.find_all('meta', attrs={'name': 'citation_author'})
+               if tag.get('content')]
+    year = _meta(soup, 'citation_publication_date')[:4]
+    if not year and (m := _YEAR_RE.search(url)):
+        year = m.group(1)
+    abstract = _meta(soup, 'citation_abstract') or _text(soup.find(id='abstract'))
+    pdf = _meta(soup, 'citation_pdf_url') or find_pdf_link(soup, url) or ''
+    return {
+        'URL': url,
+        'Title': title,
+        'Authors': '; '.join(authors),
+        'Year': year,
+        'Venue': _meta(soup, 'citation_conference_title'),
+        'Abstract': abstract,
+        'DOI': _meta(soup, 'citation_doi'),
+        'PDF': pdf,
+        'Citation': _text(soup.find(id='citation-content')),
+    }
+
+
+def parse_archive_index(html, url=BASE_URL + '/'):
+    """Archive 首页列出的论文集，返回 [(名称, 会议, 年份, 目录页URL)]，如 ('interspeech_2024', 'interspeech', 2024, ...)"""
+    soup = BeautifulSoup(html, 'html.parser')
+    proceedings = []
+    seen = set()
+    for a in soup.find_all('a', href=True):
+        full = urljoin(url, a['href'])
+        match = _PROCEEDINGS_RE.match(urlparse(full).path)
+        if match is None:
+            continue
+        slug = f"{match.group(1)}_{match.group(2)}"
+        if slug not in seen:
+            seen.add(slug)
+            proceedings.append((slug, match.group(1), int(match.group(2)), urljoin(url, f"/{slug}/index.html")))
+    return proceedings
+
+
+def parse_proceedings_index(html, url):
+    """论文集目录页中的论文，返回 [(论文页面URL, 链接文字)]；链接文字以题目开头，其后可能是作者"""
+    series = urlparse(url).path.strip('/').split('/')[0].rsplit('_', 1)[0]
+    suffix = f"_{series}.html"
+    soup = BeautifulSoup(html, 'html.parser')
+    papers = []
+    seen = set()
+    for a in soup.find_all('a', href=True):
+        full = urljoin(url, a['href'])
+        if not full.endswith(suffix) or full in seen:
+            continue
+        seen.add(full)
+        papers.append((full, _text(a)))
+    return papers
@@ -0,0 +1,116 @@
+import hashlib
+import os
+import sqlite3
+import threading
+from datetime import datetime, timezone
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+DEFAULT_MANIFEST = os.path.join(ROOT, 'manifest.db')
+
+STATUS_DONE = 'done'
+STATUS_FAILED = 'failed'
+
+_SCHEMA = '''
+CREATE TABLE IF NOT EXISTS manifest (
+    task TEXT NOT NULL,
+    key TEXT NOT NULL,
+    status TEXT NOT NULL,
+    content_hash TEXT,
+    etag TEXT,
+    last_modified TEXT,
+    path TEXT,
+    error TEXT,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    first_seen TEXT NOT NULL,
+    updated_at TEXT NOT NULL,
+    PRIMARY KEY (task, key)
+)
+'''
+
+
+def sha256_text(text):
+    """计算文本内容的SHA-256"""
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+def _now():
+    return datetime.now(timezone.utc).isoformat(timespec='seconds')
+
+
+class Manifest:
+    """下载清单：记录每个条目的处理状态，重复运行时只处理新增或失败的条目
+
+    task 区分不同的抓取任务（如 pdf / citation / ieee_metadata），
+    key 为论文页面URL或IEEE文档ID。
+    """
+
+    def __init__(self, path=DEFAULT_MANIFEST):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute(_SCHEMA)
+        self._conn.commit()
+
+    def get(self, task, key):
+        """返回条目记录（字典），不存在时返回None"""
+        with self._lock:
+            cur = self._conn.execute('SELECT * FROM manifest WHERE task = ? AND key = ?', (task, key))
+            row = cur.fetchone()
+            if row is None:
+                return None
+            return dict(zip([c[0] for c in cur.description], row))
+
+    def is_done(self, task, key):
+        record = self.get(task, key)
+        return record is not None and record['status'] == STATUS_DONE
+
+    def done_keys(self, task):
+        """该任务下已完成的全部条目，按首次记录的时间排序"""
+        with self._lock:
+            return [row[0] for row in self._conn.execute(
+                'SELECT key FROM manifest WHERE task = ? AND status = ? ORDER BY first_seen, rowid', (task, STATUS_DONE))]
+
+    def pending(self, task, keys):
+        """过滤出尚未完成的条目，保持原有顺序"""
+        done = set(self.done_keys(task))
+        return [key for key in keys if key not in done]
+
+    def _upsert(self, task, key, status, **fields):
+        now = _now()
+        columns = ['content_hash', 'etag', 'last_modified', 'path', 'error']
+        values = [fields.get(c) for c in columns]
+        with self._lock:
+            self._conn.execute(f'''
+                INSERT INTO manifest (task, key, status, {', '.join(columns)}, attempts, first_seen, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, 1, ?, ?)
+                ON CONFLICT(task, key) DO UPDATE SET
+                    status = excluded.status,
+                    content_hash = COALESCE(excluded.content_hash, content_hash),
+                    etag = COALESCE(excluded.etag, etag),
+                    last_modified = COALESCE(excluded.last_modified, last_modified),
+                    path = COALESCE(excluded.path, path),
+                    error = excluded.error,
+                    attempts = attempts + 1,
+                    updated_at = excluded.updated_at
+            ''', (task, key, status, *values, now, now))
+            self._conn.commit()
+
+    def mark_done(self, task, key, content_hash=None, etag=None, last_modified=None, path=None):
+        """标记条目已完成，并记录内容哈希和 ETag/Last-Modified"""
+        self._upsert(task, key, STATUS_DONE, content_hash=content_hash, etag=etag,
+                     last_modified=last_modified, path=path)
+
+    def mark_failed(self, task, key, error=None):
+        """标记条目失败，下次运行时会重试"""
+        self._upsert(task, key, STATUS_FAILED, error=error)
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
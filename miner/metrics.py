@@ -0,0 +1,166 @@
+"""运行指标：各阶段耗时（span）与计数器，输出 JSONL 轨迹、Prometheus 文本格式和 p50/p95 摘要
+
+    with METRICS.span('pdf.download', url=url):
+        ...
+    METRICS.incr('bytes_downloaded', size)
+
+各脚本通过 add_arguments / finish 提供 --trace 与 --metrics-file 参数，运行结束时打印摘要。
+"""
+import collections
+import os
+import re
+import threading
+import time
+from contextlib import contextmanager
+
+from miner.sinks import JSONLSink
+
+_NAME_RE = re.compile(r'[^a-zA-Z0-9_]')
+QUANTILES = (0.5, 0.95, 0.99)
+
+
+def percentile(values, q):
+    """线性插值的分位数，values 需已排序"""
+    if not values:
+        return 0.0
+    pos = (len(values) - 1) * q
+    low = int(pos)
+    high = min(low + 1, len(values) - 1)
+    return values[low] + (values[high] - values[low]) * (pos - low)
+
+
+def _metric_name(name):
+    return 'miner_' + _NAME_RE.sub('_', name)
+
+
+class Metrics:
+    """线程安全的阶段耗时与计数器收集器"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._durations = collections.defaultdict(list)
+        self._errors = collections.Counter()
+        self.counters = collections.Counter()
+        self._trace = None
+        self._start = time.monotonic()
+
+    def reset(self):
+        with self._lock:
+            self._durations.clear()
+            self._errors.clear()
+            self.counters.clear()
+            self._start = time.monotonic()
+
+    def enable_trace(self, path):
+        """把每个 span 追加写入 JSONL 轨迹文件"""
+        with self._lock:
+            self._trace = JSONLSink(path)
+
+    def observe(self, stage, elapsed, ok=True, **attrs):
+        with self._lock:
+            self._durations[stage].append(elapsed)
+            if not ok:
+                self._errors[stage] += 1
+            if self._trace is not None:
+                self._trace.write({'ts': round(time.time() - elapsed, 6), 'stage': stage,
+                                   'duration': round(elapsed, 6), 'ok': ok,
+                                   'thread': threading.current_thread().name, **attrs})
+
+    @contextmanager
+    def span(self, stage, **attrs):
+        """计时一个阶段，块内抛出异常时记为失败"""
+        start = time.perf_counter()
+        ok = False
+        try:
+            yield
+            ok = True
+        finally:
+            self.observe(stage, time.perf_counter() - start, ok, **attrs)
+
+    def incr(self, name, value=1):
+        with self._lock:
+            self.counters[name] += value
+
+    def merge(self, prefix, counter):
+        """并入其他模块的计数器（如 Fetcher.stats、HTTPCache.stats），名称加前缀"""
+        with self._lock:
+            for name, value in counter.items():
+                self.counters[f'{prefix}_{name}'] += value
+
+    def durations(self, stage):
+        """某阶段的全部耗时（已排序），供基准测试计算分位数"""
+        with self._lock:
+            return sorted(self._durations.get(stage, ()))
+
+    def summary(self):
+        """每个阶段的次数、p50/p95、合计耗时与吞吐量，以及全部计数器"""
+        with self._lock:
+            wall = time.monotonic() - self._start
+            lines = [f'阶段耗时（运行 {wall:.1f}s）:']
+            for stage in sorted(self._durations):
+                values = sorted(self._durations[stage])
+                total = sum(values)
+                lines.append(f"  {stage}: {len(values)} 次, p50 {percentile(values, 0.5) * 1000:.1f}ms, "
+                             f"p95 {percentile(values, 0.95) * 1000:.1f}ms, 合计 {total:.2f}s, "
+                             f"{len(values) / wall if wall else 0:.2f} 次/秒, 失败 {self._errors[stage]}")
+            if self.counters:
+                lines.append('计数器:')
+                lines.extend(f"  {name}: {value}" for name, value in sorted(self.counters.items()))
+            return '\n'.join(lines)
+
+    def prometheus(self):
+        """Prometheus 文本格式：每个阶段一个 summary，每个计数器一个 counter"""
+        with self._lock:
+            lines = ['# HELP miner_stage_duration_seconds 各阶段耗时',
+                     '# TYPE miner_stage_duration_seconds summary']
+            for stage in sorted(self._durations):
+                values = sorted(self._durations[stage])
+                for q in QUANTILES:
+                    lines.append(f'miner_stage_duration_seconds{{stage="{stage}",quantile="{q}"}} '
+                                 f'{percentile(values, q):.6f}')
+                lines.append(f'miner_stage_duration_seconds_sum{{stage="{stage}"}} {sum(values):.6f}')
+                lines.append(f'miner_stage_duration_seconds_count{{stage="{stage}"}} {len(values)}')
+            lines.append('# TYPE miner_stage_errors_total counter')
+            for stage in sorted(self._durations):
+                lines.append(f'miner_stage_errors_total{{stage="{stage}"}} {self._errors[stage]}')
+            for name, value in sorted(self.counters.items()):
+                metric = _metric_name(name) + '_total'
+                lines.append(f'# TYPE {metric} counter')
+                lines.append(f'{metric} {value}')
+            return '\n'.join(lines) + '\n'
+
+    def write_prometheus(self, path):
+        """原子写入 Prometheus 文本文件（可供 node_exporter textfile collector 读取）"""
+        tmp = path + '.tmp'
+        with open(tmp, 'w', encoding='utf-8') as f:
+            f.write(self.prometheus())
+        os.replace(tmp, path)
+
+    def close(self):
+        with self._lock:
+            if self._trace is not None:
+                self._trace.close()
+                self._trace = None
+
+
+METRICS = Metrics()
+
+
+def add_arguments(parser):
+    parser.add_argument('--trace', default=None, help="把各阶段耗时逐条写入该 JSONL 文件")
+    parser.add_argument('--metrics-file', default=None, help="运行结束时写出 Prometheus 文本格式的指标")
+
+
+def start(args, metrics=METRICS):
+    """按命令行参数开启轨迹输出"""
+    metrics.reset()
+    if args.trace:
+        metrics.enable_trace(args.trace)
+
+
+def finish(args, metrics=METRICS):
+    """写出指标文件并打印摘要"""
+    metrics.close()
+    if args.metrics_file:
+        metrics.write_prometheus(args.metrics_file)
+    print(metrics.summary())
@@ -0,0 +1,7 @@
+"""多数据源抓取流水线：discover → fetch → parse → export
+
+数据源与导出器以插件形式注册（见 base.py），由 Scheduler 统一调度。
+"""
+from miner.pipeline.base import Source, Exporter, SOURCES, EXPORTERS, register_source, register_exporter
+from miner.pipeline.scheduler import Scheduler
+from miner.pipeline import sources, exporters  # 注册内置插件
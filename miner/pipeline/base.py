@@ -0,0 +1,72 @@
+"""流水线插件的基类与注册表
+
+数据源插件（Source）负责 discover → fetch → parse 三个阶段，导出插件（Exporter）负责 export 阶段。
+新的数据源或导出方式只需继承基类并用 register_source / register_exporter 注册，
+即可在 `python -m miner crawl <数据源>` 中使用。
+"""
+SOURCES = {}
+EXPORTERS = {}
+
+
+def register_source(cls):
+    SOURCES[cls.name] = cls
+    return cls
+
+
+def register_exporter(cls):
+    EXPORTERS[cls.name] = cls
+    return cls
+
+
+class Source:
+    """数据源插件
+
+    discover() 逐个产出条目键（URL或文档ID），fetch() 在工作线程中取回页面，
+    parse() 把页面解析为记录字典。每个条目的页面只请求一次，所有导出器共用解析结果。
+    """
+    name = None
+    fieldnames = []  # 元数据导出的列
+    metadata_csv = None  # 元数据导出的默认文件名
+    default_exporters = ()
+    tasks = {}  # 导出器名 -> 清单任务名，未列出的为 "<数据源>_<导出器>"
+
+    def __init__(self, options):
+        self.options = options
+
+    @classmethod
+    def add_arguments(cls, parser):
+        """添加数据源特有的命令行参数"""
+
+    def discover(self, scheduler):
+        raise NotImplementedError
+
+    def fetch(self, key, scheduler):
+        raise NotImplementedError
+
+    def parse(self, key, page):
+        raise NotImplementedError
+
+
+class Exporter:
+    """导出插件
+
+    process() 在工作线程中执行（可以发网络请求，如下载PDF），
+    write() 在主线程中按条目顺序执行并返回写入清单的字段。
+    task 为下载清单中的任务名，每个导出器单独记录进度，重复运行只补做未完成的导出。
+    """
+    name = None
+
+    def __init__(self, source, options):
+        self.source = source
+        self.options = options
+        self.task = source.tasks.get(self.name, f"{source.name}_{self.name}")
+
+    def process(self, key, record, scheduler):
+        """工作线程中的准备工作，默认不做任何事"""
+
+    def write(self, key, record):
+        """写出一条记录，返回传给 Manifest.mark_done 的字段"""
+        raise NotImplementedError
+
+    def close(self):
+        pass
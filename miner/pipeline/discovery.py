@@ -0,0 +1,162 @@
+"""ISCA Archive 自动发现：并发遍历各会议各年份的论文集目录页，按关键词筛选论文
+
+- 首页与目录页经 HTTPCache 获取，重新验证命中时不重复下载
+- 已遍历的论文集记入清单（任务 isca_index），刷新时只遍历新出现的论文集与最近 refresh_years 年的论文集；
+  条目的 path 字段记录筛选条件（--terms / --abstracts）的指纹，条件改变后的论文集重新遍历并重新筛选
+- 已发现的论文记入清单（任务 isca_discovered），下次运行直接从清单产出，无需重新遍历
+"""
+import datetime
+import hashlib
+import re
+from urllib.parse import urlparse
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from miner import isca
+from miner.fetch import FetchError
+from miner.manifest import STATUS_DONE, sha256_text
+from miner.seeds import parse_years
+
+INDEX_TASK = 'isca_index'
+DISCOVERED_TASK = 'isca_discovered'
+# 匹配词首，覆盖 dysarthria / dysarthric / anarthria 等变体
+DEFAULT_TERMS = ('dysarthri', 'anarthri', 'motor speech', 'parkinson', 'amyotrophic', 'ataxi',
+                 'speech impair', 'impaired speech', 'disordered speech', 'pathological speech')
+
+
+def compile_terms(terms):
+    return re.compile(r'\b(?:' + '|'.join(re.escape(t) for t in terms) + ')', re.IGNORECASE)
+
+
+def add_arguments(parser):
+    """发现阶段的命令行参数（crawl isca 与 discover isca 共用）"""
+    parser.add_argument('--years', type=parse_years, default=None, help="只遍历这些年份的论文集，如 2010-2024")
+    parser.add_argument('--series', default=None, help="只遍历这些会议，逗号分隔，如 interspeech,slpat")
+    parser.add_argument('--terms', default=','.join(DEFAULT_TERMS), help="逗号分隔的匹配词（匹配词首，不区分大小写）")
+    parser.add_argument('--abstracts', action='store_true', help="题目不匹配时再检查摘要（需请求每篇论文页面）")
+    parser.add_argument('--refresh-years', type=int, default=2, help="最近几年的论文集每次都重新遍历")
+    parser.add_argument('--rewalk', action='store_true', help="重新遍历全部论文集")
+    parser.add_argument('--archive-url', default=isca.BASE_URL, help="ISCA Archive 地址（基准测试时指向桩服务器）")
+
+
+class ISCADiscovery:
+    def __init__(self, fetcher, manifest, cache=None, terms=DEFAULT_TERMS, series=None, years=None,
+                 abstracts=False, refresh_years=2, rewalk=False, workers=8, base_url=isca.BASE_URL):
+        self.fetcher = fetcher
+        self.manifest = manifest
+        self.cache = cache
+        self.pattern = compile_terms(terms)
+        self.filter_key = sha256_text('\x1f'.join(sorted(t.lower() for t in terms)) + f'\x1fabstracts={abstracts}')
+        self.series = set(series) if series else None
+        self.years = years
+        self.abstracts = abstracts
+        self.refresh_years = refresh_years
+        self.rewalk = rewalk
+        self.workers = workers
+        self.base_url = base_url.rstrip('/')
+
+    @classmethod
+    def from_options(cls, options, fetcher, manifest, cache=None):
+        return cls(fetcher, manifest, cache,
+                   terms=[t.strip() for t in options.terms.split(',') if t.strip()],
+                   series=[s.strip() for s in options.series.split(',')] if options.series else None,
+                   years=options.years, abstracts=options.abstracts, refresh_years=options.refresh_years,
+                   rewalk=options.rewalk, workers=options.workers, base_url=options.archive_url)
+
+    def _get_text(self, url):
+        if self.cache is not None:
+            return self.cache.get_text(url, self.fetcher, timeout=self.fetcher.timeout)
+        return self.fetcher.get(url).text
+
+    def _selected(self, slug):
+        """论文集是否在 --series / --years 范围内"""
+        series, _, year = slug.rpartition('_')
+        if self.series is not None and series not in self.series:
+            return False
+        return self.years is None or (year.isdigit() and int(year) in self.years)
+
+    def _filter_changed(self, slug):
+        """论文集上次遍历时使用的筛选条件与本次不同（或从未遍历）"""
+        record = self.manifest.get(INDEX_TASK, slug)
+        return record is None or record['status'] != STATUS_DONE or record['path'] != self.filter_key
+
+    def proceedings(self):
+        """需要遍历的论文集：按会议、年份过滤，跳过已遍历且不在最近 refresh_years 年内的"""
+        url = self.base_url + '/'
+        recent = datetime.date.today().year - self.refresh_years
+        selected = []
+        for slug, series, year, index_url in isca.parse_archive_index(self._get_text(url), url):
+            if not self._selected(slug):
+                continue
+            if not self.rewalk and year <= recent and not self._filter_changed(slug):
+                continue
+            selected.append((slug, index_url))
+        return selected
+
+    def _matches(self, url, text):
+        if self.pattern.search(text):
+            return True
+        if not self.abstracts:
+            return False
+        record = isca.parse_page(self._get_text(url), url)
+        return bool(self.pattern.search(record['Abstract']))
+
+    def _walk(self, slug, index_url):
+        """工作线程：遍历一个论文集，目录页与筛选条件都未变化时不再筛选，返回 (内容哈希, 匹配的论文URL)"""
+        html = self._get_text(index_url)
+        content_hash = hashlib.sha256(html.encode('utf-8')).hexdigest()
+        previous = self.manifest.get(INDEX_TASK, slug)
+        if not self.rewalk and not self._filter_changed(slug) and previous['content_hash'] == content_hash:
+            return content_hash, []
+        return content_hash, [url for url, text in isca.parse_proceedings_index(html, index_url)
+                              if self._matches(url, text)]
+
+    def discover(self):
+        """逐个产出论文页面URL：先产出清单中已发现的，再产出本次遍历新发现的"""
+        seen = set()
+        # 筛选条件改变的论文集先不产出旧结果，重新筛选后再产出仍然匹配的
+        refilter = {}
+        for url in self.manifest.done_keys(DISCOVERED_TASK):
+            slug = urlparse(url).path.strip('/').split('/')[0]
+            if not self._selected(slug):
+                continue
+            if slug not in refilter:
+                refilter[slug] = [] if self._filter_changed(slug) else None
+            if refilter[slug] is not None:
+                refilter[slug].append(url)
+                continue
+            seen.add(url)
+            yield url
+        known = len(seen)
+        held = {url for urls in refilter.values() if urls for url in urls}
+
+        todo = self.proceedings()
+        print(f"需要遍历 {len(todo)} 个论文集，已发现 {known} 篇论文")
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            futures = {pool.submit(self._walk, slug, index_url): slug for slug, index_url in todo}
+            for future in as_completed(futures):
+                slug = futures[future]
+                try:
+                    content_hash, urls = future.result()
+                except (FetchError, ValueError) as e:
+                    print(f"论文集 {slug} 遍历失败: {str(e)}")
+                    self.manifest.mark_failed(INDEX_TASK, slug, str(e))
+                    continue
+                new = [url for url in urls if url not in seen]
+                for url in new:
+                    seen.add(url)
+                    self.manifest.mark_done(DISCOVERED_TASK, url, path=slug)
+                    yield url
+                for url in refilter.pop(slug, None) or ():
+                    if url not in urls:
+                        self.manifest.mark_failed(DISCOVERED_TASK, url, "不再匹配筛选条件")
+                self.manifest.mark_done(INDEX_TASK, slug, content_hash=content_hash, path=self.filter_key)
+                added = sum(1 for url in new if url not in held)
+                if added:
+                    print(f"论文集 {slug} 新发现 {added} 篇论文")
+        # 未能重新筛选的论文集（遍历失败或不在目录中）仍产出上次的结果
+        for urls in refilter.values():
+            for url in urls or ():
+                if url not in seen:
+                    seen.add(url)
+                    yield url
+        print(f"发现完成，共 {len(seen)} 篇论文，本次新增 {len(seen - held) - known} 篇")
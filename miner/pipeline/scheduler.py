@@ -0,0 +1,96 @@
+"""流水线的共享调度器：发现的条目经有界队列交给工作线程抓取与解析，结果按顺序交给导出器"""
+import time
+
+from miner.driverpool import DriverPool
+from miner.fetch import FetchError
+from miner.metrics import METRICS
+from miner.pipeline.base import Exporter
+
+
+class Scheduler:
+    """统一调度各数据源的抓取
+
+    - fetcher 负责重试、熔断与限速，cache 不为None时页面走本地HTTP缓存
+    - 工作线程复用 DriverPool 的有序结果与背压（queue_size），HTTP数据源不会启动浏览器
+    - 每个导出器在 manifest 中单独记录进度，force=False 时只处理还有导出未完成的条目
+    """
+
+    def __init__(self, fetcher, manifest, cache=None, workers=8, queue_size=None):
+        self.fetcher = fetcher
+        self.manifest = manifest
+        self.cache = cache
+        self.pool = DriverPool(None, workers, queue_size=queue_size)
+
+    def get_text(self, url, headers=None):
+        """取回页面文本，启用缓存时过期前不会重复请求"""
+        if self.cache is not None:
+            return self.cache.get_text(url, self.fetcher, headers, self.fetcher.timeout)
+        return self.fetcher.get(url, headers=headers).text
+
+    def _jobs(self, source, exporters, force):
+        """去重后的 (键, 待执行的导出器)；全部导出都已完成的条目直接跳过"""
+        seen = set()
+        skipped = 0
+        for key in source.discover(self):
+            if key in seen:
+                continue
+            seen.add(key)
+            todo = [e for e in exporters if force or not self.manifest.is_done(e.task, key)]
+            if todo:
+                yield key, todo
+            else:
+                skipped += 1
+        print(f"发现 {len(seen)} 个条目，跳过已完成的 {skipped} 个")
+
+    def _process(self, driver, job):
+        """工作线程：页面只请求一次，解析结果交给各导出器的 process"""
+        key, todo = job
+        source = todo[0].source
+        try:
+            with METRICS.span(f'{source.name}.fetch'):
+                page = source.fetch(key, self)
+            with METRICS.span(f'{source.name}.parse'):
+                record = source.parse(key, page)
+        except (FetchError, ValueError, KeyError) as e:
+            return None, {exporter.name: str(e) for exporter in todo}
+        errors = {}
+        for exporter in todo:
+            if type(exporter).process is Exporter.process:
+                continue
+            try:
+                with METRICS.span(f'export.{exporter.name}.process'):
+                    exporter.process(key, record, self)
+            except (FetchError, OSError, ValueError) as e:
+                errors[exporter.name] = str(e)
+        return record, errors
+
+    def run(self, source, exporters, force=False):
+        """执行 discover → fetch → parse → export，返回 {导出器名: 成功条数}"""
+        start = time.perf_counter()
+        done = {e.name: 0 for e in exporters}
+        try:
+            jobs = self._jobs(source, exporters, force)
+            for idx, ((key, todo), result) in enumerate(self.pool.imap_items(self._process, jobs), 1):
+                record, errors = result or (None, {e.name: "处理失败" for e in todo})
+                for exporter in todo:
+                    error = errors.get(exporter.name)
+                    if error is None:
+                        try:
+                            with METRICS.span(f'export.{exporter.name}.write'):
+                                fields = exporter.write(key, record) or {}
+                        except (OSError, ValueError) as e:
+                            error = str(e)
+                    if error is None:
+                        self.manifest.mark_done(exporter.task, key, **fields)
+                        done[exporter.name] += 1
+                        METRICS.incr(f'{exporter.name}_exported')
+                    else:
+                        self.manifest.mark_failed(exporter.task, key, error)
+                        print(f"[{exporter.name}] {key} 失败: {error}")
+                print(f"已处理 [{idx}]: {key}")
+        finally:
+            for exporter in exporters:
+                exporter.close()
+        summary = ', '.join(f"{name} {count}" for name, count in done.items())
+        print(f"完成！成功导出: {summary}，耗时 {time.perf_counter() - start:.2f}s")
+        return done
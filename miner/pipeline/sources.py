@@ -0,0 +1,83 @@
+"""内置数据源：ISCA Archive 与 IEEE Xplore"""
+import csv
+
+from miner import ieee, isca
+from miner.fetch import FetchError
+from miner.pipeline import discovery
+from miner.pipeline.base import Source, register_source
+from miner.seeds import ISCA_URLS, load_urls, parse_pages
+
+
+@register_source
+class ISCASource(Source):
+    """ISCA论文页面：遍历Archive目录页发现论文，一次请求同时得到引用、PDF链接和元数据"""
+    name = 'isca'
+    fieldnames = isca.FIELDNAMES
+    metadata_csv = 'isca_paper_metadata.csv'
+    default_exporters = ('citations', 'pdf', 'metadata', 'store')
+    # 与独立脚本共用下载清单中的进度
+    tasks = {'citations': 'citation', 'pdf': 'pdf'}
+
+    @classmethod
+    def add_arguments(cls, parser):
+        parser.add_argument('--discover', choices=['archive', 'seeds'], default='archive',
+                            help="archive: 遍历ISCA Archive目录页自动发现；seeds: 使用人工整理的URL列表")
+        parser.add_argument('--urls', default=None, help=f"使用指定的URL列表文件（每行一个），默认 {ISCA_URLS}")
+        discovery.add_arguments(parser)
+
+    def discover(self, scheduler):
+        if self.options.urls or self.options.discover == 'seeds':
+            yield from load_urls(self.options.urls or ISCA_URLS)
+            return
+        finder = discovery.ISCADiscovery.from_options(self.options, scheduler.fetcher, scheduler.manifest,
+                                                      scheduler.cache)
+        yield from finder.discover()
+
+    def fetch(self, url, scheduler):
+        return scheduler.get_text(url)
+
+    def parse(self, url, page):
+        return isca.parse_page(page, url)
+
+
+@register_source
+class IEEESource(Source):
+    """IEEE Xplore：通过搜索接口发现文档ID，解析文档页面内嵌的元数据JSON"""
+    name = 'ieee'
+    fieldnames = ieee.FIELDNAMES
+    metadata_csv = 'IEEE_paper_metadata.csv'
+    default_exporters = ('metadata', 'store')
+
+    @classmethod
+    def add_arguments(cls, parser):
+        parser.add_argument('--query', default=ieee.SEARCH_QUERY, help="搜索关键词")
+        parser.add_argument('--pages', type=parse_pages, default=range(1, 6), help="搜索结果页码范围，如 1-5")
+        parser.add_argument('--ids', default=None, help="直接使用已有的 paper_ids.csv，不再搜索")
+        parser.add_argument('--base-url', default=ieee.BASE_URL, help="IEEE Xplore 地址（基准测试时指向桩服务器）")
+
+    def discover(self, scheduler):
+        if self.options.ids:
+            with open(self.options.ids, encoding='utf-8') as f:
+                for row in csv.DictReader(f):
+                    yield row['PaperID']
+            return
+        # 某一页失败时跳过该页，不中断整个抓取（与独立脚本的 iter_paper_ids 一致）
+        for page in self.options.pages:
+            url, payload, headers = ieee.search_request(self.options.query, page, self.options.base_url)
+            try:
+                data = scheduler.fetcher.post(url, headers=headers, json=payload).json()
+                paper_ids = ieee.parse_search_results(data)
+            except (FetchError, ValueError, KeyError) as e:
+                print(f"第 {page} 页搜索失败: {str(e)}")
+                continue
+            print(f"第 {page} 页发现 {len(paper_ids)} 个论文ID")
+            yield from paper_ids
+            if len(paper_ids) < ieee.ROWS_PER_PAGE:
+                break
+
+    def fetch(self, paper_id, scheduler):
+        return scheduler.get_text(f"{self.options.base_url}/document/{paper_id}")
+
+    def parse(self, paper_id, page):
+        return ieee.parse_document(page, paper_id, self.options.base_url)
+
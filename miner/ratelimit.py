@@ -0,0 +1,83 @@
+import asyncio
+import threading
+import time
+from urllib.parse import urlparse
+
+
+class TokenBucket:
+    """令牌桶限速器：rate 为每秒补充的令牌数（0 不限速），capacity 为允许的突发请求数"""
+
+    def __init__(self, rate, capacity=1):
+        self.rate = float(rate)
+        self.capacity = float(capacity)
+        self._tokens = self.capacity
+        self._last = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def reserve(self, tokens=1):
+        """预定令牌并返回需要等待的秒数（允许透支，等待结束后即可发出请求）"""
+        with self._lock:
+            now = time.monotonic()
+            paused = max(0.0, self._paused_until - now)
+            if self.rate <= 0:
+                return paused
+            self._tokens = min(self.capacity, self._tokens + (now - self._last) * self.rate)
+            self._last = now
+            self._tokens -= tokens
+            if self._tokens >= 0:
+                return paused
+            return max(paused, -self._tokens / self.rate)
+
+    def pause(self, seconds):
+        """服务器要求等待时（如429的 Retry-After），seconds 秒内不再放行请求
+
+        同时清空令牌，暂停结束后按 rate 逐个放行，而不是让等待的请求同时发出。
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._paused_until = max(self._paused_until, now + seconds)
+            if self.rate > 0:
+                self._tokens = min(self.capacity, self._tokens + (now - self._last) * self.rate)
+                self._last = now
+                self._tokens = min(self._tokens, 1 - seconds * self.rate)
+
+    def acquire(self, tokens=1):
+        """阻塞直到获得令牌，返回实际等待的秒数"""
+        delay = self.reserve(tokens)
+        if delay > 0:
+            time.sleep(delay)
+        return delay
+
+    async def acquire_async(self, tokens=1):
+        """协程版本的 acquire，等待期间不占用线程"""
+        delay = self.reserve(tokens)
+        if delay > 0:
+            await asyncio.sleep(delay)
+        return delay
+
+
+class HostRateLimiter:
+    """按主机划分的令牌桶集合，每个主机独立限速，也可以单独暂停某个主机"""
+
+    def __init__(self, rate, capacity=1):
+        self.rate = rate
+        self.capacity = capacity
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def bucket(self, url):
+        host = urlparse(url).netloc
+        with self._lock:
+            if host not in self._buckets:
+                self._buckets[host] = TokenBucket(self.rate, self.capacity)
+            return self._buckets[host]
+
+    def acquire(self, url):
+        return self.bucket(url).acquire()
+
+    def pause(self, url, seconds):
+        self.bucket(url).pause(seconds)
+
+    async def acquire_async(self, url):
+        return await self.bucket(url).acquire_async()
@@ -0,0 +1,32 @@
+"""爬虫的输入：种子URL列表文件与页码、年份范围"""
+import os
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data')
+ISCA_URLS = os.path.join(DATA_DIR, 'isca_urls.txt')  # 人工整理的ISCA论文页面
+
+
+def load_urls(path=ISCA_URLS):
+    """读取URL列表文件：每行一个，忽略空行与 # 开头的注释，保持顺序并去重"""
+    urls = []
+    seen = set()
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            url = line.strip()
+            if url and not url.startswith('#') and url not in seen:
+                seen.add(url)
+                urls.append(url)
+    return urls
+
+
+def parse_range(spec):
+    """解析闭区间：'1-5' -> range(1, 6)，'3' -> range(3, 4)"""
+    start, _, end = str(spec).partition('-')
+    start = int(start)
+    end = int(end) if end else start
+    if start < 1 or end < start:
+        raise ValueError(f"无效的范围: {spec}")
+    return range(start, end + 1)
+
+
+parse_pages = parse_range  # 搜索结果页码范围
+parse_years = parse_range  # 年份范围，如 2010-2024
@@ -0,0 +1,178 @@
+"""追加写入的流式输出：逐条写入、定期 fsync，打开时修复异常中断留下的半条记录"""
+import csv
+import json
+import os
+import re
+import tempfile
+import time
+
+_CSV_DELIMS_RE = re.compile(rb'["\n]')
+
+
+def _truncate(path, f, end):
+    f.truncate(end)
+    print(f"{path}: 已移除末尾不完整的记录")
+
+
+def _recover_lines(path):
+    """截掉文件末尾不完整的一行（上次写入中途崩溃），返回文件是否已有内容"""
+    if not os.path.exists(path):
+        return False
+    size = os.path.getsize(path)
+    if size == 0:
+        return False
+    with open(path, 'rb+') as f:
+        f.seek(-1, os.SEEK_END)
+        if f.read(1) == b'\n':
+            return True
+        # 向前查找最后一个换行符
+        pos = size
+        block = 64 * 1024
+        while pos > 0:
+            start = max(0, pos - block)
+            f.seek(start)
+            chunk = f.read(pos - start)
+            idx = chunk.rfind(b'\n')
+            if idx != -1:
+                _truncate(path, f, start + idx + 1)
+                return True
+            pos = start
+        f.truncate(0)
+        return False
+
+
+def _recover_csv(path):
+    """截掉CSV文件末尾不完整的记录，返回文件是否已有内容
+
+    字段中可以有换行（由引号括起），记录只在引号外的换行处结束：从头统计引号，
+    偶数个引号之后的换行才是记录边界（转义的 "" 成对出现，不影响奇偶）。
+    """
+    if not os.path.exists(path) or os.path.getsize(path) == 0:
+        return False
+    with open(path, 'rb+') as f:
+        end = pos = 0
+        quoted = False
+        while chunk := f.read(64 * 1024):
+            for m in _CSV_DELIMS_RE.finditer(chunk):
+                if m.group() == b'"':
+                    quoted = not quoted
+                elif not quoted:
+                    end = pos + m.end()
+            pos += len(chunk)
+        if end < pos:
+            _truncate(path, f, end)
+        return end > 0
+
+
+class _Sink:
+    _recover = staticmethod(_recover_lines)
+
+    def __init__(self, path, encoding, fsync_every, fsync_interval):
+        self.path = path
+        self.fsync_every = fsync_every
+        self.fsync_interval = fsync_interval
+        self.count = 0
+        self._has_content = self._recover(path)
+        self._file = open(path, 'a', newline='', encoding=encoding)
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+
+    def _written(self):
+        self._file.flush()
+        self.count += 1
+        self._unsynced += 1
+        if self._unsynced >= self.fsync_every or time.monotonic() - self._last_sync >= self.fsync_interval:
+            self.sync()
+
+    def sync(self):
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+
+    def close(self):
+        if not self._file.closed:
+            self.sync()
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class CSVSink(_Sink):
+    """追加写入的CSV文件，表头只在新文件中写入一次
+
+    row 可以是字典（按 fieldnames 取值）或序列，字段值原样写入（含换行的字段由 csv 模块加引号）。
+    每写一行 flush 一次，每 fsync_every 行或 fsync_interval 秒 fsync 一次。
+    """
+
+    _recover = staticmethod(_recover_csv)
+
+    def __init__(self, path, fieldnames, encoding='utf-8', fsync_every=50, fsync_interval=5.0):
+        super().__init__(path, encoding, fsync_every, fsync_interval)
+        self.fieldnames = list(fieldnames)
+        self._writer = csv.writer(self._file)
+        if not self._has_content:
+            self._writer.writerow(self.fieldnames)
+            self.sync()
+
+    def write(self, row):
+        if isinstance(row, dict):
+            row = [row.get(name, '') for name in self.fieldnames]
+        self._writer.writerow(row)
+        self._written()
+
+
+class JSONLSink(_Sink):
+    """追加写入的JSON Lines文件，每行一条记录"""
+
+    def __init__(self, path, encoding='utf-8', fsync_every=50, fsync_interval=5.0):
+        super().__init__(path, encoding, fsync_every, fsync_interval)
+
+    def write(self, record):
+        self._file.write(json.dumps(record, ensure_ascii=False) + '\n')
+        self._written()
+
+
+def read_column(path, column, encoding='utf-8'):
+    """逐行读取CSV中某一列的全部取值（集合），文件不存在时返回空集合"""
+    if not os.path.exists(path):
+        return set()
+    with open(path, newline='', encoding=encoding) as f:
+        return {row[column] for row in csv.DictReader(f) if row.get(column)}
+
+
+def keep_latest(path, key, encoding='utf-8'):
+    """同一键的多行（重新抓取后追加的结果）合并为一行：保留第一次出现的位置，内容取最后一次写入的
+
+    key 为从行字典取键的函数，返回空值的行原样保留。文件整体重写到临时文件后原子替换，返回去掉的行数。
+    """
+    if not os.path.exists(path):
+        return 0
+    with open(path, newline='', encoding=encoding) as f:
+        reader = csv.DictReader(f)
+        fieldnames = reader.fieldnames
+        rows = {}
+        total = 0
+        for total, row in enumerate(reader, 1):
+            rows[key(row) or ('', total)] = row
+    removed = total - len(rows)
+    if not removed:
+        return 0
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)), suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'w', newline='', encoding=encoding) as f:
+            writer = csv.DictWriter(f, fieldnames)
+            writer.writeheader()
+            writer.writerows(rows.values())
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    return removed
@@ -0,0 +1,236 @@
+"""统一的论文元数据库：IEEE 与 ISCA 的记录按 (数据源, 键) 合并写入同一个 SQLite 表
+
+    store = PaperStore()
+    store.upsert('ieee', '8512311', record)          # 记录字典的键与各 CSV 的列名相同
+    for row in store.select('ieee', years=range(2019, 2025), order='year'):
+        ...
+
+爬虫与流水线每解析一条记录就写入一次；同一条目再次写入时只用非空字段覆盖，
+内容有变化才分配新的变更序号 seq，导出时可以只取上次导出之后变化过的记录。
+"""
+import csv
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+from datetime import datetime, timezone
+
+from miner import citations
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+DEFAULT_STORE = os.path.join(ROOT, 'papers.db')
+
+SOURCES = ('ieee', 'isca')
+COLUMNS = ['title', 'authors', 'year', 'venue', 'abstract', 'keywords', 'doi', 'url', 'pdf', 'citation']
+ORDERS = {'title': 'title, key', 'year': 'year, title, key', 'seq': 'seq', 'key': 'key'}
+# CSV 列名 → 数据库列
+_ALIASES = {'links': 'url'}
+_YEAR_RE = re.compile(r'_(\d{4})/')
+_ARNUMBER_RE = re.compile(r'arnumber=(\d+)')
+# 可以从引用文本中补全的列
+_CITATION_COLUMNS = ('title', 'authors', 'year', 'venue', 'doi')
+
+_SCHEMA = '''
+CREATE TABLE IF NOT EXISTS papers (
+    source TEXT NOT NULL,
+    key TEXT NOT NULL,
+    title TEXT,
+    authors TEXT,
+    year INTEGER,
+    venue TEXT,
+    abstract TEXT,
+    keywords TEXT,
+    doi TEXT,
+    url TEXT,
+    pdf TEXT,
+    citation TEXT,
+    content_hash TEXT NOT NULL,
+    seq INTEGER NOT NULL,
+    first_seen TEXT NOT NULL,
+    updated_at TEXT NOT NULL,
+    PRIMARY KEY (source, key)
+);
+CREATE INDEX IF NOT EXISTS idx_papers_year ON papers (year);
+CREATE INDEX IF NOT EXISTS idx_papers_venue ON papers (venue);
+CREATE INDEX IF NOT EXISTS idx_papers_seq ON papers (seq);
+CREATE TABLE IF NOT EXISTS exports (
+    name TEXT PRIMARY KEY,
+    seq INTEGER NOT NULL,
+    exported_at TEXT NOT NULL
+);
+'''
+
+
+def _now():
+    return datetime.now(timezone.utc).isoformat(timespec='seconds')
+
+
+def normalize(record):
+    """把 CSV 风格的记录（Title / Links / Year ...）转换为数据库列，空值丢弃"""
+    row = {}
+    for name, value in record.items():
+        column = _ALIASES.get(name.lower(), name.lower())
+        if column not in COLUMNS or value is None:
+            continue
+        value = str(value).strip()
+        if value:
+            row[column] = value
+    if 'year' in row:
+        row['year'] = int(row['year'][:4]) if row['year'][:4].isdigit() else None
+    return {column: value for column, value in row.items() if value is not None}
+
+
+def _content_hash(row):
+    return hashlib.sha256(json.dumps([row.get(c) for c in COLUMNS], ensure_ascii=False).encode('utf-8')).hexdigest()
+
+
+def _fill_from_citation(row):
+    """只有引用文本的记录（如 citations.csv、旧版 IEEE CSV）从解析后的引用补全缺失的作者、年份等字段"""
+    if not row.get('citation') or all(row.get(c) for c in _CITATION_COLUMNS):
+        return
+    parsed = citations.parse(row['citation'])
+    if parsed is None:
+        return
+    authors = parsed['authors']
+    parsed['authors'] = '; '.join(a for a in authors if a != 'others') + (' et al.' if 'others' in authors else '')
+    parsed['year'] = int(parsed['year']) if parsed['year'] else None
+    for column in _CITATION_COLUMNS:
+        if not row.get(column) and parsed[column]:
+            row[column] = parsed[column]
+
+
+class PaperStore:
+    """论文元数据库，可在多个线程中共用"""
+
+    def __init__(self, path=DEFAULT_STORE):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None, timeout=30)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        self._conn.executescript(_SCHEMA)
+
+    def _upsert(self, source, key, record):
+        new = normalize(record)
+        old = self._conn.execute(f'SELECT {", ".join(COLUMNS)}, content_hash FROM papers WHERE source = ? AND key = ?',
+                                 (source, key)).fetchone()
+        merged = {c: old[c] for c in COLUMNS} if old is not None else {}
+        merged.update(new)
+        _fill_from_citation(merged)
+        # 没有年份字段的ISCA记录（如 citations.csv）从URL中的论文集名称推断年份
+        if not merged.get('year') and (m := _YEAR_RE.search(merged.get('url') or '')):
+            merged['year'] = int(m.group(1))
+        content_hash = _content_hash(merged)
+        if old is not None and old['content_hash'] == content_hash:
+            return False
+        seq = self._conn.execute('SELECT COALESCE(MAX(seq), 0) + 1 FROM papers').fetchone()[0]
+        now = _now()
+        values = [merged.get(c) for c in COLUMNS]
+        self._conn.execute(f'''
+            INSERT INTO papers (source, key, {", ".join(COLUMNS)}, content_hash, seq, first_seen, updated_at)
+            VALUES (?, ?, {", ".join("?" * len(COLUMNS))}, ?, ?, ?, ?)
+            ON CONFLICT (source, key) DO UPDATE SET
+                {", ".join(f"{c} = excluded.{c}" for c in COLUMNS)},
+                content_hash = excluded.content_hash, seq = excluded.seq, updated_at = excluded.updated_at
+        ''', (source, key, *values, content_hash, seq, now, now))
+        return True
+
+    def upsert(self, source, key, record):
+        """写入或合并一条记录，内容有变化时返回True"""
+        return self.upsert_many(source, [(key, record)]) == 1
+
+    def upsert_many(self, source, items):
+        """在一个事务中写入 [(键, 记录)]，返回内容有变化的条数"""
+        if source not in SOURCES:
+            raise ValueError(f"未知的数据源: {source}")
+        with self._lock:
+            self._conn.execute('BEGIN IMMEDIATE')
+            try:
+                changed = sum(self._upsert(source, key, record) for key, record in items)
+                self._conn.execute('COMMIT')
+            except BaseException:
+                self._conn.execute('ROLLBACK')
+                raise
+        return changed
+
+    def select(self, source=None, years=None, venue=None, since=None, order='title'):
+        """按条件逐行产出记录（sqlite3.Row，可按列名取值），不把结果整体读入内存
+
+        years 为年份范围（如 range(2019, 2025)），venue 为会议/期刊名的子串（不区分大小写），
+        since 为变更序号，只返回之后变化过的记录。
+        """
+        where, params = [], []
+        if source:
+            where.append('source = ?')
+            params.append(source)
+        if years:
+            where.append('year BETWEEN ? AND ?')
+            params += [min(years), max(years)]
+        if venue:
+            where.append("venue LIKE ? ESCAPE '\\'")
+            params.append('%' + venue.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_') + '%')
+        if since:
+            where.append('seq > ?')
+            params.append(since)
+        sql = 'SELECT * FROM papers' + (' WHERE ' + ' AND '.join(where) if where else '') + f' ORDER BY {ORDERS[order]}'
+        # 单独的游标逐行读取，读取期间不持有写锁
+        cursor = self._conn.cursor()
+        try:
+            yield from cursor.execute(sql, params)
+        finally:
+            cursor.close()
+
+    def last_export(self, name):
+        """该导出上次导出时的变更序号，从未导出时为0"""
+        row = self._conn.execute('SELECT seq FROM exports WHERE name = ?', (name,)).fetchone()
+        return row['seq'] if row is not None else 0
+
+    def max_seq(self):
+        return self._conn.execute('SELECT COALESCE(MAX(seq), 0) FROM papers').fetchone()[0]
+
+    def mark_exported(self, name, seq):
+        with self._lock:
+            self._conn.execute('INSERT OR REPLACE INTO exports (name, seq, exported_at) VALUES (?, ?, ?)',
+                               (name, seq, _now()))
+
+    def import_csv(self, source, path, encoding='utf-8-sig', batch=500):
+        """导入已有的 CSV（IEEE_paper_metadata.csv、citations.csv、isca_paper_metadata.csv），返回 (读取数, 变化数)
+
+        IEEE 记录以 Links 中的 arnumber 为键，ISCA 记录以 URL 为键，取不到键的行跳过。
+        """
+        total = changed = 0
+        items = []
+        with open(path, newline='', encoding=encoding) as f:
+            for row in csv.DictReader(f):
+                key = record_key(source, row)
+                if not key:
+                    continue
+                total += 1
+                items.append((key, row))
+                if len(items) >= batch:
+                    changed += self.upsert_many(source, items)
+                    items = []
+        if items:
+            changed += self.upsert_many(source, items)
+        return total, changed
+
+    def summary(self):
+        """每个数据源的记录数与年份范围"""
+        return self._conn.execute(
+            'SELECT source, COUNT(*) AS papers, MIN(year) AS first, MAX(year) AS last FROM papers GROUP BY source'
+        ).fetchall()
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+def record_key(source, record):
+    """从记录中取出条目键：IEEE 为文档ID，ISCA 为论文页面URL"""
+    if source == 'ieee':
+        m = _ARNUMBER_RE.search(record.get('Links') or record.get('url') or '')
+        return m.group(1) if m else None
+    return record.get('URL') or record.get('url')
@@ -0,0 +1,89 @@
+"""基于就绪条件的等待，取代固定的 time.sleep，并统计每类等待实际阻塞的时间"""
+import collections
+import threading
+import time
+
+from miner.metrics import METRICS
+from selenium.common.exceptions import (NoSuchElementException, StaleElementReferenceException,
+                                        TimeoutException, JavascriptException)
+
+IGNORED_EXCEPTIONS = (NoSuchElementException, StaleElementReferenceException)
+
+# 在页面中注册 MutationObserver，quiet 毫秒内没有DOM变化时回调
+_DOM_STABLE_JS = '''
+var quiet = arguments[0], done = arguments[arguments.length - 1];
+var timer = setTimeout(finish, quiet);
+var observer = new MutationObserver(function () { clearTimeout(timer); timer = setTimeout(finish, quiet); });
+function finish() { observer.disconnect(); done(true); }
+observer.observe(document.documentElement, {childList: true, subtree: true, attributes: true, characterData: true});
+'''
+
+
+class WaitStats:
+    """按标签累计等待次数、阻塞时间与超时次数"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._data = collections.defaultdict(lambda: {'count': 0, 'total': 0.0, 'max': 0.0, 'timeouts': 0})
+
+    def record(self, label, elapsed, timed_out=False):
+        METRICS.observe(f'wait.{label}', elapsed, ok=not timed_out)
+        with self._lock:
+            entry = self._data[label]
+            entry['count'] += 1
+            entry['total'] += elapsed
+            entry['max'] = max(entry['max'], elapsed)
+            entry['timeouts'] += int(timed_out)
+
+    def report(self):
+        """返回每类等待的摘要文本"""
+        with self._lock:
+            lines = ['等待统计（实际阻塞时间）:']
+            for label, e in sorted(self._data.items()):
+                avg = e['total'] / e['count'] if e['count'] else 0.0
+                lines.append(f"  {label}: {e['count']} 次, 平均 {avg:.3f}s, 最长 {e['max']:.3f}s, "
+                             f"合计 {e['total']:.1f}s, 超时 {e['timeouts']} 次")
+            return '\n'.join(lines)
+
+
+WAIT_STATS = WaitStats()
+
+
+def wait_until(driver, condition, timeout=20, label='wait', initial=0.05, factor=1.5, max_interval=0.5,
+               stats=WAIT_STATS):
+    """轮询 condition(driver) 直到返回真值，轮询间隔从 initial 开始按 factor 增长，最长 max_interval
+
+    condition 可以直接使用 selenium 的 expected_conditions。超时抛出 TimeoutException。
+    """
+    start = time.monotonic()
+    interval = initial
+    while True:
+        try:
+            value = condition(driver)
+            if value:
+                stats.record(label, time.monotonic() - start)
+                return value
+        except IGNORED_EXCEPTIONS:
+            pass
+        elapsed = time.monotonic() - start
+        if elapsed >= timeout:
+            stats.record(label, elapsed, timed_out=True)
+            raise TimeoutException(f"等待 {label} 超时（{timeout}s）")
+        time.sleep(min(interval, timeout - elapsed))
+        interval = min(interval * factor, max_interval)
+
+
+def wait_for_dom_stable(driver, quiet=0.3, timeout=10, label='dom_stable', stats=WAIT_STATS):
+    """等待页面DOM在 quiet 秒内不再变化（MutationObserver），超时不报错，只记录"""
+    start = time.monotonic()
+    driver.set_script_timeout(timeout)
+    try:
+        driver.execute_async_script(_DOM_STABLE_JS, int(quiet * 1000))
+        stats.record(label, time.monotonic() - start)
+    except (TimeoutException, JavascriptException):
+        stats.record(label, time.monotonic() - start, timed_out=True)
+
+
+def document_ready(driver):
+    """readyState 为 complete 时返回 True，可作为 wait_until 的条件"""
+    return driver.execute_script('return document.readyState') == 'complete'